@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the latency of the two ways Helium clicks an element:
+
+ * WebDriver's Element Click command (Helium's fast path) and
+ * a sequence of W3C pointer actions (used for offsets or when another element
+   would receive the click).
+
+Usage::
+
+    python benchmarks/bench_click.py [--num-clicks N] [--firefox]
+"""
+
+from argparse import ArgumentParser
+from statistics import median
+from time import perf_counter
+
+from selenium.webdriver.common.action_chains import ActionChains
+
+from helium3 import kill_browser
+from helium3 import start_chrome
+from helium3 import start_firefox
+
+PAGE = (
+    "data:text/html,"
+    '<button onclick="this.dataset.clicks = (+this.dataset.clicks || 0) + 1;">'
+    "Click me!</button>"
+)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--num-clicks", type=int, default=100)
+    parser.add_argument("--firefox", action="store_true")
+    args = parser.parse_args()
+    if args.firefox:
+        driver = start_firefox(PAGE, headless=True)
+    else:
+        driver = start_chrome(PAGE, headless=True)
+    try:
+        button = driver.find_element_by_tag_name("button")
+        benchmarks = [
+            ("Element Click", lambda: button.click()),
+            (
+                "Pointer actions",
+                lambda: ActionChains(driver).move_to_element(button).click().perform(),
+            ),
+        ]
+        for name, click in benchmarks:
+            # Warm up, so one-off costs don't distort the results:
+            click()
+            timings = time_calls(click, args.num_clicks)
+            print(
+                "%-16s median %6.2f ms, total %7.1f ms for %d clicks"
+                % (name, median(timings) * 1000, sum(timings) * 1000, len(timings))
+            )
+    finally:
+        kill_browser()
+
+
+def time_calls(f, num_calls):
+    result = []
+    for _ in range(num_calls):
+        start = perf_counter()
+        f()
+        result.append(perf_counter() - start)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Measures how long `import helium3` and `from helium3 import *` take, over the
+time a bare interpreter needs to start.
+
+Each measurement runs in a new process, so modules are not cached between
+them. The first run compiles the .pyc files; it is discarded. Usage::
+
+    python benchmarks/bench_import.py [--num-runs N] [--max-ms MS]
+
+With --max-ms, exits with a non-zero status if the median of either import
+exceeds MS. This lets CI catch changes that make importing helium3 slow
+again, eg. a new top-level import of selenium.webdriver.
+"""
+
+import subprocess
+import sys
+from argparse import ArgumentParser
+from statistics import median
+from time import perf_counter
+
+
+IMPORTS = ["import helium3", "from helium3 import *"]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--num-runs", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+    # Warm up, so compiling .pyc files doesn't distort the results:
+    time_import(IMPORTS[0])
+    baseline = median(time_import("pass") for _ in range(args.num_runs))
+    is_too_slow = False
+    for statement in IMPORTS:
+        timings = [time_import(statement) - baseline for _ in range(args.num_runs)]
+        result = median(timings) * 1000
+        print(
+            "%s: median %.1f ms (min %.1f ms) over %d runs"
+            % (statement, result, min(timings) * 1000, len(timings))
+        )
+        if args.max_ms is not None and result > args.max_ms:
+            is_too_slow = True
+    if is_too_slow:
+        sys.exit("An import took longer than %s ms." % args.max_ms)
+
+
+def time_import(statement):
+    start = perf_counter()
+    subprocess.run([sys.executable, "-c", statement], check=True)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Measures how Helium's lookups and actions scale with the size of the page.
+
+Generates synthetic pages with a given number of filler elements, depth of
+nested iframes (the elements to find are in the innermost frame) and number
+of form fields. For each page, it performs operations on each element type:
+Text, Button, Link, TextField, CheckBox, ComboBox, S, a relative locator and
+Window. For each operation, it reports the median over several repetitions of
+
+ * the wall time,
+ * the number of WebDriver commands, ie. round trips to the browser, and
+ * the CPU time of the Python process.
+
+Usage::
+
+    python benchmarks/bench_lookup.py [--dom-sizes N ...] [--iframe-depths N ...]
+        [--form-sizes N ...] [--repeat N] [--firefox]
+        [--save FILE] [--compare FILE [--max-regression PERCENT]]
+
+All combinations of the given sizes are measured, so the results show how
+each operation scales. --save writes the results to a JSON file. --compare
+prints the change against such a file and exits with a non-zero status if an
+operation needs more round trips, or its wall time grew by more than
+--max-regression percent.
+"""
+
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from itertools import product
+from pathlib import Path
+from shutil import rmtree
+from statistics import median
+from tempfile import mkdtemp
+from time import perf_counter
+from time import process_time
+
+from helium3 import Button
+from helium3 import CheckBox
+from helium3 import Link
+from helium3 import S
+from helium3 import Text
+from helium3 import TextField
+from helium3 import Window
+from helium3 import click
+from helium3 import command_budget
+from helium3 import get_driver
+from helium3 import go_to
+from helium3 import kill_browser
+from helium3 import select
+from helium3 import start_chrome
+from helium3 import start_firefox
+from helium3 import write
+
+OPERATIONS = [
+    ("Text", lambda page: Text("Target text").exists()),
+    ("Button", lambda page: click(Button("Target button"))),
+    ("Link", lambda page: Link("Target link").href),
+    ("TextField", lambda page: write("Hello", into=TextField("Target field"))),
+    ("CheckBox", lambda page: click(CheckBox("Target checkbox"))),
+    ("ComboBox", lambda page: select("Target combo", page.last_option)),
+    ("S", lambda page: S("#target").exists()),
+    ("Relative", lambda page: TextField(to_right_of="Relative label").exists()),
+    ("Window", lambda page: Window("Second window").exists()),
+]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dom-sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--iframe-depths", type=int, nargs="+", default=[0, 2])
+    parser.add_argument("--form-sizes", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--firefox", action="store_true")
+    parser.add_argument("--save", metavar="FILE")
+    parser.add_argument("--compare", metavar="FILE")
+    parser.add_argument("--max-regression", type=float, default=20)
+    args = parser.parse_args()
+    if min(args.form_sizes) < 1:
+        parser.error("The form sizes must be at least 1.")
+    browser = "firefox" if args.firefox else "chrome"
+    if args.firefox:
+        start_firefox(headless=True)
+    else:
+        start_chrome(headless=True)
+    tmp_dir = mkdtemp()
+    try:
+        results = []
+        for dom_size, iframe_depth, form_size in product(
+            args.dom_sizes, args.iframe_depths, args.form_sizes
+        ):
+            page = SyntheticPage(tmp_dir, dom_size, iframe_depth, form_size)
+            print(
+                "%d elements, iframe depth %d, %d form fields:"
+                % (dom_size, iframe_depth, form_size)
+            )
+            for result in measure(page, args.repeat):
+                result.update(browser=browser, **page.params)
+                results.append(result)
+                print(format_result(result))
+    finally:
+        kill_browser()
+        rmtree(tmp_dir)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if not compare(baseline, results, args.max_regression):
+            sys.exit("Performance regressed.")
+
+
+class SyntheticPage:
+    """
+    Writes an HTML page with the given parameters to `directory`. The elements
+    the operations look for are preceded by `dom_size` filler elements. They
+    include decoys of the same types, so Helium's searches find and discard
+    them. A second page is opened in a new window for `Window(...)`.
+    """
+
+    def __init__(self, directory, dom_size, iframe_depth, form_size):
+        self.params = {
+            "dom_size": dom_size,
+            "iframe_depth": iframe_depth,
+            "form_size": form_size,
+        }
+        self.directory = directory
+        self.last_option = "Option %d" % (form_size - 1)
+        content = self._get_filler(dom_size) + self._get_targets(form_size)
+        self.path = self._write_frames(content, iframe_depth)
+        self.second_window_path = self._write(
+            "second.html", "<title>Second window</title><p>Second window</p>"
+        )
+
+    def load(self):
+        go_to(Path(self.path).as_uri())
+        get_driver().execute_script(
+            "window.open(arguments[0]);", Path(self.second_window_path).as_uri()
+        )
+
+    def close_other_windows(self):
+        driver = get_driver()
+        first_window = driver.window_handles[0]
+        for handle in driver.window_handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(first_window)
+
+    def _get_filler(self, dom_size):
+        elements = []
+        for i in range(dom_size):
+            kind = i % 4
+            if kind == 0:
+                elements.append("<div>Filler text %d</div>" % i)
+            elif kind == 1:
+                elements.append("<button>Filler button %d</button>" % i)
+            elif kind == 2:
+                elements.append('<a href="#%d">Filler link %d</a>' % (i, i))
+            else:
+                elements.append("<span>Filler %d</span>" % i)
+        return "<div>%s</div>" % "".join(elements)
+
+    def _get_targets(self, form_size):
+        fields = "".join(
+            '<label for="field%d">Field %d</label><input id="field%d"><br>' % (i, i, i)
+            for i in range(form_size - 1)
+        )
+        options = "".join("<option>Option %d</option>" % i for i in range(form_size))
+        return (
+            "<p>Target text</p>"
+            "<button>Target button</button>"
+            '<a href="#target">Target link</a>'
+            '<div id="target">Target</div>'
+            "<form>%s"
+            '<label for="target-field">Target field</label>'
+            '<input id="target-field"><br>'
+            '<input type="checkbox" id="target-checkbox">'
+            '<label for="target-checkbox">Target checkbox</label><br>'
+            '<label for="target-combo">Target combo</label>'
+            '<select id="target-combo">%s</select><br>'
+            "<span>Relative label</span><input><br>"
+            "</form>" % (fields, options)
+        )
+
+    def _write_frames(self, content, iframe_depth):
+        # Each document embeds the next. The innermost one has the content:
+        for depth in reversed(range(iframe_depth + 1)):
+            name = "page.html" if depth == 0 else "frame%d.html" % depth
+            path = self._write(name, content)
+            content = '<iframe src="%s" width="1000" height="800"></iframe>' % name
+        return path
+
+    def _write(self, name, body):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("<!DOCTYPE html><html><body>%s</body></html>" % body)
+        return path
+
+
+def measure(page, repeat):
+    page.load()
+    try:
+        for name, operation in OPERATIONS:
+            # Warm up, so one-off costs don't distort the results:
+            operation(page)
+            wall_times, cpu_times, round_trips = [], [], []
+            for _ in range(repeat):
+                with command_budget() as stats:
+                    start_cpu, start = process_time(), perf_counter()
+                    operation(page)
+                    wall_times.append(perf_counter() - start)
+                    cpu_times.append(process_time() - start_cpu)
+                round_trips.append(stats.num_commands)
+            yield {
+                "operation": name,
+                "wall_ms": median(wall_times) * 1000,
+                "round_trips": median(round_trips),
+                "cpu_ms": median(cpu_times) * 1000,
+            }
+    finally:
+        page.close_other_windows()
+
+
+def format_result(result):
+    return "  %-10s %8.2f ms wall, %5g round trips, %7.2f ms CPU" % (
+        result["operation"],
+        result["wall_ms"],
+        result["round_trips"],
+        result["cpu_ms"],
+    )
+
+
+def compare(baseline, results, max_regression):
+    """
+    Prints the change of each result against the baseline. Returns False if
+    any of them regressed.
+    """
+    baseline = {_get_key(result): result for result in baseline}
+    ok = True
+    print("Compared to the baseline:")
+    for result in results:
+        before = baseline.get(_get_key(result))
+        if before is None:
+            continue
+        wall_change = (result["wall_ms"] / before["wall_ms"] - 1) * 100
+        regressed = (
+            result["round_trips"] > before["round_trips"]
+            or wall_change > max_regression
+        )
+        ok = ok and not regressed
+        print(
+            "  %-10s %5d elements, depth %d, %4d fields: %+6.1f%% wall, "
+            "%+g round trips, %+6.1f%% CPU%s"
+            % (
+                result["operation"],
+                result["dom_size"],
+                result["iframe_depth"],
+                result["form_size"],
+                wall_change,
+                result["round_trips"] - before["round_trips"],
+                (
+                    (result["cpu_ms"] / before["cpu_ms"] - 1) * 100
+                    if before["cpu_ms"]
+                    else 0
+                ),
+                "  REGRESSED" if regressed else "",
+            )
+        )
+    return ok
+
+
+def _get_key(result):
+    return (
+        result["browser"],
+        result["operation"],
+        result["dom_size"],
+        result["iframe_depth"],
+        result["form_size"],
+    )
+
+
+if __name__ == "__main__":
+    main()
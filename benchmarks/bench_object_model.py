@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the Python-side cost of Helium's object model, without any requests
+to the browser:
+
+ * constructing GUI elements such as ``Button("OK", below="Name")``,
+ * creating their implementations,
+ * copying implementations, as ``find_all(...)`` does for every result,
+ * ``repr(...)`` and
+ * the memory used per GUI element.
+
+Run it before and after a change to compare. Usage::
+
+    python benchmarks/bench_object_model.py [--num-elements N]
+"""
+
+import tracemalloc
+from argparse import ArgumentParser
+from time import perf_counter
+
+from helium3 import Button
+from helium3 import Point
+from helium3 import TextField
+from helium3 import kill_browser
+from helium3 import start_chrome
+
+PAGE = "data:text/html,<p>Hello World!</p>"
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--num-elements", type=int, default=100000)
+    args = parser.parse_args()
+    # GUI elements require a running browser, but don't use it in this script:
+    start_chrome(PAGE, headless=True)
+    try:
+        n = args.num_elements
+        elements = [TextField("Name", below=Button("OK")) for _ in range(n)]
+        impls = [element._impl for element in elements]
+        benchmarks = [
+            (
+                "Construct",
+                lambda: [TextField("Name", below=Button("OK")) for _ in range(n)],
+            ),
+            (
+                "Create impl",
+                lambda: [TextField("Name", below="OK")._impl for _ in range(n)],
+            ),
+            ("Copy impl", lambda: [impl.bound_to_occurrence(1) for impl in impls]),
+            ("repr", lambda: [repr(element) for element in elements]),
+            ("Point", lambda: [Point(i, i) + (1, 1) for i in range(n)]),
+        ]
+        for name, f in benchmarks:
+            start = perf_counter()
+            f()
+            duration = perf_counter() - start
+            print(
+                "%-12s %7.1f ms, %5.2f us per element"
+                % (name, duration * 1000, duration / n * 1e6)
+            )
+        tracemalloc.start()
+        elements = [TextField("Name", below=Button("OK")) for _ in range(n)]
+        for element in elements:
+            element._impl
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("%-12s %7d bytes per element" % ("Memory", memory / n))
+    finally:
+        kill_browser()
+
+
+if __name__ == "__main__":
+    main()
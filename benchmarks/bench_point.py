@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the latency of clicking a Point in Helium's two point modes:
+
+ * "element", which finds the element at the point and clicks it, and
+ * "viewport", which moves the mouse straight to the point's coordinates.
+
+Usage::
+
+    python benchmarks/bench_point.py [--num-clicks N] [--firefox]
+"""
+
+from argparse import ArgumentParser
+from statistics import median
+
+from bench_click import time_calls
+
+from helium3 import Config
+from helium3 import Point
+from helium3 import click
+from helium3 import kill_browser
+from helium3 import start_chrome
+from helium3 import start_firefox
+
+PAGE = (
+    "data:text/html,"
+    '<canvas width="400" height="400" style="position: absolute; top: 0; '
+    'left: 0;" onclick="this.dataset.clicks = (+this.dataset.clicks || 0) + 1;">'
+    "</canvas>"
+)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--num-clicks", type=int, default=100)
+    parser.add_argument("--firefox", action="store_true")
+    args = parser.parse_args()
+    if args.firefox:
+        start_firefox(PAGE, headless=True)
+    else:
+        start_chrome(PAGE, headless=True)
+    try:
+        for point_mode in ("element", "viewport"):
+            Config.point_mode = point_mode
+            points = [
+                Point(10 + i % 380, 10 + i // 380) for i in range(args.num_clicks)
+            ]
+            clicks = iter(points)
+            # Warm up, so one-off costs don't distort the results:
+            click(Point(5, 5))
+            timings = time_calls(lambda: click(next(clicks)), len(points))
+            print(
+                "%-9s median %6.2f ms, total %7.1f ms for %d clicks"
+                % (
+                    point_mode,
+                    median(timings) * 1000,
+                    sum(timings) * 1000,
+                    len(timings),
+                )
+            )
+    finally:
+        kill_browser()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,78 +9,89 @@ Helium functions in your Python scripts you can import them from the
 ``helium`` module::
 
     from helium import *
-"""
-from selenium.webdriver.common.keys import Keys
 
+The constants for special keys, such as ``ENTER`` or ``CONTROL``, are plain
+strings with the same values as the attributes of Selenium's ``Keys``. That
+class is available as ``helium3.Keys``, but it is not included in
+``from helium3 import *``: Importing it loads ``selenium.webdriver``, which
+takes long. If you need it, import it explicitly::
+
+    from helium3 import Keys
+"""
 from helium3._impl import APIImpl
 from helium3.api import *
+from helium3.browser import Browser
 from helium3.elements import *
+from helium3.pool import BrowserPool
+from helium3.tracing import Tracer
 from helium3.utils.html import get_easily_readable_snippet
 from helium3.utils.inspect_ import repr_args
 
-NULL = Keys.NULL
-CANCEL = Keys.CANCEL
-HELP = Keys.HELP
-BACK_SPACE = Keys.BACK_SPACE
-TAB = Keys.TAB
-CLEAR = Keys.CLEAR
-RETURN = Keys.RETURN
-ENTER = Keys.ENTER
-SHIFT = Keys.SHIFT
-LEFT_SHIFT = Keys.LEFT_SHIFT
-CONTROL = Keys.CONTROL
-LEFT_CONTROL = Keys.LEFT_CONTROL
-ALT = Keys.ALT
-LEFT_ALT = Keys.LEFT_ALT
-PAUSE = Keys.PAUSE
-ESCAPE = Keys.ESCAPE
-SPACE = Keys.SPACE
-PAGE_UP = Keys.PAGE_UP
-PAGE_DOWN = Keys.PAGE_DOWN
-END = Keys.END
-HOME = Keys.HOME
-LEFT = Keys.LEFT
-ARROW_LEFT = Keys.ARROW_LEFT
-UP = Keys.UP
-ARROW_UP = Keys.ARROW_UP
-RIGHT = Keys.RIGHT
-ARROW_RIGHT = Keys.ARROW_RIGHT
-DOWN = Keys.DOWN
-ARROW_DOWN = Keys.ARROW_DOWN
-INSERT = Keys.INSERT
-DELETE = Keys.DELETE
-SEMICOLON = Keys.SEMICOLON
-EQUALS = Keys.EQUALS
-NUMPAD0 = Keys.NUMPAD0
-NUMPAD1 = Keys.NUMPAD1
-NUMPAD2 = Keys.NUMPAD2
-NUMPAD3 = Keys.NUMPAD3
-NUMPAD4 = Keys.NUMPAD4
-NUMPAD5 = Keys.NUMPAD5
-NUMPAD6 = Keys.NUMPAD6
-NUMPAD7 = Keys.NUMPAD7
-NUMPAD8 = Keys.NUMPAD8
-NUMPAD9 = Keys.NUMPAD9
-MULTIPLY = Keys.MULTIPLY
-ADD = Keys.ADD
-SEPARATOR = Keys.SEPARATOR
-SUBTRACT = Keys.SUBTRACT
-DECIMAL = Keys.DECIMAL
-DIVIDE = Keys.DIVIDE
-F1 = Keys.F1
-F2 = Keys.F2
-F3 = Keys.F3
-F4 = Keys.F4
-F5 = Keys.F5
-F6 = Keys.F6
-F7 = Keys.F7
-F8 = Keys.F8
-F9 = Keys.F9
-F10 = Keys.F10
-F11 = Keys.F11
-F12 = Keys.F12
-META = Keys.META
-COMMAND = Keys.COMMAND
+# The same as selenium.webdriver.common.keys.Keys.NULL etc. We define them here
+# because importing selenium.webdriver takes long:
+NULL = "\ue000"
+CANCEL = "\ue001"
+HELP = "\ue002"
+BACK_SPACE = "\ue003"
+TAB = "\ue004"
+CLEAR = "\ue005"
+RETURN = "\ue006"
+ENTER = "\ue007"
+SHIFT = "\ue008"
+LEFT_SHIFT = "\ue008"
+CONTROL = "\ue009"
+LEFT_CONTROL = "\ue009"
+ALT = "\ue00a"
+LEFT_ALT = "\ue00a"
+PAUSE = "\ue00b"
+ESCAPE = "\ue00c"
+SPACE = "\ue00d"
+PAGE_UP = "\ue00e"
+PAGE_DOWN = "\ue00f"
+END = "\ue010"
+HOME = "\ue011"
+LEFT = "\ue012"
+ARROW_LEFT = "\ue012"
+UP = "\ue013"
+ARROW_UP = "\ue013"
+RIGHT = "\ue014"
+ARROW_RIGHT = "\ue014"
+DOWN = "\ue015"
+ARROW_DOWN = "\ue015"
+INSERT = "\ue016"
+DELETE = "\ue017"
+SEMICOLON = "\ue018"
+EQUALS = "\ue019"
+NUMPAD0 = "\ue01a"
+NUMPAD1 = "\ue01b"
+NUMPAD2 = "\ue01c"
+NUMPAD3 = "\ue01d"
+NUMPAD4 = "\ue01e"
+NUMPAD5 = "\ue01f"
+NUMPAD6 = "\ue020"
+NUMPAD7 = "\ue021"
+NUMPAD8 = "\ue022"
+NUMPAD9 = "\ue023"
+MULTIPLY = "\ue024"
+ADD = "\ue025"
+SEPARATOR = "\ue026"
+SUBTRACT = "\ue027"
+DECIMAL = "\ue028"
+DIVIDE = "\ue029"
+F1 = "\ue031"
+F2 = "\ue032"
+F3 = "\ue033"
+F4 = "\ue034"
+F5 = "\ue035"
+F6 = "\ue036"
+F7 = "\ue037"
+F8 = "\ue038"
+F9 = "\ue039"
+F10 = "\ue03a"
+F11 = "\ue03b"
+F12 = "\ue03c"
+META = "\ue03d"
+COMMAND = "\ue03d"
 
 
 class Config:
@@ -112,6 +123,80 @@ class Config:
 
     For the best results, it is recommended to not use Selenium's
     ``.implicitly_wait(...)`` in conjunction with Helium.
+
+    ``write_mode`` is the default value of parameter ``mode`` of
+    :py:func:`write`. It determines how text is entered into text fields.
+    The default ``"keys"`` types texts key by key, like a user would. To
+    paste texts into plain ``<textarea>`` elements in one go and type them
+    into all other elements, use::
+
+        Config.write_mode = "auto"
+
+    This is faster for long texts, but costs an additional request to the
+    browser for every :py:func:`write`. Also, ``"auto"`` only recognizes
+    inline key handlers such as ``onkeydown="..."``. A ``<textarea>`` whose
+    key handlers were added with ``addEventListener(...)``, for instance by a
+    JavaScript framework, receives no key events in this mode.
+
+    ``locator_cache`` is the path of a file in which Helium remembers the
+    elements it found. When a script runs again on a page with the same URL
+    pattern (where numbers in the path are ignored), Helium first tries the
+    element it found last time. It only performs its full search if that
+    element no longer matches. This makes repeated runs of the same script
+    faster. The file can be shared between processes. To enable the cache::
+
+        Config.locator_cache = "helium_locators.sqlite"
+
+    The cache is only used for elements that are not searched for relative to
+    other elements (eg. ``Button("OK", below="Title")``), and only remembers
+    elements that are the only match on their page.
+
+    ``point_mode`` determines how actions such as :py:func:`click` or
+    :py:func:`hover` treat a :py:class:`Point`. In the default mode
+    ``"element"``, Helium finds the element at the point and moves the mouse to
+    it. In mode ``"viewport"``, Helium moves the mouse straight to the point's
+    coordinates in the visible part of the page, without looking up an element.
+    This is faster when you click many points, for instance on a ``<canvas>``::
+
+        Config.point_mode = "viewport"
+
+    ``scroll_into_view`` determines where Helium scrolls an element to before
+    it moves the mouse to it, for instance in :py:func:`hover` or
+    :py:func:`drag`. Helium only scrolls when the element is not entirely
+    visible, and waits for it to stop moving before it moves the mouse. The
+    value is the vertical alignment of the element in the window: ``"start"``,
+    ``"center"`` (the default), ``"end"`` or ``"nearest"``. To leave scrolling
+    to the browser, use::
+
+        Config.scroll_into_view = None
+
+    ``search_shadow_dom`` makes Helium also search for elements inside open
+    shadow roots, as used by web components. Helium searches the page and all
+    of its shadow roots with a single script. This is slower than Helium's
+    normal search on pages with many elements, so it is off by default. To
+    enable it::
+
+        Config.search_shadow_dom = True
     """
 
     implicit_wait_secs = 10
+    write_mode = "keys"
+    locator_cache = None
+    point_mode = "element"
+    scroll_into_view = "center"
+    search_shadow_dom = False
+
+
+def __getattr__(name):
+    # Selenium's Keys, for compatibility. Importing it loads selenium.webdriver,
+    # which takes long, so only do this when it is used:
+    if name == "Keys":
+        from selenium.webdriver.common.keys import Keys
+
+        return Keys
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + ["Keys"])
+
@@ -1,40 +1,46 @@
 # -*- coding: utf-8 -*-
 import atexit
 import re
+from collections import namedtuple
+from contextlib import contextmanager
 from copy import copy
-from inspect import getfullargspec
-from inspect import isfunction
-from inspect import ismethod
-from os import X_OK
-from os import access
-from os.path import dirname
-from os.path import join
+from inspect import signature
 from time import sleep
 from time import time
+from urllib.parse import urldefrag
 
+from selenium.common.exceptions import ElementClickInterceptedException
+from selenium.common.exceptions import ElementNotInteractableException
 from selenium.common.exceptions import ElementNotVisibleException
 from selenium.common.exceptions import MoveTargetOutOfBoundsException
 from selenium.common.exceptions import NoAlertPresentException
 from selenium.common.exceptions import NoSuchWindowException
 from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException
 from selenium.common.exceptions import UnexpectedAlertPresentException
 from selenium.common.exceptions import WebDriverException
-from selenium.webdriver import Chrome
-from selenium.webdriver import ChromeOptions
-from selenium.webdriver import Firefox
-from selenium.webdriver import FirefoxOptions
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.support.wait import WebDriverWait
 
+from helium3._impl import resources
+from helium3._impl import shadow_dom
+from helium3._impl.command_stats import CommandBudget
+from helium3._impl.drivers import kill_service
+from helium3._impl.drivers import start_driver
+from helium3._impl.drivers import start_shared_chrome
+from helium3._impl.locator_cache import find_cached_element
+from helium3._impl.locator_cache import get_fingerprint
+from helium3._impl.locator_cache import get_locator_cache
 from helium3._impl.match_type import PREFIX_IGNORE_CASE
+from helium3._impl.reset import get_origin
 from helium3._impl.selenium_wrappers import FrameIterator
 from helium3._impl.selenium_wrappers import FramesChangedWhileIterating
+from helium3._impl.selenium_wrappers import ScriptSelect
 from helium3._impl.selenium_wrappers import WebDriverWrapper
 from helium3._impl.selenium_wrappers import WebElementWrapper
+from helium3._impl.tracing import span
 from helium3.utils.dictionary import inverse
-from helium3.utils.os_ import make_executable
-from helium3.utils.system import get_canonical_os_name
+from helium3.utils.geom import Rectangle
+from helium3.utils.inspect_ import repr_args
+from helium3.utils.lang import copy_slots
 from helium3.utils.system import is_windows
 from helium3.utils.xpath import lower
 from helium3.utils.xpath import predicate
@@ -43,17 +49,27 @@ from helium3.utils.xpath import predicate_or
 
 def might_spawn_window(f):
     def f_decorated(self, *args, **kwargs):
-        driver = self.require_driver()
-        if driver.is_ie() and AlertImpl(driver).exists():
-            # Accessing .window_handles in IE when an alert is present raises an
-            # UnexpectedAlertPresentException. When DesiredCapability
-            # 'unexpectedAlertBehaviour' is not 'ignore' (the default is
-            # 'dismiss'), this leads to the alert being closed. Since we don't
-            # want to unintentionally close alert dialogs, we therefore do not
-            # access .window_handles in IE when an alert is present.
+        with switching_to_new_window(self.require_driver()):
             return f(self, *args, **kwargs)
+
+    return f_decorated
+
+
+@contextmanager
+def switching_to_new_window(driver):
+    if driver.is_ie() and AlertImpl(driver).exists():
+        # Accessing .window_handles in IE when an alert is present raises an
+        # UnexpectedAlertPresentException. When DesiredCapability
+        # 'unexpectedAlertBehaviour' is not 'ignore' (the default is
+        # 'dismiss'), this leads to the alert being closed. Since we don't
+        # want to unintentionally close alert dialogs, we therefore do not
+        # access .window_handles in IE when an alert is present.
+        yield
+        return
+    with span("get_windows_before"):
         window_handles_before = driver.window_handles[:]
-        result = f(self, *args, **kwargs)
+    yield
+    with span("detect_new_window"):
         # As above, don't access .window_handles in IE if an alert is present:
         if not (driver.is_ie() and AlertImpl(driver).exists()):
             if driver.is_firefox():
@@ -65,9 +81,24 @@ def might_spawn_window(f):
             ]
             if new_window_handles:
                 driver.switch_to.window(new_window_handles[0])
-        return result
 
-    return f_decorated
+
+def batchable(action):
+    """
+    Makes the decorated APIImpl method record the given action in the current
+    batch (see `Batch`), if there is one, instead of performing it right away.
+    """
+
+    def decorator(f):
+        def f_decorated(self, *args, **kwargs):
+            if self._batch is not None:
+                self._batch.add(action, *args, **kwargs)
+            else:
+                return f(self, *args, **kwargs)
+
+        return f_decorated
+
+    return decorator
 
 
 def handle_unexpected_alert(f):
@@ -98,53 +129,100 @@ class APIImpl:
 
     def __init__(self):
         self.driver = None
-
-    def start_firefox_impl(self, url=None, headless=False, options=None):
-        firefox_driver = self._start_firefox_driver(headless, options)
+        self.start_timings = None
+        self._batch = None
+
+    def start_firefox_impl(
+        self,
+        url=None,
+        headless=False,
+        options=None,
+        block_resources=None,
+        page_load_strategy=None,
+    ):
+        firefox_driver = self._start_firefox_driver(
+            headless, options, block_resources, page_load_strategy
+        )
         return self._start(firefox_driver, url)
 
-    def _start_firefox_driver(self, headless, options):
+    def _start_firefox_driver(
+        self, headless, options, block_resources=None, page_load_strategy=None
+    ):
+        # Importing selenium.webdriver takes long. Only do it when needed:
+        from selenium.webdriver import Firefox
+        from selenium.webdriver import FirefoxOptions
+
         firefox_options = FirefoxOptions() if options is None else options
         if headless:
             firefox_options.headless = True
-        kwargs = {
-            "options": firefox_options,
-            "service_log_path": "nul" if is_windows() else "/dev/null",
-        }
-        try:
-            result = Firefox(**kwargs)
-        except WebDriverException:
-            # This usually happens when geckodriver is not on the PATH.
-            driver_path = self._use_included_web_driver("geckodriver")
-            result = Firefox(executable_path=driver_path, **kwargs)
-        atexit.register(self._kill_service, result.service)
+        if block_resources:
+            resources.add_to_firefox_options(firefox_options, block_resources)
+        self._set_page_load_strategy(firefox_options, page_load_strategy)
+        result, self.start_timings = start_driver(
+            Firefox,
+            "geckodriver",
+            firefox_options,
+            service_log_path="nul" if is_windows() else "/dev/null",
+        )
+        atexit.register(kill_service, result.service)
         return result
 
     def start_chrome_impl(
-        self, url=None, headless=False, maximize=False, options=None, capabilities=None
+        self,
+        url=None,
+        headless=False,
+        maximize=False,
+        options=None,
+        capabilities=None,
+        block_resources=None,
+        page_load_strategy=None,
+        shared_service=False,
     ):
         chrome_driver = self._start_chrome_driver(
-            headless, maximize, options, capabilities
+            headless,
+            maximize,
+            options,
+            capabilities,
+            block_resources,
+            page_load_strategy,
+            shared_service,
         )
-        return self._start(chrome_driver, url)
-
-    def _start_chrome_driver(self, headless, maximize, options, capabilities):
+        return self._start(chrome_driver, url, block_resources)
+
+    def _start_chrome_driver(
+        self,
+        headless,
+        maximize,
+        options,
+        capabilities,
+        block_resources=None,
+        page_load_strategy=None,
+        shared_service=False,
+    ):
         chrome_options = self._get_chrome_options(headless, maximize, options)
-        try:
-            result = Chrome(options=chrome_options, desired_capabilities=capabilities)
-        except WebDriverException:
-            # This usually happens when chromedriver is not on the PATH.
-            driver_path = self._use_included_web_driver("chromedriver")
-            result = Chrome(
-                options=chrome_options,
-                desired_capabilities=capabilities,
-                executable_path=driver_path,
+        if block_resources:
+            # Fail early, before we start Chrome, if a resource is invalid:
+            resources.parse_blocked_resources(block_resources)
+            resources.add_to_chrome_options(chrome_options)
+        self._set_page_load_strategy(chrome_options, page_load_strategy)
+        if shared_service:
+            # The shared service stops when its last browser quits:
+            result, self.start_timings = start_shared_chrome(
+                chrome_options, capabilities
             )
-        atexit.register(self._kill_service, result.service)
+            return result
+        from selenium.webdriver import Chrome
+
+        result, self.start_timings = start_driver(
+            Chrome, "chromedriver", chrome_options, desired_capabilities=capabilities
+        )
+        atexit.register(kill_service, result.service)
         return result
 
     @staticmethod
     def _get_chrome_options(headless, maximize, options):
+        from selenium.webdriver import ChromeOptions
+
         result = ChromeOptions() if options is None else options
         # Prevent Chrome's debug logs from appearing in our console window:
         result.add_experimental_option("excludeSwitches", ["enable-logging"])
@@ -154,43 +232,107 @@ class APIImpl:
             result.add_argument("--start-maximized")
         return result
 
-    @staticmethod
-    def _use_included_web_driver(driver_name):
-        if is_windows():
-            driver_name += ".exe"
-        driver_path = join(
-            dirname(__file__), "webdrivers", get_canonical_os_name(), driver_name
-        )
-        if not access(driver_path, X_OK):
-            try:
-                make_executable(driver_path)
-            except Exception:
-                raise RuntimeError(
-                    "The driver located at %s is not executable." % driver_path
-                ) from None
-        return driver_path
+    PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
 
-    @staticmethod
-    def _kill_service(service):
-        old = service.send_remote_shutdown_command
-        service.send_remote_shutdown_command = lambda: None
-        try:
-            service.stop()
-        finally:
-            service.send_remote_shutdown_command = old
+    @classmethod
+    def _set_page_load_strategy(cls, options, page_load_strategy):
+        if page_load_strategy is None:
+            return
+        if page_load_strategy not in cls.PAGE_LOAD_STRATEGIES:
+            raise ValueError(
+                "Invalid page load strategy %r. Must be one of %s."
+                % (page_load_strategy, ", ".join(map(repr, cls.PAGE_LOAD_STRATEGIES)))
+            )
+        options.set_capability("pageLoadStrategy", page_load_strategy)
 
-    def _start(self, browser, url=None):
+    def _start(self, browser, url=None, block_resources=None):
         self.set_driver_impl(browser)
+        if block_resources:
+            self.driver.resource_blocker.block(block_resources)
         if url is not None:
             self.go_to_impl(url)
         return self.get_driver_impl()
 
+    # Maps the values of go_to(..., wait=...) to document.readyState values:
+    READY_STATES = {
+        "load": ["complete"],
+        "domcontentloaded": ["interactive", "complete"],
+        "none": [],
+    }
+
     @might_spawn_window
     @handle_unexpected_alert
-    def go_to_impl(self, url):
+    def go_to_impl(self, url, wait="load"):
+        from helium3 import GUIElement
+
+        if wait not in self.READY_STATES and not isinstance(wait, GUIElement):
+            raise ValueError(
+                "Invalid value wait=%r. Must be one of %s or a Helium element "
+                "such as Button('OK')."
+                % (wait, ", ".join(map(repr, self.READY_STATES)))
+            )
         if "://" not in url:
             url = "http://" + url  # noqa
-        self.require_driver().get(url)
+        driver = self.require_driver()
+        # With the "normal" page load strategy, driver.get(...) waits for the
+        # load event:
+        waits_for_load = driver.page_load_strategy == "normal"
+        if (
+            not waits_for_load
+            and wait != "none"
+            and not self._is_same_document(driver.current_url, url)
+        ):
+            # With page load strategies "eager" and "none", driver.get(...) may
+            # return before the browser has replaced the current document. Mark
+            # the current document, so we don't mistake it for the new one:
+            self._mark_document_as_old()
+        driver.visited_origins.add(get_origin(url))
+        if driver.resource_blocker.is_blocking:
+            # Don't let the performance log grow with every page we visit:
+            driver.resource_blocker.read_log()
+        driver.get(url)
+        if isinstance(wait, GUIElement):
+            if waits_for_load:
+                self._wait_for(wait._impl.exists)
+            else:
+                self._wait_for(lambda: self._is_new_document() and wait._impl.exists())
+        elif wait != "none" and not waits_for_load:
+            self._wait_for(lambda: self._has_ready_state(self.READY_STATES[wait]))
+
+    @staticmethod
+    def _is_same_document(current_url, url):
+        # Navigating to a different #fragment doesn't load a new document:
+        return "#" in url and urldefrag(url)[0] == urldefrag(current_url)[0]
+
+    def _mark_document_as_old(self):
+        try:
+            self.require_driver().execute_script("document.heliumIsOld = true;")
+        except WebDriverException:
+            # Eg. because the current page doesn't allow scripts. We will then
+            # only wait for the requested ready state.
+            pass
+
+    def _is_new_document(self):
+        try:
+            return self.require_driver().execute_script("return !document.heliumIsOld;")
+        except WebDriverException:
+            # Eg. because the browser is replacing the document. Try again:
+            return False
+
+    def _has_ready_state(self, ready_states):
+        try:
+            ready_state = self.require_driver().execute_script(
+                "return document.heliumIsOld ? null : document.readyState;"
+            )
+        except WebDriverException:
+            # Eg. because the browser is replacing the document. Try again:
+            return False
+        return ready_state in ready_states
+
+    def _wait_for(self, condition_fn):
+        from helium3 import Config
+
+        self.wait_until_impl(condition_fn, Config.implicit_wait_secs, interval_secs=0.1)
 
     def set_driver_impl(self, driver):
         self.driver = WebDriverWrapper(driver)
@@ -199,33 +341,128 @@ class APIImpl:
         if self.driver is not None:
             return self.driver.unwrap()
 
+    def get_start_timings_impl(self):
+        return self.start_timings
+
+    WRITE_MODES = ("auto", "keys", "insert", "value")
+
+    @batchable("write")
     @might_spawn_window
     @handle_unexpected_alert
-    def write_impl(self, text, into=None):
+    def write_impl(self, text, into=None, mode=None):
+        into, mode = self._get_write_target_and_mode(into, mode)
+        self._handle_alerts(
+            self._write_no_alert, self._write_with_alert, text, into=into, mode=mode
+        )
+
+    def _get_write_target_and_mode(self, into, mode):
+        if mode is None:
+            from helium3 import Config
+
+            mode = Config.write_mode
+        if mode not in self.WRITE_MODES:
+            raise ValueError(
+                "Invalid write mode %r. Must be one of %s."
+                % (mode, ", ".join(map(repr, self.WRITE_MODES)))
+            )
         if into is not None:
             from helium3 import GUIElement
 
             if isinstance(into, GUIElement):
                 into = into._impl
-        self._handle_alerts(
-            self._write_no_alert, self._write_with_alert, text, into=into
-        )
+        return into, mode
 
-    def _write_no_alert(self, text, into=None):
+    def _write_no_alert(self, text, into=None, mode="keys"):
         if into:
             if isinstance(into, str):
                 into = TextFieldImpl(self.require_driver(), into)
 
             def _write(elt):
-                if hasattr(elt, "clear") and callable(elt.clear):
-                    elt.clear()
-                elt.send_keys(text)
+                self._write_into(elt, text, mode)
 
             self._manipulate(into, _write)
         else:
-            self.require_driver().switch_to.active_element.send_keys(text)
+            active_element = self.require_driver().switch_to.active_element
+            self._write_into(WebElementWrapper(active_element), text, mode, False)
+
+    def _write_into(self, elt, text, mode, replace=True):
+        if (
+            mode != "keys"
+            and isinstance(text, str)
+            and not self._contains_special_keys(text)
+            and hasattr(elt, "execute_script")
+        ):
+            mode = self._write_without_keys(elt, text, mode, replace)
+        if mode == "keys":
+            if replace and hasattr(elt, "clear") and callable(elt.clear):
+                elt.clear()
+            elt.send_keys(text)
+
+    @staticmethod
+    def _contains_special_keys(text):
+        # Selenium's Keys (ENTER, CONTROL, ...) lie in this Unicode range. They
+        # only have an effect when they are typed:
+        return any("\ue000" <= char <= "\uf8ff" for char in text)
+
+    @staticmethod
+    def _write_without_keys(elt, text, mode, replace):
+        """
+        Writes `text` into `elt` with a single script call instead of typing it
+        key by key. Returns "keys" if the text needs to be typed after all,
+        because we are in mode "auto" and the element may react to key events
+        or is not a plain <textarea>.
+        """
+        return elt.execute_script(
+            "var elt = arguments[0], text = arguments[1], mode = arguments[2],"
+            "    replace = arguments[3];"
+            "var isField = elt.tagName == 'INPUT' || elt.tagName == 'TEXTAREA';"
+            "if (mode == 'auto') {"
+            "    var keyHandlers = ['onkeydown', 'onkeypress', 'onkeyup'];"
+            "    for (var i = 0; i < keyHandlers.length; i++)"
+            "        if (elt.hasAttribute(keyHandlers[i]))"
+            "            return 'keys';"
+            "    if (elt.tagName != 'TEXTAREA' || elt.readOnly || elt.disabled)"
+            "        return 'keys';"
+            "    mode = 'insert';"
+            "}"
+            "if (!isField && !elt.isContentEditable)"
+            "    return 'keys';"
+            "elt.focus();"
+            "if (mode == 'insert' && text) {"
+            "    if (replace) {"
+            "        if (isField) {"
+            "            elt.select();"
+            "        } else {"
+            "            var range = document.createRange();"
+            "            range.selectNodeContents(elt);"
+            "            var selection = window.getSelection();"
+            "            selection.removeAllRanges();"
+            "            selection.addRange(range);"
+            "        }"
+            "    }"
+            "    if (document.execCommand('insertText', false, text))"
+            "        return mode;"
+            "}"
+            "if (isField) {"
+            "    var prototype = elt.tagName == 'TEXTAREA' ?"
+            "        HTMLTextAreaElement.prototype : HTMLInputElement.prototype;"
+            "    var value = replace ? text : elt.value + text;"
+            # Use the native setter, so frameworks such as React notice the
+            # change:
+            "    Object.getOwnPropertyDescriptor(prototype, 'value')"
+            "        .set.call(elt, value);"
+            "} else {"
+            "    elt.textContent = replace ? text : elt.textContent + text;"
+            "}"
+            "elt.dispatchEvent(new Event('input', {bubbles: true}));"
+            "elt.dispatchEvent(new Event('change', {bubbles: true}));"
+            "return 'value';",
+            text,
+            mode,
+            replace,
+        )
 
-    def _write_with_alert(self, text, into=None):
+    def _write_with_alert(self, text, into=None, mode=None):
         if into is None:
             into = AlertImpl(self.require_driver())
         if not isinstance(into, AlertImpl):
@@ -240,11 +477,13 @@ class APIImpl:
             return no_alert(*args, **kwargs)
         return with_alert(*args, **kwargs)
 
+    @batchable("press")
     @might_spawn_window
     @handle_unexpected_alert
     def press_impl(self, key):
         self.require_driver().switch_to.active_element.send_keys(key)
 
+    @batchable("click")
     def click_impl(self, element):
         self._perform_mouse_action(element, self._click)
 
@@ -264,8 +503,30 @@ class APIImpl:
         self._perform_mouse_action(element, self._release_mouse_over)
 
     def _click(self, selenium_elt, offset):
+        if offset is None and self._click_directly(selenium_elt):
+            return
         self._move_to_element(selenium_elt, offset).click().perform()
 
+    def _click_directly(self, selenium_elt):
+        """
+        Clicks the element with WebDriver's Element Click command. This takes
+        one request and is faster than a sequence of pointer actions. The
+        browser checks that the element is the topmost one at its center.
+        If it isn't (eg. because of an overlay), this method returns False and
+        the caller falls back to pointer actions, which click whatever element
+        is at that position, like a user would.
+        """
+        try:
+            selenium_elt.click()
+        except (ElementClickInterceptedException, ElementNotInteractableException):
+            return False
+        except WebDriverException as e:
+            # Older drivers report intercepted clicks with a generic error:
+            if "is not clickable at point" in (e.msg or ""):
+                return False
+            raise
+        return True
+
     def _doubleclick(self, selenium_elt, offset):
         self._move_to_element(selenium_elt, offset).double_click().perform()
 
@@ -282,13 +543,84 @@ class APIImpl:
         self._move_to_element(selenium_elt, offset).release().perform()
 
     def _move_to_element(self, element, offset):
+        if element is not None and offset is None:
+            # Elements at a point (ie. with an offset) are already in view.
+            self._scroll_into_view(element)
         result = self.require_driver().action()
-        if offset is not None:
-            result.move_to_element_with_offset(element, *offset)
-        else:
-            result.move_to_element(element)
+        self._move_to(result, element, offset)
         return result
 
+    SCROLL_ALIGNMENTS = ("start", "center", "end", "nearest")
+
+    def _scroll_into_view(self, element):
+        """
+        Scrolls the given element into view if it isn't already, and waits for
+        it to stop moving. Otherwise, the pointer may miss an element that is
+        outside the viewport or still being scrolled (eg. because the page uses
+        smooth scrolling). This happens in a single request.
+        """
+        from helium3 import Config
+
+        block = Config.scroll_into_view
+        if block is None:
+            return
+        if block not in self.SCROLL_ALIGNMENTS:
+            raise ValueError(
+                "Invalid scroll alignment %r. Must be one of %s, or None."
+                % (block, ", ".join(map(repr, self.SCROLL_ALIGNMENTS)))
+            )
+        self.require_driver().execute_async_script(
+            "var elt = arguments[0], done = arguments[arguments.length - 1];"
+            "var rect = elt.getBoundingClientRect();"
+            "if (rect.top >= 0 && rect.left >= 0"
+            "        && rect.bottom <= window.innerHeight"
+            "        && rect.right <= window.innerWidth) {"
+            "    done();"
+            "    return;"
+            "}"
+            "elt.scrollIntoView({block: arguments[1], inline: 'nearest'});"
+            # Browsers don't run animation frames in hidden tabs:
+            "var nextFrame = document.hidden ? function(f) { setTimeout(f, 16); }"
+            "    : window.requestAnimationFrame.bind(window);"
+            "var endTime = Date.now() + 1000;"
+            "function waitUntilStable(last) {"
+            "    var rect = elt.getBoundingClientRect();"
+            "    if (rect.top == last.top && rect.left == last.left"
+            "            || Date.now() > endTime)"
+            "        done();"
+            "    else"
+            "        nextFrame(function() { waitUntilStable(rect); });"
+            "}"
+            # Smooth scrolling only starts in the next frame. Compare the
+            # positions from then on, or the element may seem to stand still:
+            "nextFrame(function() {"
+            "    var rect = elt.getBoundingClientRect();"
+            "    nextFrame(function() { waitUntilStable(rect); });"
+            "});",
+            element,
+            block,
+        )
+
+    def _move_to(self, actions, element, offset):
+        if element is None:
+            # A Point in viewport mode. See _is_viewport_point(...).
+            actions.w3c_actions.pointer_action.move_to_location(*offset)
+            actions.w3c_actions.key_action.pause()
+        elif offset is None:
+            actions.move_to_element(element)
+        elif isinstance(offset, ElementOffset) and self.require_driver().w3c:
+            # W3C actions are relative to the center of the element. Selenium's
+            # move_to_element_with_offset(...) fetches the element's size to
+            # convert the offset. We already know it, so save the round trip:
+            actions.w3c_actions.pointer_action.source.create_pointer_move(
+                origin=element,
+                x=int(offset.x - offset.width / 2),
+                y=int(offset.y - offset.height / 2),
+            )
+            actions.w3c_actions.key_action.pause()
+        else:
+            actions.move_to_element_with_offset(element, offset.x, offset.y)
+
     def drag_impl(self, element, to):
         with DragHelper(self) as drag_helper:
             self._perform_mouse_action(element, drag_helper.start_dragging)
@@ -297,9 +629,29 @@ class APIImpl:
     @might_spawn_window
     @handle_unexpected_alert
     def _perform_mouse_action(self, element, action):
+        if self._is_viewport_point(element):
+            action(None, element)
+            return
         element, offset = self._unwrap_clickable_element(element)
         self._manipulate(element, lambda wew: action(wew.unwrap(), offset))
 
+    POINT_MODES = ("element", "viewport")
+
+    def _is_viewport_point(self, elt):
+        from helium3 import Config
+        from helium3 import Point
+
+        if not isinstance(elt, Point):
+            return False
+        if Config.point_mode not in self.POINT_MODES:
+            raise ValueError(
+                "Invalid point mode %r. Must be one of %s."
+                % (Config.point_mode, ", ".join(map(repr, self.POINT_MODES)))
+            )
+        # Moving to a location in the viewport requires W3C actions. Older
+        # drivers fall back to moving to the element at the point:
+        return Config.point_mode == "viewport" and self.require_driver().w3c
+
     def _unwrap_clickable_element(self, elt):
         from helium3 import HTMLElement
         from helium3 import Point
@@ -313,22 +665,50 @@ class APIImpl:
             elt, offset = self._point_to_element_and_offset(elt)
         return elt, offset
 
+    def _resolve_clickable_element(self, elt):
+        """
+        Like `_unwrap_clickable_element(...)`, but waits for the element to
+        appear and returns the underlying Selenium WebElement.
+        """
+        if self._is_viewport_point(elt):
+            return None, elt
+        elt, offset = self._unwrap_clickable_element(elt)
+        if isinstance(elt, GUIElementImpl):
+            elt = elt.first_occurrence
+        if isinstance(elt, WebElementWrapper):
+            elt = elt.unwrap()
+        return elt, offset
+
     def _point_to_element_and_offset(self, point):
         driver = self.require_driver()
-        element = WebElementWrapper(
-            driver.execute_script(
-                "return document.elementFromPoint(%r, %r);" % (point.x, point.y)
-            )
+        # Find the element and its location in one round trip. Its location is
+        # relative to the document, like Selenium's WebElement.location:
+        result = driver.execute_script(
+            "var elt = document.elementFromPoint(arguments[0], arguments[1]);"
+            "if (!elt)"
+            "    return null;"
+            "var rect = elt.getBoundingClientRect();"
+            "return ["
+            "    elt, rect.left + window.pageXOffset, "
+            "    rect.top + window.pageYOffset, rect.width, rect.height"
+            "];",
+            point.x,
+            point.y,
         )
-        offset = point - (element.location.left, element.location.top)
-        if offset == (0, 0) and driver.is_firefox():
+        if result is None:
+            raise LookupError("There is no element at %r." % (point,))
+        web_element, left, top, width, height = result
+        element = WebElementWrapper(web_element)
+        element._cached_location = Rectangle(left, top, width, height)
+        x, y = point - (left, top)
+        if (x, y) == (0, 0) and driver.is_firefox():
             # In some CSS settings (eg. test_point.html), the (0, 0) point of
             # buttons in Firefox is not clickable! The reason for this is that
             # Firefox styles buttons to not be perfect squares, but have an
             # indent in the corners. This workaround makes `click(btn.top_left)`
             # work even when this happens:
-            offset = (1, 1)
-        return element, offset
+            x, y = 1, 1
+        return element, ElementOffset(x, y, width, height)
 
     @handle_unexpected_alert
     def find_all_impl(self, predicate):
@@ -337,15 +717,19 @@ class APIImpl:
             for bound_gui_elt_impl in predicate._impl.find_all()
         ]
 
+    @batchable("scroll_down")
     def scroll_down_impl(self, num_pixels):
         self._scroll_by(0, num_pixels)
 
+    @batchable("scroll_up")
     def scroll_up_impl(self, num_pixels):
         self._scroll_by(0, -num_pixels)
 
+    @batchable("scroll_right")
     def scroll_right_impl(self, num_pixels):
         self._scroll_by(num_pixels, 0)
 
+    @batchable("scroll_left")
     def scroll_left_impl(self, num_pixels):
         self._scroll_by(-num_pixels, 0)
 
@@ -355,9 +739,13 @@ class APIImpl:
             "window.scrollBy(arguments[0], arguments[1]);", dx_pixels, dy_pixels
         )
 
+    @batchable("select")
     @might_spawn_window
     @handle_unexpected_alert
     def select_impl(self, combo_box, value):
+        self._select(combo_box, value)
+
+    def _select(self, combo_box, value):
         from helium3 import ComboBox
 
         if isinstance(combo_box, str):
@@ -366,9 +754,7 @@ class APIImpl:
             combo_box = combo_box._impl
 
         def _select(web_element):
-            if isinstance(web_element, WebElementWrapper):
-                web_element = web_element.unwrap()
-            Select(web_element).select_by_visible_text(value)
+            ScriptSelect(web_element).select_by_visible_text(value)
 
         self._manipulate(combo_box, _select)
 
@@ -377,6 +763,8 @@ class APIImpl:
         if hasattr(gui_or_web_elt, "perform") and callable(gui_or_web_elt.perform):
             driver.last_manipulated_element = gui_or_web_elt.perform(action)
         else:
+            from selenium.webdriver.remote.webelement import WebElement
+
             if isinstance(gui_or_web_elt, WebElement):
                 gui_or_web_elt = WebElementWrapper(gui_or_web_elt)
             action(gui_or_web_elt)
@@ -408,7 +796,7 @@ class APIImpl:
             to = FileInput(driver, to)
         elif isinstance(to, Point):
             to, _ = self._point_to_element_and_offset(to)
-        self._manipulate(to, lambda elt: elt.send_keys(file_path))
+        self._manipulate(to, lambda elt: driver.file_uploader.send_file(elt, file_path))
 
     def refresh_impl(self):
         self._handle_alerts(self._refresh_no_alert, self._refresh_with_alert)
@@ -421,16 +809,15 @@ class APIImpl:
         self._refresh_no_alert()
 
     def wait_until_impl(self, condition_fn, timeout_secs=10, interval_secs=0.5):
-        if ismethod(condition_fn):
-            is_bound = condition_fn.__self__ is not None
-            args_spec = getfullargspec(condition_fn).args
-            unfilled_args = len(args_spec) - (1 if is_bound else 0)
-        else:
-            if not isfunction(condition_fn):
-                condition_fn = condition_fn.__call__
-            args_spec = getfullargspec(condition_fn).args
-            unfilled_args = len(args_spec)
-        condition = condition_fn if unfilled_args else lambda driver: condition_fn()
+        # Unlike getfullargspec(...), signature(...) skips the `self` of bound
+        # methods and sees through decorators such as @traced:
+        parameters = signature(condition_fn).parameters.values()
+        takes_driver = any(
+            p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in parameters
+        )
+        condition = condition_fn if takes_driver else lambda driver: condition_fn()
+        from selenium.webdriver.support.wait import WebDriverWait
+
         wait = WebDriverWait(
             self.require_driver().unwrap(), timeout_secs, poll_frequency=interval_secs
         )
@@ -486,12 +873,464 @@ class APIImpl:
             previous_style,
         )
 
+    def set_blocked_resources_impl(self, resources):
+        self.require_driver().resource_blocker.block(resources)
+
+    def get_blocked_requests_impl(self):
+        return self.require_driver().resource_blocker.get_blocked_urls()
+
+    def batch_impl(self):
+        return Batch(self)
+
+    def command_budget_impl(self, max_commands, warn):
+        return CommandBudget(max_commands, warn)
+
+    def paginate_impl(self, next_, items):
+        from helium3 import HTMLElement
+
+        if isinstance(next_, str):
+            next_ = ClickableText(self.require_driver(), next_)
+        elif isinstance(next_, HTMLElement):
+            next_ = next_._impl
+        if not isinstance(items, HTMLElement):
+            raise ValueError(
+                "items must be a Helium element such as S('.result'), not %r."
+                % (items,)
+            )
+        return Paginator(self, next_, items).get_items()
+
     def require_driver(self):
         if not self.driver:
             raise RuntimeError(self.DRIVER_REQUIRED_MESSAGE)
         return self.driver
 
 
+class Batch:
+    """
+    Records the Helium actions performed inside a `with batch():` block and
+    performs them at the end of the block, with as few WebDriver round trips as
+    possible: Consecutive clicks on elements that are already in view are
+    sent as a single W3C actions request, consecutive key presses as a single
+    `send_keys(...)` call and consecutive scrolls as a single script. Whether
+    an alert is present and whether new windows were opened is only checked
+    once for the whole batch, instead of once per action.
+    """
+
+    SCROLL_DIRECTIONS = {
+        "scroll_down": (0, 1),
+        "scroll_up": (0, -1),
+        "scroll_right": (1, 0),
+        "scroll_left": (-1, 0),
+    }
+
+    def __init__(self, api_impl):
+        self.api_impl = api_impl
+        self.steps = []
+        self.completed_steps = []
+        self.current_steps = []
+
+    def __enter__(self):
+        if self.api_impl._batch is not None:
+            raise RuntimeError("Batches cannot be nested.")
+        self.api_impl.require_driver()
+        self.api_impl._batch = self
+        return self
+
+    def add(self, action, *args, **kwargs):
+        self.steps.append(BatchStep(action, args, kwargs))
+
+    def __exit__(self, exc_type, *_):
+        self.api_impl._batch = None
+        if exc_type is None:
+            self._perform()
+
+    @handle_unexpected_alert
+    def _perform(self):
+        driver = self.api_impl.require_driver()
+        if not self.steps:
+            return
+        if AlertImpl(driver).exists():
+            raise UnexpectedAlertPresentException()
+        with switching_to_new_window(driver):
+            # Don't raise the error inside the with block, so we still switch
+            # to windows opened by the steps that did complete:
+            error = self._perform_steps()
+        if error is not None:
+            raise error
+
+    def _perform_steps(self):
+        start = 0
+        while start < len(self.steps):
+            end = start + 1
+            kind = self._get_kind(self.steps[start])
+            if kind != "single":
+                while end < len(self.steps) and self._get_kind(self.steps[end]) == kind:
+                    end += 1
+            group = self.steps[start:end]
+            try:
+                getattr(self, "_perform_" + kind)(group)
+            except Exception as e:
+                error = BatchError(
+                    self.steps, self.completed_steps, self.current_steps, e
+                )
+                error.__cause__ = e
+                return error
+            start = end
+
+    def _get_kind(self, step):
+        if step.action == "click":
+            return "clicks"
+        if step.action == "press":
+            return "presses"
+        if step.action in self.SCROLL_DIRECTIONS:
+            return "scrolls"
+        return "single"
+
+    def _perform_clicks(self, steps):
+        while steps:
+            targets = self._find_targets_in_view(steps)
+            self._click_all(steps[: len(targets)], targets)
+            steps = steps[len(targets) :]
+            if steps:
+                # The next target is not on the page or not in view yet, eg.
+                # because one of the clicks above reveals it. Click it the
+                # usual way, which waits for it, scrolls it into view and
+                # retries if something is in the way:
+                self._click_one(steps[0])
+                steps = steps[1:]
+
+    def _find_targets_in_view(self, steps):
+        """
+        Finds the targets of the longest prefix of the given click steps that
+        can be clicked right now, without waiting or scrolling.
+        """
+        targets = []
+        for step in steps:
+            target = self._find_target_now(step.arguments["element"])
+            if target is None:
+                break
+            targets.append(target)
+        in_view = self._are_in_view(targets)
+        return targets[: in_view.index(False) if False in in_view else len(targets)]
+
+    def _find_target_now(self, elt):
+        if self.api_impl._is_viewport_point(elt):
+            return None, elt
+        try:
+            elt, offset = self.api_impl._unwrap_clickable_element(elt)
+            if isinstance(elt, GUIElementImpl):
+                elt = next(elt.find_all()).first_occurrence
+        except Exception:
+            # Let _click_one(...) wait for the element and report the error:
+            return None
+        if isinstance(elt, WebElementWrapper):
+            elt = elt.unwrap()
+        return elt, offset
+
+    def _are_in_view(self, targets):
+        # Elements at a point (ie. with an offset) are already in view:
+        elements = [
+            elt for elt, offset in targets if elt is not None and offset is None
+        ]
+        if elements:
+            in_view = iter(
+                self.api_impl.require_driver().execute_script(
+                    "return arguments[0].map(function(elt) {"
+                    "    var rect = elt.getBoundingClientRect();"
+                    "    var x = rect.left + rect.width / 2;"
+                    "    var y = rect.top + rect.height / 2;"
+                    "    return rect.width > 0 && rect.height > 0 && x >= 0 &&"
+                    "        y >= 0 && x < window.innerWidth &&"
+                    "        y < window.innerHeight;"
+                    "});",
+                    elements,
+                )
+            )
+        return [
+            elt is None or offset is not None or next(in_view)
+            for elt, offset in targets
+        ]
+
+    def _click_one(self, step):
+        self.current_steps = [step]
+        self.api_impl._perform_mouse_action(
+            step.arguments["element"], self.api_impl._click
+        )
+        self.completed_steps.append(step)
+
+    def _click_all(self, steps, targets):
+        if not targets:
+            return
+        self.current_steps = steps
+        driver = self.api_impl.require_driver()
+        actions = driver.action()
+        for element, offset in targets:
+            self.api_impl._move_to(actions, element, offset)
+            actions.click()
+        actions.perform()
+        last_element = targets[-1][0]
+        if last_element is not None:
+            driver.last_manipulated_element = WebElementWrapper(last_element)
+        self.completed_steps.extend(steps)
+
+    def _perform_presses(self, steps):
+        from selenium.webdriver.common.keys import Keys
+
+        self.current_steps = steps
+        # Keys.NULL releases modifier keys such as CONTROL, which would otherwise
+        # remain pressed for the subsequent keys:
+        keys = Keys.NULL.join(step.arguments["key"] for step in steps)
+        self.api_impl.require_driver().switch_to.active_element.send_keys(keys)
+        self.completed_steps.extend(steps)
+
+    def _perform_scrolls(self, steps):
+        self.current_steps = steps
+        dx_pixels = dy_pixels = 0
+        for step in steps:
+            x_direction, y_direction = self.SCROLL_DIRECTIONS[step.action]
+            dx_pixels += x_direction * step.arguments["num_pixels"]
+            dy_pixels += y_direction * step.arguments["num_pixels"]
+        self.api_impl._scroll_by(dx_pixels, dy_pixels)
+        self.completed_steps.extend(steps)
+
+    def _perform_single(self, steps):
+        (step,) = steps
+        self.current_steps = steps
+        arguments = step.arguments
+        if step.action == "write":
+            into, mode = self.api_impl._get_write_target_and_mode(
+                arguments["into"], arguments["mode"]
+            )
+            self.api_impl._write_no_alert(arguments["text"], into, mode)
+        elif step.action == "select":
+            self.api_impl._select(arguments["combo_box"], arguments["value"])
+        else:
+            raise ValueError("Cannot perform %r in a batch." % step.action)
+        self.completed_steps.append(step)
+
+
+class BatchStep:
+    def __init__(self, action, args, kwargs):
+        from helium3 import api
+
+        function = getattr(api, action)
+        bound_arguments = signature(function).bind(*args, **kwargs)
+        bound_arguments.apply_defaults()
+        self.action = action
+        self.arguments = bound_arguments.arguments
+        self.description = "%s(%s)" % (action, repr_args(function, args, kwargs))
+
+    def __repr__(self):
+        return self.description
+
+
+class BatchError(Exception):
+    """
+    Raised at the end of a `with batch():` block when one of its steps failed.
+    The steps after the failed one(s) are not performed. The original exception
+    is available as `__cause__`.
+    """
+
+    def __init__(self, steps, completed_steps, failed_steps, cause):
+        self.completed_steps = list(completed_steps)
+        self.failed_steps = list(failed_steps)
+        self.skipped_steps = steps[len(completed_steps) + len(failed_steps) :]
+        first_failed = len(completed_steps) + 1
+        if len(failed_steps) == 1:
+            where = "Step %d" % first_failed
+        else:
+            # The steps were performed together, so we can't tell which one
+            # failed:
+            where = "Steps %d-%d" % (first_failed, first_failed + len(failed_steps) - 1)
+        super(BatchError, self).__init__(
+            "%s of %d, %s, failed: %s"
+            % (
+                where,
+                len(steps),
+                ", ".join(step.description for step in failed_steps),
+                str(cause) or type(cause).__name__,
+            )
+        )
+
+
+class Paginator:
+    """
+    Yields the items on the current page, then on the page behind the "next"
+    control, and so on. While the caller processes the items of one page,
+    the next page already loads in a separate tab, if the next control is a
+    link. Helium hides this tab from Window(...) and switch_to(...). When the
+    caller moves on, the tab replaces the tab of the current page, which is
+    closed. The tab the caller started in is only hidden. When pagination
+    ends, it is navigated to the last page and takes the place of the tab
+    that showed this page. If the next control is not a link (eg. a button
+    that loads results via Ajax), Paginator clicks it and waits for the
+    current items to be replaced. Pagination ends when the next control is
+    missing or disabled, or clicking it has no effect.
+    """
+
+    def __init__(self, api_impl, next_impl, items):
+        self.api_impl = api_impl
+        self.next_impl = next_impl
+        self.items = items
+        self.original_handle = None
+
+    def get_items(self):
+        driver = self.api_impl.require_driver()
+        self.original_handle = driver.current_window_handle
+        try:
+            yield from self._get_items()
+        finally:
+            self._return_to_original_tab()
+
+    def _get_items(self):
+        driver = self.api_impl.require_driver()
+        while True:
+            items = self._find_items()
+            next_occurrence = next(self._copy(self.next_impl).find_all(), None)
+            prefetched_handle = None
+            if next_occurrence is not None:
+                is_disabled, next_url = self._inspect_next(next_occurrence)
+                if is_disabled:
+                    next_occurrence = None
+                elif next_url:
+                    prefetched_handle = self._prefetch(next_url)
+            try:
+                yield from items
+                if next_occurrence is None:
+                    return
+                if prefetched_handle is not None:
+                    self._switch_to_prefetched(prefetched_handle)
+                    prefetched_handle = None
+                else:
+                    try:
+                        self._click_next(next_occurrence, items)
+                    except TimeoutException:
+                        # The items were not replaced. Eg. because the next
+                        # control is disabled in a way we did not detect.
+                        return
+            finally:
+                if prefetched_handle is not None:
+                    self._close(prefetched_handle)
+                    driver.hidden_window_handles.discard(prefetched_handle)
+
+    def _find_items(self):
+        items_impl = self._copy(self.items._impl)
+        try:
+            self.api_impl._wait_for(items_impl.exists)
+        except TimeoutException:
+            return []
+        return [self.items.with_impl(impl) for impl in items_impl.find_all()]
+
+    def _copy(self, gui_element_impl):
+        # Don't search from the occurrence bound on an earlier page:
+        result = copy(gui_element_impl)
+        result._bound_occurrence = None
+        return result
+
+    def _inspect_next(self, next_occurrence):
+        """
+        Returns whether the given next control is disabled, and the URL it
+        links to, if any.
+        """
+        is_disabled, url = self.api_impl.require_driver().execute_script(
+            "var elt = arguments[0], link = elt.closest('a[href]');"
+            "var isDisabled = !!elt.closest('[disabled], [aria-disabled=true]');"
+            # Pages often disable a link by removing its href:
+            "var anchor = elt.closest('a');"
+            "if (anchor && !link && !anchor.hasAttribute('onclick'))"
+            "    isDisabled = true;"
+            "return [isDisabled, link ? link.href : null];",
+            next_occurrence.first_occurrence.unwrap(),
+        )
+        if is_disabled:
+            return True, None
+        if not url or url.startswith("javascript:"):
+            return False, None
+        if self._is_same_document(url):
+            # Eg. href="#". The link is probably handled by JavaScript.
+            return False, None
+        return False, url
+
+    def _is_same_document(self, url):
+        current_url = self.api_impl.require_driver().current_url
+        return urldefrag(url)[0] == urldefrag(current_url)[0]
+
+    def _prefetch(self, url):
+        """
+        Opens the given URL in a new tab, without switching to it. Returns the
+        tab's handle, or None if the browser did not open the tab (eg. because
+        of a popup blocker).
+        """
+        driver = self.api_impl.require_driver()
+        raw_driver = driver.unwrap()
+        handles_before = set(raw_driver.window_handles)
+        raw_driver.execute_script("window.open(arguments[0], '_blank');", url)
+        end_time = time() + 1
+        while True:
+            new_handles = set(raw_driver.window_handles) - handles_before
+            if new_handles:
+                handle = new_handles.pop()
+                driver.hidden_window_handles.add(handle)
+                return handle
+            if time() > end_time:
+                return None
+            sleep(0.05)
+
+    def _switch_to_prefetched(self, handle):
+        driver = self.api_impl.require_driver()
+        if driver.current_window_handle == self.original_handle:
+            # Keep the caller's tab until pagination ends:
+            driver.hidden_window_handles.add(self.original_handle)
+        else:
+            driver.close()
+        driver.hidden_window_handles.discard(handle)
+        driver.switch_to.window(handle)
+        self.api_impl._wait_for(
+            lambda: self.api_impl._has_ready_state(APIImpl.READY_STATES["load"])
+        )
+
+    def _click_next(self, next_occurrence, items):
+        if items:
+            old_element = items[0].web_element
+        else:
+            old_element = next_occurrence.web_element
+        self.api_impl._perform_mouse_action(next_occurrence, self.api_impl._click)
+        # Both navigating to a new page and replacing the items via Ajax make
+        # the current elements stale:
+        self.api_impl._wait_for(lambda: self._is_stale(old_element))
+
+    def _is_stale(self, web_element):
+        try:
+            web_element.is_enabled()
+        except StaleElementReferenceException:
+            return True
+        return False
+
+    def _close(self, handle):
+        driver = self.api_impl.require_driver()
+        current_handle = driver.current_window_handle
+        driver.switch_to.window(handle)
+        driver.close()
+        driver.switch_to.window(current_handle)
+
+    def _return_to_original_tab(self):
+        driver = self.api_impl.require_driver()
+        if driver.current_window_handle == self.original_handle:
+            return
+        url = driver.current_url
+        driver.close()
+        driver.hidden_window_handles.discard(self.original_handle)
+        driver.switch_to.window(self.original_handle)
+        self.api_impl.go_to_impl(url)
+
+
+class ElementOffset(namedtuple("ElementOffset", ["x", "y", "width", "height"])):
+    """
+    An offset from the top left corner of an element, together with the size of
+    the element.
+    """
+
+
 class DragHelper:
     def __init__(self, api_impl):
         self.api_impl = api_impl
@@ -520,20 +1359,27 @@ class DragHelper:
         return self
 
     def start_dragging(self, element, offset):
-        if self._attempt_html_5_drag(element):
+        if self._attempt_html_5_drag(element, offset):
             self.is_html_5_drag = True
         else:
             self.api_impl._press_mouse_on(element, offset)
 
     def drop_on_target(self, target, offset):
         if self.is_html_5_drag:
-            self._complete_html_5_drag(target)
+            self._complete_html_5_drag(target, offset)
         else:
             self.api_impl._release_mouse_over(target, offset)
 
-    def _attempt_html_5_drag(self, element_to_drag):
+    @staticmethod
+    def _get_viewport_point(element, offset):
+        # Without an element, the offset is a Point in viewport mode. The
+        # scripts below then use the element at the point:
+        return (None, None) if element is not None else (offset.x, offset.y)
+
+    def _attempt_html_5_drag(self, element_to_drag, offset):
         return self._execute_script(
-            "var source = arguments[0];"
+            "var source = arguments[0]"
+            "    || document.elementFromPoint(arguments[1], arguments[2]);"
             "function getDraggableParent(element) {"
             "    var previousParent = null;"
             "    while (element != null && element != previousParent) {"
@@ -560,19 +1406,27 @@ class DragHelper:
             "window.helium.dragHelper.dataTransfer = dragStart.dataTransfer;"
             "return true;",
             element_to_drag,
+            *self._get_viewport_point(element_to_drag, offset)
         )
 
-    def _complete_html_5_drag(self, on):
-        self._execute_script(
-            "var target = arguments[0];"
-            "var drop = window.helium.dragHelper.createEvent('drop');"
-            "drop.dataTransfer = window.helium.dragHelper.dataTransfer;"
-            "target.dispatchEvent(drop);"
+    def _complete_html_5_drag(self, on, offset):
+        found_target = self._execute_script(
+            "var target = arguments[0]"
+            "    || document.elementFromPoint(arguments[1], arguments[2]);"
+            "if (target) {"
+            "    var drop = window.helium.dragHelper.createEvent('drop');"
+            "    drop.dataTransfer = window.helium.dragHelper.dataTransfer;"
+            "    target.dispatchEvent(drop);"
+            "}"
             "var dragEnd = window.helium.dragHelper.createEvent('dragend');"
             "dragEnd.dataTransfer = window.helium.dragHelper.dataTransfer;"
-            "window.helium.dragHelper.draggedElement.dispatchEvent(dragEnd);",
+            "window.helium.dragHelper.draggedElement.dispatchEvent(dragEnd);"
+            "return !!target;",
             on,
+            *self._get_viewport_point(on, offset)
         )
+        if not found_target:
+            raise LookupError("There is no element at %r." % (offset,))
 
     def __exit__(self, *_):
         self._execute_script("delete window.helium;")
@@ -591,7 +1445,7 @@ class DragAndDropFile:
     def begin(self):
         self._create_file_input_element()
         try:
-            self.file_input_element.send_keys(self.file_path)
+            self.driver.file_uploader.send_file(self.file_input_element, self.file_path)
         except:
             self.end()
             raise
@@ -716,6 +1570,8 @@ class JavaScriptInterval:
 
 
 class GUIElementImpl:
+    __slots__ = ("_bound_occurrence", "_driver")
+
     def __init__(self, driver):
         self._bound_occurrence = None
         self._driver = driver
@@ -733,6 +1589,9 @@ class GUIElementImpl:
     def find_all_occurrences(self):
         raise NotImplementedError()
 
+    def __copy__(self):
+        return copy_slots(self)
+
     def bound_to_occurrence(self, occurrence):
         result = copy(self)
         result._bound_occurrence = occurrence
@@ -761,9 +1620,13 @@ class GUIElementImpl:
 
         end_time = time() + Config.implicit_wait_secs
         # Try to perform `action` at least once:
-        result = self._perform_no_wait(action)
-        while result is None and time() < end_time:
+        with span("attempt", attempt=1):
             result = self._perform_no_wait(action)
+        num_attempts = 1
+        while result is None and time() < end_time:
+            num_attempts += 1
+            with span("attempt", attempt=num_attempts):
+                result = self._perform_no_wait(action)
         if result is not None:
             return result
         raise LookupError()
@@ -772,7 +1635,8 @@ class GUIElementImpl:
         for bound_gui_elt_impl in self.find_all():
             occurrence = bound_gui_elt_impl.first_occurrence
             try:
-                action(occurrence)
+                with span("action"):
+                    action(occurrence)
             except Exception as e:
                 if self.should_ignore_exception(e):
                     continue
@@ -801,6 +1665,10 @@ class GUIElementImpl:
 
 
 class HTMLElementImpl(GUIElementImpl):
+    __slots__ = ("below", "to_right_of", "above", "to_left_of")
+
+    matches = PREFIX_IGNORE_CASE()
+
     def __init__(
         self, driver, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -809,7 +1677,6 @@ class HTMLElementImpl(GUIElementImpl):
         self.to_right_of = self._unwrap_element(to_right_of)
         self.above = self._unwrap_element(above)
         self.to_left_of = self._unwrap_element(to_left_of)
-        self.matches = PREFIX_IGNORE_CASE()
 
     def _unwrap_element(self, element):
         if isinstance(element, str):
@@ -847,19 +1714,102 @@ class HTMLElementImpl(GUIElementImpl):
         return self.first_occurrence.unwrap()
 
     def find_all_occurrences(self):
-        self._handle_closed_window()
+        with span("handle_closed_window"):
+            self._handle_closed_window()
+        cache = self._get_locator_cache()
+        cached_occurrence = None
+        if cache is not None:
+            with span("locator_cache"):
+                url = self._driver.current_url
+                cached_occurrence = self._find_cached_occurrence(cache, url)
+            if cached_occurrence is not None:
+                yield cached_occurrence
+        should_cache = cache is not None and cached_occurrence is None
         self._driver.switch_to.default_content()
         try:
             for frame_index in FrameIterator(self._driver):
-                search_regions = self._get_search_regions_in_curr_frame()
-                for occurrence in self.find_all_in_curr_frame():
-                    if self._should_yield(occurrence, search_regions):
+                with span("find_all_in_curr_frame", frame=frame_index):
+                    search_regions = self._get_search_regions_in_curr_frame()
+                    occurrences = self.find_all_in_curr_frame()
+                for occurrence in occurrences:
+                    with span("hydrate"):
+                        should_yield = self._should_yield(occurrence, search_regions)
+                    if should_yield:
                         occurrence.frame_index = frame_index
+                        if cached_occurrence is not None:
+                            if occurrence.unwrap() == cached_occurrence.unwrap():
+                                continue
+                        if should_cache:
+                            self._cache_occurrence(cache, url, occurrence)
+                            should_cache = False
                         yield occurrence
         except FramesChangedWhileIterating:
             # Abort this search.
             pass
 
+    def _get_locator_cache(self):
+        from helium3 import Config
+
+        if Config.locator_cache is None:
+            return None
+        if Config.search_shadow_dom:
+            # The cache checks elements with XPaths, which can't see inside
+            # shadow roots.
+            return None
+        if self.below or self.to_right_of or self.above or self.to_left_of:
+            # The cache can't check relative positions cheaply.
+            return None
+        if self._get_cache_key() is None:
+            return None
+        return get_locator_cache(Config.locator_cache)
+
+    def _find_cached_occurrence(self, cache, url):
+        entry = cache.get(url, self._get_cache_key())
+        if entry is None:
+            return None
+        selector, frame_index = entry
+        try:
+            FrameIterator(self._driver).switch_to_frame(frame_index)
+            result = find_cached_element(
+                self._driver, selector, self._get_cache_checks()
+            )
+        except WebDriverException:
+            result = None
+        if result is None:
+            cache.remove(url, self._get_cache_key())
+            return None
+        web_element, left, top, width, height = result
+        occurrence = WebElementWrapper(web_element, frame_index)
+        # Save the requests for the element's location and size:
+        occurrence._cached_location = Rectangle(left, top, width, height)
+        return occurrence
+
+    def _cache_occurrence(self, cache, url, occurrence):
+        try:
+            selector = get_fingerprint(
+                self._driver, occurrence.unwrap(), self._get_cache_checks()
+            )
+        except WebDriverException:
+            return
+        # The selector is None if we could not check the element later:
+        if selector is not None:
+            cache.put(url, self._get_cache_key(), selector, occurrence.frame_index)
+
+    def _get_cache_key(self):
+        """
+        Returns a string that identifies what this element searches for in the
+        locator cache (see Config.locator_cache), or None if its search results
+        can't be cached.
+        """
+        return None
+
+    def _get_cache_checks(self):
+        """
+        Describes how to check in the browser that a cached element would also
+        be found by this element's search. See locator_cache.py.
+        """
+        raise NotImplementedError()
+
     def _handle_closed_window(self):
         window_handles = self._driver.window_handles
         try:
@@ -916,6 +1866,26 @@ class HTMLElementImpl(GUIElementImpl):
     def find_all_in_curr_frame(self):
         raise NotImplementedError()
 
+    def _find_elements_by_xpath(self, xpath):
+        from helium3 import Config
+
+        if Config.search_shadow_dom:
+            web_elements = shadow_dom.find_elements_by_xpath(self._driver, xpath)
+        else:
+            web_elements = self._driver.find_elements_by_xpath(xpath)
+        return list(map(WebElementWrapper, web_elements))
+
+    def _find_elements_by_css_selector(self, selector):
+        from helium3 import Config
+
+        if Config.search_shadow_dom:
+            web_elements = shadow_dom.find_elements_by_css_selector(
+                self._driver, selector
+            )
+        else:
+            web_elements = self._driver.find_elements_by_css_selector(selector)
+        return list(map(WebElementWrapper, web_elements))
+
     def _is_enabled(self):
         """
         Useful for subclasses.
@@ -924,25 +1894,35 @@ class HTMLElementImpl(GUIElementImpl):
 
 
 class SImpl(HTMLElementImpl):
+    __slots__ = ("selector",)
+
     def __init__(self, driver, selector, **kwargs):
         super(SImpl, self).__init__(driver, **kwargs)
         self.selector = selector
 
     def find_all_in_curr_frame(self):
-        wrap = lambda web_elements: list(map(WebElementWrapper, web_elements))
+        from helium3 import Config
+
         if self.selector.startswith("@"):
-            return wrap(self._driver.find_elements_by_name(self.selector[1:]))
+            name = self.selector[1:]
+            if Config.search_shadow_dom:
+                # The same selector as Selenium uses for By.NAME in W3C mode:
+                return self._find_elements_by_css_selector('[name="%s"]' % name)
+            web_elements = self._driver.find_elements_by_name(name)
+            return list(map(WebElementWrapper, web_elements))
         if self.selector.startswith("//"):
-            return wrap(self._driver.find_elements_by_xpath(self.selector))
-        return wrap(self._driver.find_elements_by_css_selector(self.selector))
+            return self._find_elements_by_xpath(self.selector)
+        return self._find_elements_by_css_selector(self.selector)
 
 
 class HTMLElementIdentifiedByXPath(HTMLElementImpl):
+    __slots__ = ()
+
     def find_all_in_curr_frame(self):
         x_path = self.get_xpath()
-        return self._sort_search_result(
-            list(map(WebElementWrapper, self._driver.find_elements_by_xpath(x_path)))
-        )
+        search_result = self._find_elements_by_xpath(x_path)
+        with span("sort", num_elements=len(search_result)):
+            return self._sort_search_result(search_result)
 
     def _sort_search_result(self, search_result):
         keys_to_result_items = []
@@ -961,11 +1941,19 @@ class HTMLElementIdentifiedByXPath(HTMLElementImpl):
     def get_xpath(self):
         raise NotImplementedError()
 
+    def _get_cache_key(self):
+        return "%s %s" % (self.__class__.__name__, self.get_xpath())
+
+    def _get_cache_checks(self):
+        return [{"xpath": self.get_xpath()}]
+
     def get_sort_index(self, web_element):
         return self._driver.get_distance_to_last_manipulated(web_element) + 1
 
 
 class HTMLElementContainingText(HTMLElementIdentifiedByXPath):
+    __slots__ = ("search_text",)
+
     def __init__(self, driver, text=None, **kwargs):
         super(HTMLElementContainingText, self).__init__(driver, **kwargs)
         self.search_text = text
@@ -983,6 +1971,8 @@ class HTMLElementContainingText(HTMLElementIdentifiedByXPath):
 
 
 class TextImpl(HTMLElementContainingText):
+    __slots__ = ("include_free_text",)
+
     def __init__(self, driver, text=None, include_free_text=True, **kwargs):
         super(TextImpl, self).__init__(driver, text, **kwargs)
         self.include_free_text = include_free_text
@@ -1019,6 +2009,8 @@ class TextImpl(HTMLElementContainingText):
 
 
 class FreeText(HTMLElementContainingText):
+    __slots__ = ()
+
     def get_xpath_node_selector(self):
         return "text()"
 
@@ -1027,6 +2019,8 @@ class FreeText(HTMLElementContainingText):
 
 
 class LinkImpl(HTMLElementContainingText):
+    __slots__ = ()
+
     def get_xpath_node_selector(self):
         return "a"
 
@@ -1047,11 +2041,15 @@ class LinkImpl(HTMLElementContainingText):
 
 
 class ListItemImpl(HTMLElementContainingText):
+    __slots__ = ()
+
     def get_xpath_node_selector(self):
         return "li"
 
 
 class ButtonImpl(HTMLElementContainingText):
+    __slots__ = ()
+
     def get_xpath_node_selector(self):
         return "button"
 
@@ -1087,6 +2085,8 @@ class ButtonImpl(HTMLElementContainingText):
 
 
 class ImageImpl(HTMLElementIdentifiedByXPath):
+    __slots__ = ("alt",)
+
     def __init__(self, driver, alt, **kwargs):
         super(ImageImpl, self).__init__(driver, **kwargs)
         self.alt = alt
@@ -1096,6 +2096,8 @@ class ImageImpl(HTMLElementIdentifiedByXPath):
 
 
 class LabelledElement(HTMLElementImpl):
+    __slots__ = ("label",)
+
     SECONDARY_SEARCH_DIMENSION_PENALTY_FACTOR = 1.5
 
     def __init__(self, driver, label=None, **kwargs):
@@ -1115,12 +2117,13 @@ class LabelledElement(HTMLElementImpl):
                 )
             else:
                 result = self._find_elts_by_free_text()
-        return sorted(result, key=self._driver.get_distance_to_last_manipulated)
+        with span("sort", num_elements=len(result)):
+            return sorted(result, key=self._driver.get_distance_to_last_manipulated)
 
     def _find_elts(self, xpath=None):
         if xpath is None:
             xpath = self.get_xpath()
-        return list(map(WebElementWrapper, self._driver.find_elements_by_xpath(xpath)))
+        return self._find_elements_by_xpath(xpath)
 
     def _find_elts_by_free_text(self):
         elt_types = [xpath.strip().lstrip("/") for xpath in self.get_xpath().split("|")]
@@ -1141,6 +2144,15 @@ class LabelledElement(HTMLElementImpl):
     def get_xpath(self):
         raise NotImplementedError()
 
+    def _get_cache_key(self):
+        return "%s %r %s" % (self.__class__.__name__, self.label, self.get_xpath())
+
+    def _get_cache_checks(self):
+        if not self.label:
+            return [{"xpath": self.get_xpath()}]
+        labels = TextImpl(self._driver, self.label, include_free_text=False)
+        return [{"xpath": self.get_xpath(), "labelXPath": labels.get_xpath()}]
+
     def get_primary_search_direction(self):
         return "to_right_of"
 
@@ -1224,6 +2236,8 @@ class LabelledElement(HTMLElementImpl):
 
 
 class CompositeElement(HTMLElementImpl):
+    __slots__ = ("_first_element", "args", "kwargs")
+
     def __init__(self, driver, *args, **kwargs):
         super(CompositeElement, self).__init__(driver, **kwargs)
         self.args = [driver] + list(args)
@@ -1254,13 +2268,29 @@ class CompositeElement(HTMLElementImpl):
     def get_element_types(self):
         raise NotImplementedError()
 
+    def _get_cache_key(self):
+        keys = [element._get_cache_key() for element in self.get_elements()]
+        if None in keys:
+            return None
+        return "%s [%s]" % (self.__class__.__name__, ", ".join(keys))
+
+    def _get_cache_checks(self):
+        result = []
+        for element in self.get_elements():
+            result.extend(element._get_cache_checks())
+        return result
+
 
 class ClickableText(CompositeElement):
+    __slots__ = ()
+
     def get_element_types(self):
         return [ButtonImpl, TextImpl, ImageImpl]
 
 
 class TextFieldImpl(CompositeElement):
+    __slots__ = ()
+
     def get_element_types(self):
         return [
             StandardTextFieldWithPlaceholder,
@@ -1280,6 +2310,8 @@ class TextFieldImpl(CompositeElement):
 
 
 class StandardTextFieldWithLabel(LabelledElement):
+    __slots__ = ()
+
     @property
     def value(self):
         return self.first_occurrence.get_attribute("value") or ""
@@ -1299,6 +2331,8 @@ class StandardTextFieldWithLabel(LabelledElement):
 
 
 class AriaTextFieldWithLabel(LabelledElement):
+    __slots__ = ()
+
     @property
     def value(self):
         return self.first_occurrence.text
@@ -1314,6 +2348,8 @@ class AriaTextFieldWithLabel(LabelledElement):
 
 
 class StandardTextFieldWithPlaceholder(HTMLElementIdentifiedByXPath):
+    __slots__ = ("label",)
+
     def __init__(self, driver, label, **kwargs):
         super(StandardTextFieldWithPlaceholder, self).__init__(driver, **kwargs)
         self.label = label
@@ -1336,11 +2372,15 @@ class StandardTextFieldWithPlaceholder(HTMLElementIdentifiedByXPath):
 
 
 class FileInput(LabelledElement):
+    __slots__ = ()
+
     def get_xpath(self):
         return "//input[@type='file']"
 
 
 class ComboBoxImpl(CompositeElement):
+    __slots__ = ()
+
     def get_element_types(self):
         return [ComboBoxIdentifiedByDisplayedValue, ComboBoxIdentifiedByLabel]
 
@@ -1349,26 +2389,27 @@ class ComboBoxImpl(CompositeElement):
 
     @property
     def value(self):
-        selected_value = self._select_driver.first_selected_option
-        if selected_value:
-            return selected_value.text
-        return None
+        return self._select_driver.first_selected_option_text
 
     @property
     def options(self):
-        return [option.text for option in self._select_driver.options]
+        return self._select_driver.options
 
     @property
     def _select_driver(self):
-        return Select(self.web_element)
+        return ScriptSelect(self.first_occurrence)
 
 
 class ComboBoxIdentifiedByLabel(LabelledElement):
+    __slots__ = ()
+
     def get_xpath(self):
         return "//select | //input[@list]"
 
 
 class ComboBoxIdentifiedByDisplayedValue(HTMLElementContainingText):
+    __slots__ = ()
+
     def get_xpath_node_selector(self):
         return "option"
 
@@ -1376,20 +2417,28 @@ class ComboBoxIdentifiedByDisplayedValue(HTMLElementContainingText):
         option_xpath = super(ComboBoxIdentifiedByDisplayedValue, self).get_xpath()
         return option_xpath + "/ancestor::select[1]"
 
+    def _get_cache_checks(self):
+        # Whether the element is found also depends on the selected option. We
+        # can't check this with an XPath:
+        return [{"xpath": self.get_xpath(), "unverifiable": True}]
+
     def find_all_in_curr_frame(self):
         all_cbs_with_a_matching_value = super(
             ComboBoxIdentifiedByDisplayedValue, self
         ).find_all_in_curr_frame()
+        selected_option_texts = ScriptSelect.get_selected_option_texts(
+            self._driver, all_cbs_with_a_matching_value
+        )
         result = []
-        for cb in all_cbs_with_a_matching_value:
-            for selected_option in Select(cb.unwrap()).all_selected_options:
-                if self.matches.text(selected_option.text, self.search_text):
-                    result.append(cb)
-                    break
+        for cb, texts in zip(all_cbs_with_a_matching_value, selected_option_texts):
+            if any(self.matches.text(text, self.search_text) for text in texts):
+                result.append(cb)
         return result
 
 
 class CheckBoxImpl(LabelledElement):
+    __slots__ = ()
+
     def is_enabled(self):
         return self._is_enabled()
 
@@ -1407,6 +2456,8 @@ class CheckBoxImpl(LabelledElement):
 
 
 class RadioButtonImpl(LabelledElement):
+    __slots__ = ()
+
     def is_selected(self):
         return self.first_occurrence.get_attribute("checked") is not None
 
@@ -1420,22 +2471,205 @@ class RadioButtonImpl(LabelledElement):
         return "to_right_of"
 
 
+class TableImpl(CompositeElement):
+    __slots__ = ()
+
+    DEFAULT_CHUNK_SIZE = 1000
+
+    def get_element_types(self):
+        return [TableIdentifiedByCaptionOrHeader, TableIdentifiedByLabel]
+
+    @property
+    def headers(self):
+        header_rows = self._read_rows(0, 0)[0]
+        return self._get_headers(header_rows)
+
+    def rows(self):
+        return list(self.iter_rows())
+
+    def iter_rows(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        for _, rows in self._iter_chunks(chunk_size):
+            for row in rows:
+                yield row
+
+    def column(self, header):
+        index = None
+        result = []
+        for header_rows, rows in self._iter_chunks(self.DEFAULT_CHUNK_SIZE):
+            if index is None:
+                index = self._get_column_index(self._get_headers(header_rows), header)
+            result.extend(row[index] if index < len(row) else "" for row in rows)
+        return result
+
+    def to_records(self):
+        headers = None
+        result = []
+        for header_rows, rows in self._iter_chunks(self.DEFAULT_CHUNK_SIZE):
+            if headers is None:
+                headers = self._get_headers(header_rows)
+                if not headers:
+                    raise ValueError("The table does not have a header row.")
+            for row in rows:
+                row = row + [""] * (len(headers) - len(row))
+                result.append(dict(zip(headers, row)))
+        return result
+
+    def _iter_chunks(self, chunk_size):
+        start = 0
+        spans = None
+        while True:
+            header_rows, rows, num_rows, spans = self._read_rows(
+                start, start + chunk_size, spans
+            )
+            yield header_rows, rows
+            start += chunk_size
+            if start >= num_rows:
+                break
+
+    @staticmethod
+    def _get_headers(header_rows):
+        # When there are several header rows (eg. for grouped columns), the
+        # last one contains the most specific column names:
+        return header_rows[-1] if header_rows else []
+
+    def _get_column_index(self, headers, header):
+        for i, candidate in enumerate(headers):
+            if candidate == header:
+                return i
+        for i, candidate in enumerate(headers):
+            if self.matches.text(candidate, header):
+                return i
+        raise LookupError("The table does not have a column %r." % header)
+
+    def _read_rows(self, start, end, spans=None):
+        """
+        Reads the header rows and the body rows in [start, end) of this table
+        in a single script call. Cells spanning several columns or rows are
+        repeated in each position they occupy, so all rows of the result are
+        aligned with the header. Returns a tuple
+        (header_rows, body_rows, total_number_of_body_rows, spans).
+
+        `spans` describes the cells of earlier rows that span into row
+        `start`. Pass the value returned for the previous chunk to continue
+        from there. Otherwise, the script has to go through all rows before
+        `start` to find these cells.
+        """
+        result = self.first_occurrence.execute_script(
+            "var table = arguments[0], start = arguments[1], end = arguments[2];"
+            "var spans = arguments[3];"
+            "var rows = table.rows, numHeaderRows = 0;"
+            "if (table.tHead) {"
+            "    numHeaderRows = table.tHead.rows.length;"
+            "} else {"
+            "    while (numHeaderRows < rows.length) {"
+            "        var cells = rows[numHeaderRows].cells;"
+            "        var allTh = cells.length > 0;"
+            "        for (var c = 0; c < cells.length; c++)"
+            "            allTh = allTh && cells[c].tagName == 'TH';"
+            "        if (!allTh) break;"
+            "        numHeaderRows++;"
+            "    }"
+            "}"
+            "function readRow(i, spans, extract) {"
+            "    var rowCells = rows[i].cells, cellIndex = 0, col = 0, row = [];"
+            "    while (cellIndex < rowCells.length || col < spans.length) {"
+            "        var span = spans[col];"
+            "        if (span && span.rows > 0) {"
+            "            row[col++] = span.text;"
+            "            span.rows--;"
+            "            continue;"
+            "        }"
+            "        if (cellIndex >= rowCells.length) {"
+            "            col++;"
+            "            continue;"
+            "        }"
+            "        var cell = rowCells[cellIndex++];"
+            "        var rowSpan = cell.rowSpan == 0 ? rows.length : cell.rowSpan;"
+            "        var text = null;"
+            "        if (extract || rowSpan > 1)"
+            "            text = (cell.innerText || cell.textContent || '').trim();"
+            "        for (var k = 0; k < Math.max(1, cell.colSpan); k++) {"
+            "            if (rowSpan > 1)"
+            "                spans[col] = {text: text, rows: rowSpan - 1};"
+            "            row[col++] = text;"
+            "        }"
+            "    }"
+            "    for (var j = 0; j < row.length; j++)"
+            "        if (row[j] == null) row[j] = '';"
+            "    return row;"
+            "}"
+            "var header = [], body = [], headerSpans = [];"
+            "for (var i = 0; i < numHeaderRows; i++)"
+            "    header.push(readRow(i, headerSpans, true));"
+            "var first = numHeaderRows;"
+            "if (spans) first += start; else spans = headerSpans;"
+            "var lastRow = Math.min(rows.length, numHeaderRows + end);"
+            "for (var i = first; i < lastRow; i++) {"
+            "    var extract = i - numHeaderRows >= start;"
+            "    var row = readRow(i, spans, extract);"
+            "    if (extract) body.push(row);"
+            "}"
+            "return [header, body, rows.length - numHeaderRows, spans];",
+            start,
+            end,
+            spans,
+        )
+        return tuple(result)
+
+
+class TableIdentifiedByCaptionOrHeader(HTMLElementIdentifiedByXPath):
+    __slots__ = ("label",)
+
+    def __init__(self, driver, label=None, **kwargs):
+        super(TableIdentifiedByCaptionOrHeader, self).__init__(driver, **kwargs)
+        self.label = label
+
+    def get_xpath(self):
+        if not self.label:
+            return "//table"
+        has_label = predicate(self.matches.xpath(".", self.label))
+        return "//table" + predicate_or(
+            "caption" + has_label,
+            "thead/tr/*" + has_label,
+            "*/tr/th" + has_label,
+            "tr/th" + has_label,
+        )
+
+
+class TableIdentifiedByLabel(LabelledElement):
+    __slots__ = ()
+
+    def get_xpath(self):
+        return "//table"
+
+    def get_primary_search_direction(self):
+        return "below"
+
+    def get_secondary_search_direction(self):
+        return "to_right_of"
+
+
 class WindowImpl(GUIElementImpl):
+    __slots__ = ("search_title",)
+
     def __init__(self, driver, title=None):
         super(WindowImpl, self).__init__(driver)
         self.search_title = title
 
     def find_all_occurrences(self):
+        handles = self._driver.window_handles
+        if self.search_title is None:
+            for handle in handles:
+                yield WindowImpl.SeleniumWindow(self._driver, handle)
+            return
         result_scores = []
-        for handle in self._driver.window_handles:
-            window = WindowImpl.SeleniumWindow(self._driver, handle)
-            if self.search_title is None:
-                result_scores.append((0, window))
-            else:
-                title = window.title
-                if title.startswith(self.search_title):
-                    score = len(title) - len(self.search_title)
-                    result_scores.append((score, window))
+        titles = self._driver.window_titles.get(handles)
+        for handle in handles:
+            title = titles[handle]
+            if title.startswith(self.search_title):
+                score = len(title) - len(self.search_title)
+                window = WindowImpl.SeleniumWindow(self._driver, handle)
+                result_scores.append((score, window))
         score = lambda tpl: tpl[0]
         result_scores.sort(key=score)
         for score, window in result_scores:
@@ -1450,35 +2684,20 @@ class WindowImpl(GUIElementImpl):
         return self.first_occurrence.handle
 
     class SeleniumWindow:
+        __slots__ = ("driver", "handle")
+
         def __init__(self, driver, handle):
             self.driver = driver
             self.handle = handle
-            self._window_handle_before = None
 
         @property
         def title(self):
-            with self:
-                return self.driver.title
-
-        def __enter__(self):
-            try:
-                self._window_handle_before = self.driver.current_window_handle
-            except NoSuchWindowException:
-                do_switch = True
-            else:
-                do_switch = self._window_handle_before != self.handle
-            if do_switch:
-                self.driver.switch_to.window(self.handle)
-
-        def __exit__(self, *_):
-            if (
-                self._window_handle_before
-                and self.driver.current_window_handle != self._window_handle_before
-            ):
-                self.driver.switch_to.window(self._window_handle_before)
+            return self.driver.window_titles.get([self.handle])[self.handle]
 
 
 class AlertImpl(GUIElementImpl):
+    __slots__ = ("search_text",)
+
     def __init__(self, driver, search_text=None):
         super(AlertImpl, self).__init__(driver)
         self.search_text = search_text
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from collections import Counter
+from threading import get_ident
+from warnings import warn
+
+from helium3._impl import tracing
+
+
+class CommandStats:
+    """
+    Counts the WebDriver commands sent in the current thread, by command and
+    by the public Helium call that sent them, and the time they took. Is a
+    listener of helium3._impl.tracing.
+    """
+
+    def __init__(self):
+        self.num_commands = 0
+        self.total_secs = 0
+        self.by_command = Counter()
+        self.secs_by_command = Counter()
+        self.by_call = {}
+        self._thread_id = get_ident()
+
+    def accepts(self, span):
+        return get_ident() == self._thread_id
+
+    def span_started(self, span):
+        pass
+
+    def span_finished(self, span):
+        if span.category != "webdriver":
+            return
+        secs = (span.end_ns - span.start_ns) / 1e9
+        call = _get_outermost_call(span)
+        self.num_commands += 1
+        self.total_secs += secs
+        self.by_command[span.name] += 1
+        self.secs_by_command[span.name] += secs
+        self.by_call.setdefault(call, Counter())[span.name] += 1
+
+    def __str__(self):
+        lines = [
+            "%d WebDriver commands in %.3fs:" % (self.num_commands, self.total_secs)
+        ]
+        for command, count in self.by_command.most_common():
+            lines.append(
+                "  %-24s %4d  %8.3fs" % (command, count, self.secs_by_command[command])
+            )
+        for call, commands in self.by_call.items():
+            lines.append(
+                "%s: %d commands"
+                % (call or "Outside Helium's API", sum(commands.values()))
+            )
+        return "\n".join(lines)
+
+
+def _get_outermost_call(span):
+    result = None
+    while span is not None:
+        if span.category == "api":
+            result = span.name
+        span = span.parent
+    return result
+
+
+class CommandBudget:
+    """
+    The context manager returned by `command_budget(...)`.
+    """
+
+    def __init__(self, max_commands, warn_only):
+        self.max_commands = max_commands
+        self.warn_only = warn_only
+        self.stats = CommandStats()
+
+    def __enter__(self):
+        tracing.add_listener(self.stats)
+        return self.stats
+
+    def __exit__(self, exc_type, *_):
+        tracing.remove_listener(self.stats)
+        if exc_type is not None or self.max_commands is None:
+            return
+        if self.stats.num_commands > self.max_commands:
+            message = "Sent %d WebDriver commands, more than the budget of %d.\n%s" % (
+                self.stats.num_commands,
+                self.max_commands,
+                self.stats,
+            )
+            if self.warn_only:
+                warn(message, CommandBudgetWarning, stacklevel=2)
+            else:
+                raise CommandBudgetExceeded(message, self.stats)
+
+
+class CommandBudgetExceeded(AssertionError):
+    """
+    Raised at the end of a `with command_budget(...):` block when the code in
+    it sent more WebDriver commands than allowed. The :py:class:`CommandStats`
+    are available as `stats`.
+    """
+
+    def __init__(self, message, stats):
+        super(CommandBudgetExceeded, self).__init__(message)
+        self.stats = stats
+
+
+class CommandBudgetWarning(UserWarning):
+    """
+    Issued instead of raising :py:class:`CommandBudgetExceeded` when
+    `command_budget(...)` was called with `warn=True`.
+    """
@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+import atexit
+import json
+import re
+from functools import lru_cache
+from os import X_OK
+from os import access
+from os import environ
+from os import makedirs
+from os import replace
+from os.path import dirname
+from os.path import expanduser
+from os.path import join
+from shutil import which
+from subprocess import DEVNULL
+from subprocess import SubprocessError
+from subprocess import check_output
+from tempfile import mkstemp
+from threading import Lock
+from time import perf_counter
+
+from selenium.common.exceptions import WebDriverException
+
+from helium3.utils.os_ import make_executable
+from helium3.utils.system import get_canonical_os_name
+from helium3.utils.system import is_mac
+from helium3.utils.system import is_windows
+
+
+def start_driver(driver_class, driver_name, options, **kwargs):
+    """
+    Starts a Selenium WebDriver such as Chrome(...) and returns it together
+    with the durations of the phases of starting it, in seconds:
+
+     * "resolve": finding the driver executable, eg. chromedriver,
+     * "spawn": starting the driver executable and
+     * "session": starting the browser by creating a WebDriver session.
+
+    Without a cache, Helium would first try the driver on the PATH and only
+    fall back to the driver included with Helium when that fails. Here, the
+    driver that worked last time for the same browser binary is remembered on
+    disk and tried first. The other drivers are only tried if it fails. When
+    the browser was updated to a new major version since, the remembered
+    driver likely no longer works and is not tried first.
+    """
+    start = perf_counter()
+    cache = DriverCache()
+    key = "%s %s" % (driver_name, _get_browser_binary(options))
+    timings = {}
+    error = None
+    cache_entry = _get_current_cache_entry(cache, key, driver_name, options)
+    for driver_path in _get_driver_paths(cache_entry, driver_name):
+        timings["resolve"] = perf_counter() - start
+        try:
+            driver = _start_timed(
+                driver_class,
+                timings,
+                options=options,
+                executable_path=driver_path,
+                **kwargs
+            )
+        except WebDriverException as e:
+            error = e
+            continue
+        cache.put(key, _get_cache_entry(driver_path, driver.capabilities))
+        return driver, timings
+    cache.remove(key)
+    raise error
+
+
+def start_shared_chrome(options, desired_capabilities=None):
+    """
+    Like start_driver(Chrome, "chromedriver", options, ...), but all browsers
+    started with this function share a single chromedriver process. Quitting
+    a browser only ends its session. The chromedriver process stops when the
+    last browser that uses it quits.
+    """
+    from selenium.webdriver import Chrome
+    from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+    from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+    start = perf_counter()
+    timings = {}
+    # Like the driver cache, use a separate service for each browser binary:
+    key = "%s %s" % ("chromedriver", _get_browser_binary(options))
+    with _SHARED_SERVICES_LOCK:
+        shared_service = _SHARED_SERVICES.get(key)
+        if shared_service is not None and not shared_service.is_running():
+            # Eg. chromedriver crashed. Its browsers can't be used anymore:
+            del _SHARED_SERVICES[key]
+            shared_service = None
+        if shared_service is None:
+            shared_service = _start_shared_service(key, options, timings)
+            _SHARED_SERVICES[key] = shared_service
+        else:
+            timings["resolve"] = timings["spawn"] = 0
+        service = shared_service.add_session()
+    if "resolve" not in timings:
+        timings["resolve"] = perf_counter() - start - timings["spawn"]
+    if desired_capabilities is None:
+        desired_capabilities = options.to_capabilities()
+    else:
+        desired_capabilities.update(options.to_capabilities())
+    # Like Chrome(...), but without starting a new chromedriver:
+    driver = Chrome.__new__(Chrome)
+    driver.service = service
+    session_start = perf_counter()
+    try:
+        RemoteWebDriver.__init__(
+            driver,
+            command_executor=ChromeRemoteConnection(
+                remote_server_addr=shared_service.service.service_url,
+                keep_alive=True,
+            ),
+            desired_capabilities=desired_capabilities,
+        )
+    except Exception:
+        service.stop()
+        raise
+    timings["session"] = perf_counter() - session_start
+    driver._is_remote = False
+    return driver, timings
+
+
+def _start_shared_service(key, options, timings):
+    from selenium.webdriver.chrome.service import Service as ChromeService
+
+    cache = DriverCache()
+    error = None
+    cache_entry = _get_current_cache_entry(cache, key, "chromedriver", options)
+    for driver_path in _get_driver_paths(cache_entry, "chromedriver"):
+        service = ChromeService(driver_path)
+        spawn_start = perf_counter()
+        try:
+            service.start()
+        except WebDriverException as e:
+            error = e
+            continue
+        timings["spawn"] = perf_counter() - spawn_start
+        browser_version = _get_installed_browser_version("chromedriver", options)
+        cache.put(key, {"path": driver_path, "browser_version": browser_version})
+        atexit.register(kill_service, service)
+        return SharedService(service)
+    cache.remove(key)
+    raise error
+
+
+_SHARED_SERVICES = {}
+_SHARED_SERVICES_LOCK = Lock()
+
+
+class SharedService:
+    """
+    A driver service, eg. chromedriver, that several browsers use. Keeps
+    count of them and stops the service when the last one quits.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.num_sessions = 0
+
+    def add_session(self):
+        """
+        Returns an object to be used as the .service of a new WebDriver. Its
+        .stop() ends the WebDriver's use of the service.
+        """
+        self.num_sessions += 1
+        return _SharedServiceUse(self)
+
+    def is_running(self):
+        return self.service.process.poll() is None
+
+    def remove_session(self):
+        with _SHARED_SERVICES_LOCK:
+            self.num_sessions -= 1
+            if self.num_sessions == 0:
+                for name, shared_service in list(_SHARED_SERVICES.items()):
+                    if shared_service is self:
+                        del _SHARED_SERVICES[name]
+                self.service.stop()
+
+
+class _SharedServiceUse:
+    # Lets users of WebDriver.service tell that other browsers use it too:
+    is_shared = True
+
+    def __init__(self, shared_service):
+        self._shared_service = shared_service
+        self._stopped = False
+
+    def stop(self):
+        if not self._stopped:
+            self._stopped = True
+            self._shared_service.remove_session()
+
+    def __getattr__(self, item):
+        # Eg. .process or .service_url:
+        return getattr(self._shared_service.service, item)
+
+
+def kill_service(service):
+    """
+    Stops the given driver service without sending it a shutdown request. Used
+    when the Python process exits.
+    """
+    old = service.send_remote_shutdown_command
+    service.send_remote_shutdown_command = lambda: None
+    try:
+        service.stop()
+    finally:
+        service.send_remote_shutdown_command = old
+
+
+def _get_browser_binary(options):
+    try:
+        return options.binary_location
+    except AttributeError:
+        # FirefoxOptions when no binary was set.
+        return ""
+
+
+def _get_current_cache_entry(cache, key, driver_name, options):
+    """
+    Returns the cache entry with the given key, unless the major version of
+    the browser it was made for differs from the installed browser's.
+    """
+    result = cache.get(key)
+    if not result or not result.get("browser_version"):
+        return result
+    installed_version = _get_installed_browser_version(driver_name, options)
+    if installed_version is None:
+        # We can't tell. Trying the cached driver is still the best bet:
+        return result
+    if _get_major_version(installed_version) != _get_major_version(
+        result["browser_version"]
+    ):
+        return None
+    return result
+
+
+# The executables of the browsers each driver controls, in order of priority:
+_BROWSER_EXECUTABLES = {
+    "chromedriver": [
+        "google-chrome",
+        "google-chrome-stable",
+        "chromium",
+        "chromium-browser",
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    ],
+    "geckodriver": ["firefox", "/Applications/Firefox.app/Contents/MacOS/firefox"],
+}
+
+
+def _get_installed_browser_version(driver_name, options):
+    binary = _get_browser_binary(options)
+    if not binary:
+        for executable in _BROWSER_EXECUTABLES.get(driver_name, []):
+            if executable.startswith("/") and not is_mac():
+                continue
+            binary = which(executable)
+            if binary:
+                break
+        else:
+            return None
+    return _get_browser_version(binary)
+
+
+@lru_cache()
+def _get_browser_version(binary):
+    """
+    Returns the version the given browser executable reports with --version,
+    or None if it can't be determined. Eg. Chrome on Windows does not support
+    --version. The result is cached, because this spawns a process.
+    """
+    if is_windows():
+        return None
+    try:
+        output = check_output(
+            [binary, "--version"], stderr=DEVNULL, timeout=10, text=True
+        )
+    except (OSError, SubprocessError):
+        return None
+    match = re.search(r"\d+(\.\d+)+", output)
+    return match.group(0) if match else None
+
+
+def _get_major_version(version):
+    return version.split(".")[0]
+
+
+def _get_driver_paths(cache_entry, driver_name):
+    tried = set()
+    if cache_entry and access(cache_entry["path"], X_OK):
+        tried.add(cache_entry["path"])
+        yield cache_entry["path"]
+    path_driver = which(driver_name)
+    if path_driver and path_driver not in tried:
+        tried.add(path_driver)
+        yield path_driver
+    included_driver = get_included_driver(driver_name)
+    if included_driver not in tried:
+        yield included_driver
+
+
+def get_included_driver(driver_name):
+    if is_windows():
+        driver_name += ".exe"
+    driver_path = join(
+        dirname(__file__), "webdrivers", get_canonical_os_name(), driver_name
+    )
+    if not access(driver_path, X_OK):
+        try:
+            make_executable(driver_path)
+        except Exception:
+            raise RuntimeError(
+                "The driver located at %s is not executable." % driver_path
+            ) from None
+    return driver_path
+
+
+def _start_timed(driver_class, timings, **kwargs):
+    # The driver's constructor first spawns the driver executable, then calls
+    # start_session(...). Intercept the latter to time both phases:
+    driver = driver_class.__new__(driver_class)
+
+    def start_session(*args, **kwargs):
+        session_start = perf_counter()
+        try:
+            return driver_class.start_session(driver, *args, **kwargs)
+        finally:
+            timings["session"] = perf_counter() - session_start
+
+    driver.start_session = start_session
+    start = perf_counter()
+    try:
+        driver.__init__(**kwargs)
+    finally:
+        del driver.start_session
+    timings["spawn"] = perf_counter() - start - timings["session"]
+    return driver
+
+
+def _get_cache_entry(driver_path, capabilities):
+    driver_version = capabilities.get("moz:geckodriverVersion")
+    if driver_version is None:
+        driver_version = capabilities.get("chrome", {}).get("chromedriverVersion")
+    return {
+        "path": driver_path,
+        "driver_version": driver_version,
+        "browser_version": capabilities.get(
+            "browserVersion", capabilities.get("version")
+        ),
+    }
+
+
+class DriverCache:
+    """
+    Remembers the driver executable that worked for each browser, in a JSON
+    file in the user's cache directory. Processes that start browsers at the
+    same time may overwrite each other's changes. This is harmless, because
+    the cache only determines which driver is tried first.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or join(_get_cache_dir(), "drivers.json")
+
+    def get(self, key):
+        return self._read().get(key)
+
+    def put(self, key, entry):
+        entries = self._read()
+        if entries.get(key) != entry:
+            entries[key] = entry
+            self._write(entries)
+
+    def remove(self, key):
+        entries = self._read()
+        if entries.pop(key, None) is not None:
+            self._write(entries)
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return result if isinstance(result, dict) else {}
+
+    def _write(self, entries):
+        try:
+            makedirs(dirname(self.path), exist_ok=True)
+            fd, tmp_path = mkstemp(dir=dirname(self.path))
+            with open(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            # Atomic, so other processes never read a half-written file:
+            replace(tmp_path, self.path)
+        except OSError:
+            # Eg. a read-only home directory. The cache is only an optimization.
+            pass
+
+
+def _get_cache_dir():
+    if is_windows():
+        root = environ.get("LOCALAPPDATA") or expanduser("~")
+    else:
+        root = environ.get("XDG_CACHE_HOME") or expanduser("~/.cache")
+    return join(root, "helium3")
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import sqlite3
+from threading import Lock
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+
+# Checks in JavaScript whether `elt` is the only element Helium would find for
+# the given checks. Each check describes one of the ways an element can be
+# found (see HTMLElementImpl._get_cache_checks()). Like Helium's search, the
+# first check that has any candidates decides.
+_MATCHES_FUNCTION = (
+    "function heliumMatches(elt, checks) {"
+    "    function evaluate(xpath) {"
+    "        var snapshot = document.evaluate("
+    "            xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, "
+    "            null"
+    "        );"
+    "        var result = [];"
+    "        for (var i = 0; i < snapshot.snapshotLength; i++)"
+    "            result.push(snapshot.snapshotItem(i));"
+    "        return result;"
+    "    }"
+    "    for (var i = 0; i < checks.length; i++) {"
+    "        var check = checks[i];"
+    "        var candidates = evaluate(check.labelXPath || check.xpath);"
+    "        if (!candidates.length)"
+    "            continue;"
+    "        if (check.unverifiable || candidates.length != 1)"
+    "            return false;"
+    "        if (!check.labelXPath)"
+    "            return candidates[0] == elt;"
+    "        if (evaluate(check.xpath).indexOf(elt) < 0)"
+    "            return false;"
+    "        var label = candidates[0];"
+    "        if (label.contains(elt))"
+    "            return true;"
+    "        var target = label.tagName == 'LABEL' && label.getAttribute('for');"
+    "        return !!target && !!elt.id"
+    "            && target.toLowerCase() == elt.id.toLowerCase();"
+    "    }"
+    "    return false;"
+    "}"
+)
+
+
+def find_cached_element(driver, selector, checks):
+    """
+    Returns the element for the given selector and its location, if it still
+    matches the given checks and is visible. Returns None otherwise.
+    """
+    return driver.execute_script(
+        _MATCHES_FUNCTION + "var elt = document.querySelector(arguments[0]);"
+        "if (!elt || !heliumMatches(elt, arguments[1]))"
+        "    return null;"
+        "var style = window.getComputedStyle(elt);"
+        "var rect = elt.getBoundingClientRect();"
+        "if (style.visibility == 'hidden' || !(rect.width || rect.height))"
+        "    return null;"
+        "var left = Math.round(rect.left + window.pageXOffset);"
+        "var top = Math.round(rect.top + window.pageYOffset);"
+        "if (left + rect.width < 0 || top + rect.height < 0)"
+        "    return null;"
+        "return [elt, left, top, rect.width, rect.height];",
+        selector,
+        checks,
+    )
+
+
+def get_fingerprint(driver, web_element, checks):
+    """
+    Returns a cheap CSS selector for the given element: Its id, its name or the
+    path to it from the closest ancestor with an id. Returns None if the
+    element does not match the given checks, so it can't be verified later.
+    """
+    return driver.execute_script(
+        _MATCHES_FUNCTION + "var elt = arguments[0];"
+        "if (!heliumMatches(elt, arguments[1]))"
+        "    return null;"
+        "function isUnique(selector) {"
+        "    return document.querySelectorAll(selector).length == 1;"
+        "}"
+        "if (elt.id && isUnique('#' + CSS.escape(elt.id)))"
+        "    return '#' + CSS.escape(elt.id);"
+        "var tagName = elt.tagName.toLowerCase();"
+        "var name = elt.getAttribute('name');"
+        "if (name) {"
+        "    var selector = tagName + '[name=\"' + CSS.escape(name) + '\"]';"
+        "    if (isUnique(selector))"
+        "        return selector;"
+        "}"
+        "var path = [];"
+        "for (var node = elt; node != document.documentElement; "
+        "        node = node.parentElement) {"
+        "    if (node != elt && node.id && isUnique('#' + CSS.escape(node.id))) {"
+        "        path.unshift('#' + CSS.escape(node.id));"
+        "        return path.join(' > ');"
+        "    }"
+        "    var index = 1;"
+        "    for (var sibling = node.previousElementSibling; sibling; "
+        "            sibling = sibling.previousElementSibling)"
+        "        if (sibling.tagName == node.tagName)"
+        "            index++;"
+        "    path.unshift("
+        "        node.tagName.toLowerCase() + ':nth-of-type(' + index + ')'"
+        "    );"
+        "}"
+        "path.unshift('html');"
+        "return path.join(' > ');",
+        web_element,
+        checks,
+    )
+
+
+def get_url_pattern(url):
+    """
+    Pages generated from the same template often only differ in the IDs in
+    their URLs. We therefore replace path segments that contain digits by *
+    and ignore the query string and fragment. Eg.:
+
+        https://shop.com/items/1234?ref=home -> https://shop.com/items/*
+    """
+    parts = urlsplit(url)
+    path = "/".join(
+        "*" if any(c.isdigit() for c in segment) else segment
+        for segment in parts.path.split("/")
+    )
+    return urlunsplit((parts.scheme, parts.netloc, path, "", ""))
+
+
+class LocatorCache:
+    """
+    Stores the selectors of the elements Helium found in an SQLite database, by
+    URL pattern and by what Helium searched for. SQLite lets several processes
+    share the same file safely.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+        self._connection_pid = None
+        self._lock = Lock()
+
+    def get(self, url, key):
+        """
+        Returns the pair (selector, frame_index), or None.
+        """
+        rows = self._execute(
+            "SELECT selector, frame_index FROM locators "
+            "WHERE url_pattern = ? AND predicate = ?",
+            (get_url_pattern(url), key),
+        )
+        if not rows:
+            return None
+        selector, frame_index = rows[0]
+        return selector, json.loads(frame_index)
+
+    def put(self, url, key, selector, frame_index):
+        self._execute(
+            "INSERT OR REPLACE INTO locators "
+            "(url_pattern, predicate, selector, frame_index) VALUES (?, ?, ?, ?)",
+            (get_url_pattern(url), key, selector, json.dumps(frame_index)),
+        )
+
+    def remove(self, url, key):
+        self._execute(
+            "DELETE FROM locators WHERE url_pattern = ? AND predicate = ?",
+            (get_url_pattern(url), key),
+        )
+
+    def _execute(self, sql, parameters):
+        with self._lock:
+            return self._get_connection().execute(sql, parameters).fetchall()
+
+    def _get_connection(self):
+        # SQLite connections must not be used across fork(). Worker processes
+        # therefore open their own connection:
+        if self._connection is None or self._connection_pid != os.getpid():
+            self._connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            # Lets readers and writers in different processes work concurrently:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS locators ("
+                "url_pattern TEXT NOT NULL, "
+                "predicate TEXT NOT NULL, "
+                "selector TEXT NOT NULL, "
+                "frame_index TEXT NOT NULL, "
+                "PRIMARY KEY (url_pattern, predicate))"
+            )
+            self._connection_pid = os.getpid()
+        return self._connection
+
+
+_CACHES = {}
+
+
+def get_locator_cache(path):
+    if path not in _CACHES:
+        _CACHES[path] = LocatorCache(path)
+    return _CACHES[path]
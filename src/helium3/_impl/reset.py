@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+_CLEAR_WEB_STORAGE = (
+    "try {"
+    "    window.localStorage.clear();"
+    "    window.sessionStorage.clear();"
+    "} catch (e) {"
+    # Pages such as about:blank or data: URLs have no storage.
+    "}"
+    "return window.location.origin;"
+)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def get_origin(url):
+    """
+    Returns the origin of the given URL, in the format of JavaScript's
+    window.location.origin. Eg. "https://example.com" for
+    "https://example.com:443/page.html".
+    """
+    parts = urlsplit(url)
+    result = "%s://%s" % (parts.scheme, parts.hostname)
+    if parts.port is not None and parts.port != _DEFAULT_PORTS.get(parts.scheme):
+        result += ":%d" % parts.port
+    return result
+
+
+def reset_browser(driver):
+    """
+    Returns the browser of the given WebDriverWrapper to the state of a fresh
+    session, without restarting it: Closes all windows but one, deletes
+    cookies and web storage and navigates to about:blank.
+
+    WebDriver can only delete the cookies and storage of the current page's
+    origin. This function therefore clears the origins of all open windows,
+    and the origins the driver visited with go_to(...). In Chrome, it deletes
+    all cookies with the DevTools command Network.clearBrowserCookies, and
+    all data of these origins, including IndexedDB databases, caches and
+    service workers. Other browsers, such as Firefox, are navigated to each
+    origin to delete its cookies and web storage. There, cookies of other
+    domains, such as those of third-party iframes, are kept, as are the other
+    kinds of storage.
+    """
+    target = driver.unwrap()
+    handles = target.window_handles
+    origins = set(driver.visited_origins)
+    # Clear the storage of each window before closing it. End in the first:
+    for handle in reversed(handles):
+        target.switch_to.window(handle)
+        current_origin = target.execute_script(_CLEAR_WEB_STORAGE)
+        origins.add(current_origin)
+        if handle != handles[0]:
+            target.close()
+    driver.hidden_window_handles.clear()
+    driver.visited_origins.clear()
+    driver.last_manipulated_element = None
+    # Pages such as about:blank or file: URLs have the opaque origin "null":
+    origins = sorted(o for o in origins if o and o.startswith("http"))
+    if not _clear_with_devtools(target, origins):
+        target.delete_all_cookies()
+        for origin in origins:
+            if origin != current_origin:
+                _clear_by_visiting(target, origin)
+    target.get("about:blank")
+
+
+def _clear_with_devtools(target, origins):
+    if not hasattr(target, "execute_cdp_cmd"):
+        return False
+    try:
+        target.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in origins:
+            target.execute_cdp_cmd(
+                "Storage.clearDataForOrigin",
+                {"origin": origin, "storageTypes": "all"},
+            )
+    except WebDriverException:
+        # Eg. a remote server that does not forward DevTools commands.
+        return False
+    return True
+
+
+def _clear_by_visiting(target, origin):
+    try:
+        target.get(origin + "/")
+        target.delete_all_cookies()
+        target.execute_script(_CLEAR_WEB_STORAGE)
+    except WebDriverException:
+        # Eg. because the site is no longer reachable.
+        pass
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import json
+from collections import deque
+
+from selenium.common.exceptions import WebDriverException
+
+# The file extensions of the resource types that can be blocked. Chrome blocks
+# resources by URL, so we block these types by their extensions:
+RESOURCE_TYPES = {
+    "image": ["apng", "avif", "bmp", "gif", "ico", "jpeg", "jpg", "png", "svg", "webp"],
+    "font": ["eot", "otf", "ttf", "woff", "woff2"],
+    "media": ["avi", "m4a", "mov", "mp3", "mp4", "ogg", "ogv", "wav", "webm"],
+    "stylesheet": ["css"],
+}
+
+# Firefox can't block URLs, but it has preferences for most resource types:
+FIREFOX_PREFERENCES = {
+    "image": {"permissions.default.image": 2},
+    "font": {"gfx.downloadable_fonts.enabled": False},
+    "media": {"media.autoplay.default": 5, "media.preload.default": 0},
+    "stylesheet": {"permissions.default.stylesheet": 2},
+}
+
+# How many blocked URLs ResourceBlocker remembers, and how many requests it
+# tracks that have not finished yet. This bounds its memory in long sessions:
+MAX_BLOCKED_URLS = 1000
+MAX_PENDING_REQUESTS = 1000
+
+
+def parse_blocked_resources(resources):
+    """
+    Splits the given resources into resource types (eg. "image") and URL
+    patterns (eg. "*google-analytics.com*").
+    """
+    if isinstance(resources, str):
+        resources = [resources]
+    resource_types, url_patterns = [], []
+    for resource in resources:
+        if resource in RESOURCE_TYPES:
+            resource_types.append(resource)
+        elif any(c in resource for c in "*./"):
+            url_patterns.append(resource)
+        else:
+            raise ValueError(
+                "Unknown resource type %r. Must be one of %s, or a URL pattern "
+                'such as "*google-analytics.com*".'
+                % (resource, ", ".join(map(repr, RESOURCE_TYPES)))
+            )
+    return resource_types, url_patterns
+
+
+def get_url_patterns(resource_types, url_patterns=()):
+    result = []
+    for resource_type in resource_types:
+        for extension in RESOURCE_TYPES[resource_type]:
+            result.append("*." + extension)
+            # Also block URLs with a query string or fragment:
+            result.append("*." + extension + "?*")
+            result.append("*." + extension + "#*")
+    result.extend(url_patterns)
+    return result
+
+
+def add_to_chrome_options(options):
+    # Keep any logging preferences the user set. Only add the performance log,
+    # which lets ResourceBlocker count the blocked requests:
+    logging_prefs = dict(options.capabilities.get("goog:loggingPrefs") or {})
+    logging_prefs["performance"] = "ALL"
+    options.set_capability("goog:loggingPrefs", logging_prefs)
+    # Unless the user wants them, don't log page events, to keep the log small:
+    perf_logging_prefs = {"enablePage": False}
+    perf_logging_prefs.update(options.experimental_options.get("perfLoggingPrefs", {}))
+    perf_logging_prefs["enableNetwork"] = True
+    options.add_experimental_option("perfLoggingPrefs", perf_logging_prefs)
+
+
+def add_to_firefox_options(options, resources):
+    resource_types, url_patterns = parse_blocked_resources(resources)
+    if url_patterns:
+        raise ValueError(
+            "Firefox cannot block URL patterns such as %r. Only resource types "
+            "(%s) are supported."
+            % (url_patterns[0], ", ".join(map(repr, RESOURCE_TYPES)))
+        )
+    for resource_type in resource_types:
+        for name, value in FIREFOX_PREFERENCES[resource_type].items():
+            options.set_preference(name, value)
+
+
+class ResourceBlocker:
+    """
+    Blocks requests in Chrome with the DevTools command Network.setBlockedURLs
+    and counts the requests that were blocked, by reading Chrome's performance
+    log. ChromeDriver keeps the log's entries in memory until they are read,
+    so read_log() should be called regularly while resources are blocked.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.is_blocking = False
+        self.blocked_urls = deque(maxlen=MAX_BLOCKED_URLS)
+        self._request_urls = {}
+
+    def block(self, resources):
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            raise ValueError(
+                "Blocking resources while the browser is running is only "
+                "supported in Chrome. For Firefox, pass block_resources=... to "
+                "start_firefox(...)."
+            )
+        resource_types, url_patterns = parse_blocked_resources(resources)
+        url_patterns = get_url_patterns(resource_types, url_patterns)
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": url_patterns})
+        self.is_blocking = bool(url_patterns)
+
+    def get_blocked_urls(self):
+        if not self.read_log():
+            raise RuntimeError(
+                "Counting blocked requests requires Chrome's performance log. "
+                "It is enabled when you pass block_resources=... to "
+                "start_chrome(...)."
+            )
+        return list(self.blocked_urls)
+
+    def read_log(self):
+        """
+        Processes the new entries of the performance log. Returns False if the
+        log is not available.
+        """
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException:
+            return False
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method, params = message["method"], message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                if len(self._request_urls) >= MAX_PENDING_REQUESTS:
+                    # Forget the oldest request. It most likely never finishes:
+                    del self._request_urls[next(iter(self._request_urls))]
+                self._request_urls[params["requestId"]] = params["request"]["url"]
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                url = self._request_urls.pop(params["requestId"], None)
+                if params.get("blockedReason") == "inspector":
+                    self.blocked_urls.append(url)
+        return True
@@ -2,11 +2,18 @@
 import sys
 from urllib.error import URLError
 
+from selenium.common.exceptions import ElementNotInteractableException
+from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import NoSuchFrameException
 from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import UnexpectedTagNameException
 from selenium.common.exceptions import WebDriverException
-from selenium.webdriver.common.action_chains import ActionChains
 
+from helium3._impl.resources import ResourceBlocker
+from helium3._impl.tracing import span
+from helium3._impl.tracing import trace_commands
+from helium3._impl.upload import FileUploader
+from helium3._impl.windows import WindowTitles
 from helium3.utils.geom import Rectangle
 
 CONNECTION_REFUSED = 10061
@@ -35,9 +42,29 @@ class Wrapper:
 class WebDriverWrapper(Wrapper):
     def __init__(self, target):
         super(WebDriverWrapper, self).__init__(target)
+        trace_commands(target)
         self.last_manipulated_element = None
+        self.file_uploader = FileUploader(target)
+        self.resource_blocker = ResourceBlocker(target)
+        self.window_titles = WindowTitles(target)
+        # Windows Helium opens for itself, eg. to prefetch pages in
+        # paginate(...). They are hidden from Window(...) and switch_to(...):
+        self.hidden_window_handles = set()
+        # The origins of the pages opened with go_to(...). reset_browser(...)
+        # deletes their cookies and storage:
+        self.visited_origins = set()
+
+    @property
+    def window_handles(self):
+        return [
+            handle
+            for handle in self.target.window_handles
+            if handle not in self.hidden_window_handles
+        ]
 
     def action(self):
+        from selenium.webdriver.common.action_chains import ActionChains
+
         return ActionChains(self.target)
 
     def get_distance_to_last_manipulated(self, web_element):
@@ -76,6 +103,10 @@ class WebDriverWrapper(Wrapper):
     def is_ie(self):
         return self.browser_name == "internet explorer"
 
+    @property
+    def page_load_strategy(self):
+        return self.target.capabilities.get("pageLoadStrategy", "normal")
+
 
 def _translate_url_errors_caused_by_server_shutdown(f):
     def f_decorated(*args, **kwargs):
@@ -119,6 +150,8 @@ def handle_element_being_in_other_frame(f):
 
 
 class WebElementWrapper:
+    __slots__ = ("target", "frame_index", "_cached_location")
+
     def __init__(self, target, frame_index=None):
         self.target = target
         self.frame_index = frame_index
@@ -168,6 +201,14 @@ class WebElementWrapper:
     def tag_name(self):
         return self.target.tag_name
 
+    @handle_element_being_in_other_frame
+    def execute_script(self, script, *args):
+        """
+        Executes `script` with this element as `arguments[0]`, followed by
+        `args`.
+        """
+        return self.target.parent.execute_script(script, self.target, *args)
+
     def unwrap(self):
         return self.target
 
@@ -175,6 +216,105 @@ class WebElementWrapper:
         return "<%s>%s</%s>" % (self.tag_name, self.target.text, self.tag_name)
 
 
+class ScriptSelect:
+    """
+    A replacement for Selenium's `Select` that reads and changes the options of
+    a <select> element with one script call, instead of one call per option.
+    This makes a big difference for selects with thousands of options.
+    """
+
+    def __init__(self, web_element):
+        if not isinstance(web_element, WebElementWrapper):
+            web_element = WebElementWrapper(web_element)
+        self.web_element = web_element
+
+    @property
+    def options(self):
+        return self.web_element.execute_script(
+            "var select = arguments[0];"
+            "var options = select.tagName == 'SELECT' ? select.options"
+            "    : (select.list ? select.list.options : []);"
+            "var result = [];"
+            "for (var i = 0; i < options.length; i++)"
+            "    result.push(options[i].text || options[i].value);"
+            "return result;"
+        )
+
+    @property
+    def first_selected_option_text(self):
+        return self.web_element.execute_script(
+            "var select = arguments[0];"
+            "if (select.tagName != 'SELECT')"
+            "    return select.value;"
+            "var index = select.selectedIndex;"
+            "return index < 0 ? null : select.options[index].text;"
+        )
+
+    @classmethod
+    def get_selected_option_texts(cls, driver, web_elements):
+        """
+        Returns the texts of the selected options of each of the given <select>
+        elements, using a single script call for all of them.
+        """
+        if not web_elements:
+            return []
+        return driver.execute_script(
+            "return arguments[0].map(function(select) {"
+            "    var result = [];"
+            "    for (var i = 0; i < select.options.length; i++)"
+            "        if (select.options[i].selected)"
+            "            result.push(select.options[i].text);"
+            "    return result;"
+            "});",
+            [web_element.unwrap() for web_element in web_elements],
+        )
+
+    def select_by_visible_text(self, text):
+        """
+        Like `Select.select_by_visible_text(...)`. Fires the `input` and
+        `change` events a real user interaction would.
+        """
+        result = self.web_element.execute_script(
+            "var select = arguments[0], text = arguments[1];"
+            "if (select.tagName != 'SELECT')"
+            "    return 'unexpected tag';"
+            "var found = false, changed = false;"
+            "for (var i = 0; i < select.options.length; i++) {"
+            "    var option = select.options[i];"
+            "    if (option.text != text)"
+            "        continue;"
+            "    if (select.disabled || option.disabled)"
+            "        return 'disabled';"
+            "    found = true;"
+            "    if (!option.selected) {"
+            "        option.selected = true;"
+            "        changed = true;"
+            "    }"
+            "    if (!select.multiple)"
+            "        break;"
+            "}"
+            "if (changed) {"
+            "    select.dispatchEvent(new Event('input', {bubbles: true}));"
+            "    select.dispatchEvent(new Event('change', {bubbles: true}));"
+            "}"
+            "return found ? 'selected' : 'not found';",
+            text,
+        )
+        if result == "unexpected tag":
+            raise UnexpectedTagNameException(
+                "Select only works on <select> elements, not on <%s>"
+                % self.web_element.tag_name
+            )
+        if result == "disabled":
+            raise ElementNotInteractableException(
+                "Cannot select the disabled option %r." % text
+            )
+        if result == "not found":
+            raise NoSuchElementException(
+                "Could not locate element with visible text: %s" % text
+            )
+
+
 class FrameIterator:
     def __init__(self, driver, start_frame=None):
         if start_frame is None:
@@ -186,7 +326,8 @@ class FrameIterator:
         yield []
         for new_frame in range(sys.maxsize):
             try:
-                self.driver.switch_to.frame(new_frame)
+                with span("switch_to_frame", frame=self.start_frame + [new_frame]):
+                    self.driver.switch_to.frame(new_frame)
             except WebDriverException:
                 break
             else:
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from helium3.utils.xpath import make_relative
+
+# Searches the document and, recursively, every open shadow root in it.
+# Browsers don't accept a shadow root as the context node of an XPath. The
+# XPath is therefore evaluated at each element child of a shadow root, with its
+# absolute paths made relative to that child. See make_relative(...).
+_FIND_ELEMENTS = (
+    "var query = arguments[0], relativeQuery = arguments[1], "
+    "    isXPath = arguments[2];"
+    "var result = [], found = new Set();"
+    "function add(node) {"
+    # Eg. "/.." selects the shadow root itself, which is not an element:
+    "    if (node.nodeType == Node.ELEMENT_NODE && !found.has(node)) {"
+    "        found.add(node);"
+    "        result.push(node);"
+    "    }"
+    "}"
+    "function evaluate(xpath, contextNode) {"
+    "    var snapshot = document.evaluate("
+    "        xpath, contextNode, null, "
+    "        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null"
+    "    );"
+    "    for (var i = 0; i < snapshot.snapshotLength; i++)"
+    "        add(snapshot.snapshotItem(i));"
+    "}"
+    "function search(root) {"
+    "    if (!isXPath) {"
+    "        var elements = root.querySelectorAll(query);"
+    "        for (var i = 0; i < elements.length; i++)"
+    "            add(elements[i]);"
+    "    } else if (root === document)"
+    "        evaluate(query, document);"
+    "    else"
+    "        for (var i = 0; i < root.children.length; i++)"
+    "            evaluate(relativeQuery, root.children[i]);"
+    "    var walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT);"
+    "    while (walker.nextNode())"
+    "        if (walker.currentNode.shadowRoot)"
+    "            search(walker.currentNode.shadowRoot);"
+    "}"
+    "search(document);"
+    "return result;"
+)
+
+
+def find_elements_by_xpath(driver, xpath):
+    """
+    Like driver.find_elements_by_xpath(...), but also finds elements in open
+    shadow roots. Takes a single request however deeply the shadow roots are
+    nested.
+    """
+    return driver.execute_script(_FIND_ELEMENTS, xpath, make_relative(xpath), True)
+
+
+def find_elements_by_css_selector(driver, selector):
+    """
+    Like driver.find_elements_by_css_selector(...), but also finds elements
+    in open shadow roots.
+    """
+    return driver.execute_script(_FIND_ELEMENTS, selector, selector, False)
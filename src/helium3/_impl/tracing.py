@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Lets listeners such as helium3.tracing.Tracer observe what Helium does, as a
+tree of spans: A public API call such as click(...) contains internal phases
+such as the search in each frame, which contain the WebDriver commands sent to
+the browser.
+
+When no listener is registered, or no listener accepted the top-level span,
+span(...) returns a shared object that does nothing. This keeps the cost of
+the instrumentation negligible.
+"""
+
+from functools import wraps
+from threading import local
+from time import perf_counter_ns
+
+_LISTENERS = []
+
+
+def add_listener(listener):
+    """
+    Registers an object with the following methods:
+
+     * accepts(span): Called when a top-level span starts, eg. for a public
+       API call. Returns whether the listener wants to observe it and the
+       spans it contains. This lets listeners sample.
+     * span_started(span): Called when an accepted span starts.
+     * span_finished(span): Called when an accepted span ends.
+    """
+    # Replace rather than modify the list, so span(...) can read it without a
+    # lock:
+    global _LISTENERS
+    _LISTENERS = _LISTENERS + [listener]
+
+
+def remove_listener(listener):
+    global _LISTENERS
+    _LISTENERS = [l for l in _LISTENERS if l is not listener]
+
+
+class _Stack(local):
+    def __init__(self):
+        self.spans = []
+
+
+_STACK = _Stack()
+
+
+def span(name, category="helium", **args):
+    """
+    Returns a context manager that records the time spent in its `with` block
+    as a span with the given name. Spans must not contain a `yield`, or they
+    would not be nested properly.
+    """
+    listeners = _LISTENERS
+    if not listeners:
+        return _NO_SPAN
+    spans = _STACK.spans
+    if spans:
+        parent = spans[-1]
+        if not parent.listeners:
+            # The top-level span was not sampled, so neither are its children:
+            return _NO_SPAN
+        return Span(name, category, args, parent, parent.listeners)
+    result = Span(name, category, args, None, listeners)
+    result.listeners = [l for l in listeners if l.accepts(result)]
+    if not result.listeners:
+        return _UNSAMPLED_ROOT
+    return result
+
+
+def get_current_span():
+    spans = _STACK.spans
+    if not spans or not spans[-1].listeners:
+        return None
+    return spans[-1]
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "category",
+        "args",
+        "parent",
+        "listeners",
+        "start_ns",
+        "end_ns",
+    )
+
+    def __init__(self, name, category, args, parent, listeners):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.parent = parent
+        self.listeners = listeners
+        self.start_ns = self.end_ns = None
+
+    @property
+    def root(self):
+        result = self
+        while result.parent is not None:
+            result = result.parent
+        return result
+
+    def __enter__(self):
+        _STACK.spans.append(self)
+        if self.listeners:
+            self.start_ns = perf_counter_ns()
+            for listener in self.listeners:
+                listener.span_started(self)
+        return self
+
+    def __exit__(self, exc_type, *_):
+        _STACK.spans.pop()
+        if self.listeners:
+            self.end_ns = perf_counter_ns()
+            if exc_type is not None:
+                self.args["error"] = exc_type.__name__
+            for listener in self.listeners:
+                listener.span_finished(self)
+
+
+class _NoSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *_):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _UnsampledRoot:
+    """
+    Stands in for a top-level span that no listener accepted. It is on the
+    stack while it lasts, so the spans it contains know not to record
+    anything either.
+    """
+
+    listeners = ()
+
+    def __enter__(self):
+        _STACK.spans.append(self)
+
+    def __exit__(self, *_):
+        _STACK.spans.pop()
+
+
+_UNSAMPLED_ROOT = _UnsampledRoot()
+
+
+def traced(f):
+    """
+    Makes calls of the decorated function appear as spans, under the
+    function's qualified name, eg. "click" or "TextField.value".
+    """
+    name = f.__qualname__
+
+    @wraps(f)
+    def f_decorated(*args, **kwargs):
+        if not _LISTENERS:
+            return f(*args, **kwargs)
+        with span(name, "api"):
+            return f(*args, **kwargs)
+
+    return f_decorated
+
+
+def trace_commands(driver):
+    """
+    Makes each command the given Selenium WebDriver sends to the browser
+    appear as a span. This includes the commands of its WebElements, which
+    send them through the driver.
+    """
+    execute = getattr(driver, "execute", None)
+    if execute is None or getattr(execute, "is_traced", False):
+        return
+
+    def execute_traced(driver_command, params=None):
+        if not _LISTENERS:
+            return execute(driver_command, params)
+        with span(driver_command, "webdriver"):
+            return execute(driver_command, params)
+
+    execute_traced.is_traced = True
+    driver.execute = execute_traced
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+from base64 import b64encode
+from collections import OrderedDict
+from os import stat
+from os.path import basename
+from tempfile import TemporaryFile
+
+from selenium.common.exceptions import WebDriverException
+
+# Maps (path, size, modification time) to the SHA-256 digest of the file's
+# contents, so we don't need to re-hash large files for every upload. Only the
+# most recently used digests are kept:
+_DIGESTS = OrderedDict()
+_MAX_DIGESTS = 1000
+
+# How much of a file to read at a time when hashing it:
+_CHUNK_SIZE = 1024 * 1024
+
+
+class FileUploader:
+    """
+    Transfers files to remote WebDriver servers. When a file is sent to a file
+    input element of a remote driver, Selenium zips and uploads it every time.
+    This class uploads each unique file (as determined by a hash of its
+    contents) at most once per session and reuses the path on the server
+    afterwards. Like Selenium, it only uploads files that the driver's
+    file_detector considers local. The zip archive is written to a temporary
+    file. Its Base64 encoding is built in memory, because WebDriver sends it
+    as a single JSON string.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._remote_paths = {}
+
+    def send_file(self, web_element, file_path):
+        if not self._is_remote():
+            web_element.send_keys(file_path)
+            return
+        local_path = self.driver.file_detector.is_local_file(file_path)
+        if not local_path:
+            # Eg. a path on the server. Let Selenium handle it as before:
+            web_element.send_keys(file_path)
+            return
+        from selenium.webdriver.remote.file_detector import UselessFileDetector
+
+        remote_path = self.upload(local_path)
+        # Prevent Selenium from uploading the file again:
+        with self.driver.file_detector_context(UselessFileDetector):
+            web_element.send_keys(remote_path)
+
+    def upload(self, file_path):
+        if not self._is_remote():
+            return file_path
+        key = (self.driver.session_id, get_digest(file_path))
+        if key not in self._remote_paths:
+            self._remote_paths[key] = self._upload(file_path)
+        return self._remote_paths[key]
+
+    def _is_remote(self):
+        return getattr(self.driver, "_is_remote", False)
+
+    def _upload(self, file_path):
+        from zipfile import ZIP_DEFLATED
+        from zipfile import ZipFile
+
+        from selenium.webdriver.remote.command import Command
+
+        with TemporaryFile() as zip_file:
+            with ZipFile(
+                zip_file, "w", ZIP_DEFLATED, strict_timestamps=False
+            ) as archive:
+                archive.write(file_path, basename(file_path))
+            zip_file.seek(0)
+            content = b64encode(zip_file.read()).decode("ascii")
+        try:
+            response = self.driver.execute(Command.UPLOAD_FILE, {"file": content})
+        except WebDriverException as e:
+            # The same fallbacks as in Selenium's WebElement._upload(...): Some
+            # servers don't support uploads. They can access the file directly.
+            message = str(e)
+            if (
+                "Unrecognized command: POST" in message
+                or "Command not found: POST " in message
+                or '{"status":405,"value":["GET","HEAD","DELETE"]}' in message
+            ):
+                return file_path
+            raise
+        return response["value"]
+
+
+def get_digest(file_path):
+    file_stat = stat(file_path)
+    key = (file_path, file_stat.st_size, file_stat.st_mtime_ns)
+    try:
+        _DIGESTS.move_to_end(key)
+    except KeyError:
+        import hashlib
+
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file_:
+            for chunk in iter(lambda: file_.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        _DIGESTS[key] = digest.hexdigest()
+        if len(_DIGESTS) > _MAX_DIGESTS:
+            _DIGESTS.popitem(last=False)
+    return _DIGESTS[key]
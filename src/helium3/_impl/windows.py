@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+from selenium.common.exceptions import NoSuchWindowException
+from selenium.common.exceptions import WebDriverException
+
+# Older versions of ChromeDriver prefix the DevTools target IDs of windows:
+_CHROME_HANDLE_PREFIX = "CDwindow-"
+
+
+class WindowTitles:
+    """
+    Reads the titles of the browser's windows. WebDriver only reports the
+    title of the current window, so Selenium has to switch into every other
+    window. In Chrome, this class instead lists all windows with the DevTools
+    command Target.getTargets. In other browsers, it reads the current window
+    without switching and only switches into the remaining windows.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._supports_devtools = hasattr(driver, "execute_cdp_cmd")
+
+    def get(self, handles):
+        """
+        Returns a dictionary that maps each of the given window handles to the
+        title of its window.
+        """
+        result = {}
+        if self._supports_devtools:
+            targets = self._get_devtools_targets()
+            for handle in handles:
+                target_id = handle
+                if target_id.startswith(_CHROME_HANDLE_PREFIX):
+                    target_id = target_id[len(_CHROME_HANDLE_PREFIX) :]
+                if target_id in targets:
+                    result[handle] = targets[target_id]
+        missing = [handle for handle in handles if handle not in result]
+        if missing:
+            result.update(self._get_by_switching(missing))
+        return result
+
+    def _get_devtools_targets(self):
+        try:
+            response = self.driver.execute_cdp_cmd("Target.getTargets", {})
+        except WebDriverException:
+            # Eg. a remote server that does not forward DevTools commands.
+            self._supports_devtools = False
+            return {}
+        result = {}
+        for target in response["targetInfos"]:
+            if target["type"] != "page":
+                continue
+            title = target["title"]
+            # Chrome reports the URL as the title of pages without a <title>,
+            # where WebDriver reports "". We can't tell these apart from pages
+            # whose title happens to look like their URL, so ask WebDriver:
+            if title and title in target["url"]:
+                continue
+            result[target["targetId"]] = title
+        return result
+
+    def _get_by_switching(self, handles):
+        result = {}
+        try:
+            handle_before = self.driver.current_window_handle
+        except NoSuchWindowException:
+            handle_before = None
+        if handle_before in handles:
+            result[handle_before] = self.driver.title
+        has_switched = False
+        try:
+            for handle in handles:
+                if handle != handle_before:
+                    has_switched = True
+                    self.driver.switch_to.window(handle)
+                    result[handle] = self.driver.title
+        finally:
+            if handle_before and has_switched:
+                self.driver.switch_to.window(handle_before)
+        return result
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Helium's API for asyncio. It lets a single event loop control many browsers
+at the same time::
+
+    from helium3.aio import AsyncBrowser
+
+    async def sign_in(user):
+        async with AsyncBrowser() as browser:
+            await browser.start_chrome("github.com/login", headless=True)
+            await browser.write(user, into="Username")
+            await browser.click(browser.Button("Sign in"))
+            return await browser.get(browser.Text(below="Username"), "value")
+
+    async def main():
+        await asyncio.gather(*(sign_in(user) for user in users))
+
+    asyncio.run(main())
+"""
+
+from asyncio import get_running_loop
+from asyncio import iscoroutinefunction
+from asyncio import sleep
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from functools import wraps
+
+from selenium.common.exceptions import TimeoutException
+
+from helium3 import api
+from helium3 import elements
+from helium3._impl.drivers import kill_service
+from helium3.browser import Browser
+
+
+def _in_session(function):
+    @wraps(function, updated=())
+    async def method(self, *args, **kwargs):
+        return await self.call(function, *args, **kwargs)
+
+    return method
+
+
+def _constructor(cls):
+    @wraps(cls, updated=())
+    def method(self, *args, **kwargs):
+        with self._browser:
+            return cls(*args, **kwargs)
+
+    return method
+
+
+class AsyncBrowser:
+    """
+    :param driver: An optional Selenium WebDriver to use, as with
+                   :py:func:`set_driver`.
+
+    Like :py:class:`Browser`, but its methods are coroutines. Each
+    ``AsyncBrowser`` performs its calls one after the other in a thread of its
+    own, so the event loop keeps running while the browser responds. GUI
+    element constructors such as ``browser.Button(...)`` don't communicate
+    with the browser and are therefore not coroutines. To read a property of
+    an element, use :py:meth:`get`. To call any other function in the
+    browser's thread, for instance a method of the Selenium driver, use
+    :py:meth:`call`. :py:meth:`batch` and :py:meth:`command_budget` are used
+    with ``async with``, :py:meth:`paginate` with ``async for``.
+    """
+
+    __slots__ = ("_browser", "_executor", "_is_closed")
+
+    def __init__(self, driver=None):
+        self._browser = Browser(driver)
+        self._executor = ThreadPoolExecutor(1)
+        self._is_closed = False
+
+    async def call(self, function, *args, **kwargs):
+        """
+        Calls the given function in this browser's thread and returns its
+        result. Inside the function, Helium's plain functions and GUI elements
+        use this browser.
+        """
+        return await get_running_loop().run_in_executor(
+            self._executor, partial(self._call, function, *args, **kwargs)
+        )
+
+    def _call(self, function, *args, **kwargs):
+        with self._browser:
+            return function(*args, **kwargs)
+
+    async def get(self, element, attribute):
+        """
+        Returns the given property of a GUI element, for instance::
+
+            await browser.get(browser.TextField("Name"), "value")
+        """
+        return await self.call(getattr, element, attribute)
+
+    async def exists(self, element):
+        """
+        Returns whether the given GUI element exists.
+        """
+        return await self.call(element.exists)
+
+    async def wait_until(self, condition_fn, timeout_secs=10, interval_secs=0.5):
+        """
+        Like :py:func:`wait_until`, but does not block the event loop between
+        evaluations of ``condition_fn``. This may also be a coroutine function.
+        """
+        loop = get_running_loop()
+        end_time = loop.time() + timeout_secs
+        while True:
+            if iscoroutinefunction(condition_fn):
+                result = await condition_fn()
+            else:
+                result = await self.call(condition_fn)
+            if result:
+                return result
+            if loop.time() >= end_time:
+                raise TimeoutException(
+                    "Condition not satisfied within %s seconds." % timeout_secs
+                )
+            await sleep(interval_secs)
+
+    def batch(self):
+        """
+        Like :py:func:`batch`, but for use with ``async with``::
+
+            async with browser.batch():
+                await browser.write("John", into="Name")
+                await browser.click("Submit")
+        """
+        return self._enter(api.batch)
+
+    def command_budget(self, max_commands=None, warn=False):
+        """
+        Like :py:func:`command_budget`, but for use with ``async with``. It
+        counts the commands sent from this browser's thread.
+        """
+        return self._enter(api.command_budget, max_commands, warn)
+
+    async def paginate(self, next, items):
+        """
+        Like :py:func:`paginate`, but returns an asynchronous iterator::
+
+            results = browser.paginate(browser.Link("Next"), browser.S(".result"))
+            async for result in results:
+                print(await browser.get(result, "web_element"))
+        """
+        iterator = await self.call(api.paginate, next, items)
+        try:
+            while True:
+                item = await self.call(_next_or_end, iterator)
+                if item is _END:
+                    return
+                yield item
+        finally:
+            # Lets the paginator close the tabs it opened:
+            await self.call(iterator.close)
+
+    @asynccontextmanager
+    async def _enter(self, function, *args):
+        """
+        Calls the given function in this browser's thread and enters the
+        context manager it returns, also in this thread.
+        """
+        context_manager = await self.call(function, *args)
+        result = await self.call(context_manager.__enter__)
+        try:
+            yield result
+        except BaseException as e:
+            if not await self.call(
+                context_manager.__exit__, type(e), e, e.__traceback__
+            ):
+                raise
+        else:
+            await self.call(context_manager.__exit__, None, None, None)
+
+    async def close(self):
+        """
+        Closes the browser, if it is running, and stops this object's thread.
+        If closing the browser fails, its driver process is stopped before the
+        error is raised, so the browser does not keep running without a way to
+        control it. Calling this method again has no effect.
+        """
+        if self._is_closed:
+            return
+        self._is_closed = True
+        try:
+            if await self.call(api.get_driver) is not None:
+                await self.call(api.kill_browser)
+        except Exception:
+            await self.call(_stop_driver_service)
+            raise
+        finally:
+            # The thread is idle by now, so this does not block the event loop:
+            self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    start_chrome = _in_session(api.start_chrome)
+    start_firefox = _in_session(api.start_firefox)
+    set_blocked_resources = _in_session(api.set_blocked_resources)
+    get_blocked_requests = _in_session(api.get_blocked_requests)
+    go_to = _in_session(api.go_to)
+    set_driver = _in_session(api.set_driver)
+    get_driver = _in_session(api.get_driver)
+    get_start_timings = _in_session(api.get_start_timings)
+    write = _in_session(api.write)
+    press = _in_session(api.press)
+    click = _in_session(api.click)
+    doubleclick = _in_session(api.doubleclick)
+    drag = _in_session(api.drag)
+    press_mouse_on = _in_session(api.press_mouse_on)
+    release_mouse_over = _in_session(api.release_mouse_over)
+    find_all = _in_session(api.find_all)
+    scroll_down = _in_session(api.scroll_down)
+    scroll_up = _in_session(api.scroll_up)
+    scroll_right = _in_session(api.scroll_right)
+    scroll_left = _in_session(api.scroll_left)
+    hover = _in_session(api.hover)
+    right_click = _in_session(api.right_click)
+    select = _in_session(api.select)
+    drag_file = _in_session(api.drag_file)
+    attach_file = _in_session(api.attach_file)
+    refresh = _in_session(api.refresh)
+    switch_to = _in_session(api.switch_to)
+    kill_browser = _in_session(api.kill_browser)
+    highlight = _in_session(api.highlight)
+
+    S = _constructor(elements.S)
+    Text = _constructor(elements.Text)
+    Link = _constructor(elements.Link)
+    ListItem = _constructor(elements.ListItem)
+    Button = _constructor(elements.Button)
+    Image = _constructor(elements.Image)
+    TextField = _constructor(elements.TextField)
+    ComboBox = _constructor(elements.ComboBox)
+    CheckBox = _constructor(elements.CheckBox)
+    RadioButton = _constructor(elements.RadioButton)
+    Table = _constructor(elements.Table)
+    Window = _constructor(elements.Window)
+    Alert = _constructor(elements.Alert)
+
+
+_END = object()
+
+
+def _next_or_end(iterator):
+    return next(iterator, _END)
+
+
+def _stop_driver_service():
+    service = getattr(api.get_driver(), "service", None)
+    if service is None:
+        # Eg. a remote browser.
+        return
+    try:
+        kill_service(service)
+    except Exception:
+        # Raise the error of kill_browser() instead.
+        pass
@@ -1,18 +1,48 @@
 # -*- coding: utf-8 -*-
+from threading import local
+
 from helium3._impl import APIImpl
+from helium3._impl import BatchError
+from helium3._impl.command_stats import CommandBudgetExceeded
+from helium3._impl.command_stats import CommandBudgetWarning
+from helium3._impl.tracing import traced
 
 _API_IMPL = None
 
 
+class _Sessions(local):
+    """
+    The :py:class:`Browser` objects whose ``with`` blocks the current thread is
+    in. The innermost one receives the calls to Helium's API functions.
+    """
+
+    def __init__(self):
+        self.api_impls = []
+
+
+_SESSIONS = _Sessions()
+
+
 def _get_api_impl():
+    api_impls = _SESSIONS.api_impls
+    if api_impls:
+        return api_impls[-1]
     global _API_IMPL
     if _API_IMPL is None:
         _API_IMPL = APIImpl()
     return _API_IMPL
 
 
+@traced
 def start_chrome(
-    url=None, headless=False, maximize=False, options=None, capabilities=None
+    url=None,
+    headless=False,
+    maximize=False,
+    options=None,
+    capabilities=None,
+    block_resources=None,
+    page_load_strategy=None,
+    shared_service=False,
 ):
     """
     :param url: URL to open.
@@ -25,6 +55,15 @@ def start_chrome(
     :type options: :py:class:`selenium.webdriver.ChromeOptions`
     :param capabilities: DesiredCapabilities to use for starting the browser
     :type capabilities: :py:class:`selenium.webdriver.DesiredCapabilities`
+    :param block_resources: Resource types and URL patterns to block. See \
+:py:func:`set_blocked_resources`.
+    :type block_resources: list of str
+    :param page_load_strategy: "normal", "eager" or "none". See \
+:py:func:`go_to`.
+    :type page_load_strategy: str
+    :param shared_service: Whether to use a ChromeDriver process that is shared \
+with other browsers started with this option.
+    :type shared_service: bool
 
     Starts an instance of Google Chrome::
 
@@ -58,6 +97,18 @@ def start_chrome(
             capabilities["goog:loggingPrefs"] = {'performance': 'ALL'}
             start_chrome(capabilities=capabilities)
 
+    To make pages load faster, you can prevent Chrome from loading resources
+    you don't need::
+
+            start_chrome(block_resources=["image", "font", "*analytics*"])
+
+    Normally, every Chrome instance has its own ChromeDriver process. When you
+    start many browsers, for instance with :py:class:`Browser` or
+    :py:class:`BrowserPool`, ``shared_service=True`` saves the memory and
+    start-up time of these processes. All browsers started with this option
+    then use a single ChromeDriver. :py:func:`kill_browser` only closes the
+    browser. The ChromeDriver process ends when its last browser is closed.
+
     On shutdown of the Python interpreter, Helium cleans up all resources used
     for controlling the browser (such as the ChromeDriver process), but does
     not close the browser itself. If you want to terminate the browser at the
@@ -66,11 +117,25 @@ def start_chrome(
             kill_browser()
     """
     return _get_api_impl().start_chrome_impl(
-        url, headless, maximize, options, capabilities
+        url,
+        headless,
+        maximize,
+        options,
+        capabilities,
+        block_resources,
+        page_load_strategy,
+        shared_service,
     )
 
 
-def start_firefox(url=None, headless=False, options=None):
+@traced
+def start_firefox(
+    url=None,
+    headless=False,
+    options=None,
+    block_resources=None,
+    page_load_strategy=None,
+):
     """
     :param url: URL to open.
     :type url: str
@@ -78,6 +143,12 @@ def start_firefox(url=None, headless=False, options=None):
     :type headless: bool
     :param options: FirefoxOptions to use for starting the browser.
     :type options: :py:class:`selenium.webdriver.FirefoxOptions`
+    :param block_resources: Resource types to block: "image", "font", "media" \
+and/or "stylesheet". Unlike Chrome, Firefox does not support URL patterns.
+    :type block_resources: list of str
+    :param page_load_strategy: "normal", "eager" or "none". See \
+:py:func:`go_to`.
+    :type page_load_strategy: str
 
     Starts an instance of Firefox::
 
@@ -105,6 +176,11 @@ def start_firefox(url=None, headless=False, options=None):
             options.add_argument("--height=1440")
             start_firefox(options=options)
 
+    To make pages load faster, you can prevent Firefox from loading resources
+    you don't need::
+
+            start_firefox(block_resources=["image", "font"])
+
     On shutdown of the Python interpreter, Helium cleans up all resources used
     for controlling the browser (such as the geckodriver process), but does
     not close the browser itself. If you want to terminate the browser at the
@@ -112,21 +188,87 @@ def start_firefox(url=None, headless=False, options=None):
 
             kill_browser()
     """
-    return _get_api_impl().start_firefox_impl(url, headless, options)
+    return _get_api_impl().start_firefox_impl(
+        url, headless, options, block_resources, page_load_strategy
+    )
+
+
+@traced
+def set_blocked_resources(resources):
+    """
+    :param resources: Resource types and URL patterns to block.
+    :type resources: list of str
 
+    Prevents Chrome from loading the given resources. This makes pages load
+    faster when you don't need all of their content. For example::
 
-def go_to(url):
+            set_blocked_resources(["image", "font", "media", "*analytics*"])
+
+    The supported resource types are "image", "font", "media" and
+    "stylesheet". They are blocked based on the file extensions in their URLs.
+    URL patterns may contain the wildcard `*`. Each call replaces the resources
+    blocked before. To stop blocking resources, call::
+
+            set_blocked_resources([])
+
+    This only affects the current browser tab. It is not supported in Firefox.
+    To block resources in Firefox, pass `block_resources` to
+    :py:func:`start_firefox` instead.
+    """
+    _get_api_impl().set_blocked_resources_impl(resources)
+
+
+@traced
+def get_blocked_requests():
+    """
+    Returns the URLs of the requests Chrome has blocked because of
+    :py:func:`set_blocked_resources` or the `block_resources` parameter of
+    :py:func:`start_chrome`. For example::
+
+            start_chrome("google.com", block_resources=["image"])
+            print("Blocked %d requests" % len(get_blocked_requests()))
+
+    This requires Chrome's performance log. :py:func:`start_chrome` enables it
+    when you pass `block_resources`. Helium reads the log to count the blocked
+    requests, so you won't see its entries in `get_driver().get_log(...)`. To
+    keep the memory of long sessions bounded, Helium reads the log whenever
+    you call :py:func:`go_to` and only remembers the last 1000 blocked URLs.
+    """
+    return _get_api_impl().get_blocked_requests_impl()
+
+
+@traced
+def go_to(url, wait="load"):
     """
     :param url: URL to open.
     :type url: str
+    :param wait: What to wait for: "load", "domcontentloaded", "none" or a \
+Helium element such as `Button("OK")`.
 
     Opens the specified URL in the current web browser window. For instance::
 
             go_to("google.com")
+
+    By default, the browser waits until the page has fully loaded, including
+    all of its images, scripts and ads. When you only need part of the page,
+    start the browser with the page load strategy "eager" or "none" and tell
+    `go_to` what to wait for instead::
+
+            start_chrome(page_load_strategy="none")
+            go_to("google.com", wait=TextField("Search"))
+
+    `wait="domcontentloaded"` waits until the page's HTML has been parsed.
+    `wait="none"` returns as soon as the browser has started loading the page.
+    Helium waits at most :py:attr:`Config.implicit_wait_secs` seconds, then
+    raises a :py:class:`selenium.common.exceptions.TimeoutException`.
+
+    With the default page load strategy "normal", the browser always waits for
+    the full page load.
     """
-    _get_api_impl().go_to_impl(url)
+    _get_api_impl().go_to_impl(url, wait)
 
 
+@traced
 def set_driver(driver):
     """
     Sets the Selenium WebDriver used to execute Helium commands. See also
@@ -135,6 +277,7 @@ def set_driver(driver):
     _get_api_impl().set_driver_impl(driver)
 
 
+@traced
 def get_driver():
     """
     Returns the Selenium WebDriver currently used by Helium to execute all
@@ -144,13 +287,36 @@ def get_driver():
     return _get_api_impl().get_driver_impl()
 
 
-def write(text, into=None):
+@traced
+def get_start_timings():
+    """
+    Returns how long the last call to :py:func:`start_chrome` or
+    :py:func:`start_firefox` took to start the browser, in seconds, broken down
+    into phases. For example::
+
+        >>> get_start_timings()
+        {'resolve': 0.0004, 'spawn': 0.05, 'session': 0.82}
+
+    ``"resolve"`` is the time to find the driver executable, eg. chromedriver,
+    ``"spawn"`` the time to start it and ``"session"`` the time to start the
+    browser. Helium remembers the driver that worked for each browser in
+    ``~/.cache/helium3`` and tries it first the next time. Returns ``None`` if
+    no browser was started.
+    """
+    return _get_api_impl().get_start_timings_impl()
+
+
+@traced
+def write(text, into=None, mode=None):
     """
     :param text: The text to be written.
     :type text: one of str, unicode
     :param into: The element to write into.
     :type into: one of str, unicode, :py:class:`HTMLElement`, \
 :py:class:`selenium.webdriver.remote.webelement.WebElement`, :py:class:`Alert`
+    :param mode: How the text is entered. One of ``"keys"``, ``"insert"``, \
+``"value"`` or ``"auto"``. Defaults to :py:attr:`Config.write_mode`.
+    :type mode: str
 
     Types the given text into the active window. If parameter 'into' is given,
     writes the text into the text field or element identified by that parameter.
@@ -159,10 +325,30 @@ def write(text, into=None):
         write("Hello World!")
         write("user12345", into="Username:")
         write("Michael", into=Alert("Please enter your name"))
+
+    Typing long texts key by key can be slow. The ``mode`` parameter lets you
+    choose a faster way of entering the text:
+
+     * ``"keys"`` types the text key by key, like a user would.
+     * ``"insert"`` inserts the whole text at once, as if it had been pasted.
+       The page receives ``input`` events, but no key events.
+     * ``"value"`` sets the value of the text field directly and fires
+       ``input`` and ``change`` events.
+     * ``"auto"`` uses ``"insert"`` for plain ``<textarea>`` elements and
+       ``"keys"`` for all other elements, in particular for those with inline
+       key handlers such as ``onkeydown``. Key handlers that were added with
+       ``addEventListener(...)`` are not detected.
+
+    For example::
+
+        write(json_config, into="Configuration", mode="insert")
+
+    Texts that contain special keys such as :py:data:`ENTER` are always typed.
     """
-    _get_api_impl().write_impl(text, into)
+    _get_api_impl().write_impl(text, into, mode)
 
 
+@traced
 def press(key):
     """
     :param key: Key or combination of keys to be pressed.
@@ -192,6 +378,7 @@ def press(key):
     _get_api_impl().press_impl(key)
 
 
+@traced
 def click(element):
     """
     :param element: The element or point to click.
@@ -208,6 +395,7 @@ def click(element):
     _get_api_impl().click_impl(element)
 
 
+@traced
 def doubleclick(element):
     """
     :param element: The element or point to click.
@@ -224,6 +412,7 @@ def doubleclick(element):
     _get_api_impl().doubleclick_impl(element)
 
 
+@traced
 def drag(element, to):
     """
     :param element: The element or point to drag.
@@ -248,14 +437,17 @@ def drag(element, to):
     _get_api_impl().drag_impl(element, to)
 
 
+@traced
 def press_mouse_on(element):
     _get_api_impl().press_mouse_on_impl(element)
 
 
+@traced
 def release_mouse_over(element):
     _get_api_impl().release_mouse_over_impl(element)
 
 
+@traced
 def find_all(predicate):
     """
     Lets you find all occurrences of the given GUI element predicate. For
@@ -284,6 +476,7 @@ def find_all(predicate):
     return _get_api_impl().find_all_impl(predicate)
 
 
+@traced
 def scroll_down(num_pixels=100):
     """
     Scrolls down the page the given number of pixels.
@@ -291,6 +484,7 @@ def scroll_down(num_pixels=100):
     _get_api_impl().scroll_down_impl(num_pixels)
 
 
+@traced
 def scroll_up(num_pixels=100):
     """
     Scrolls the the page up the given number of pixels.
@@ -298,6 +492,7 @@ def scroll_up(num_pixels=100):
     _get_api_impl().scroll_up_impl(num_pixels)
 
 
+@traced
 def scroll_right(num_pixels=100):
     """
     Scrolls the page to the right the given number of pixels.
@@ -305,6 +500,7 @@ def scroll_right(num_pixels=100):
     _get_api_impl().scroll_right_impl(num_pixels)
 
 
+@traced
 def scroll_left(num_pixels=100):
     """
     Scrolls the page to the left the given number of pixels.
@@ -312,6 +508,7 @@ def scroll_left(num_pixels=100):
     _get_api_impl().scroll_left_impl(num_pixels)
 
 
+@traced
 def hover(element):
     """
     :param element: The element or point to hover.
@@ -329,6 +526,7 @@ def hover(element):
     _get_api_impl().hover_impl(element)
 
 
+@traced
 def right_click(element):
     """
     :param element: The element or point to click.
@@ -344,6 +542,7 @@ def right_click(element):
     _get_api_impl().rightclick_impl(element)
 
 
+@traced
 def select(combo_box, value):
     """
     :param combo_box: The combo box whose value should be changed.
@@ -358,6 +557,7 @@ def select(combo_box, value):
     _get_api_impl().select_impl(combo_box, value)
 
 
+@traced
 def drag_file(file_path, to):
     """
     Simulates the dragging of a file from the computer over the browser window
@@ -372,6 +572,7 @@ def drag_file(file_path, to):
     _get_api_impl().drag_file_impl(file_path, to)
 
 
+@traced
 def attach_file(file_path, to=None):
     """
     :param file_path: The path of the file to be attached.
@@ -388,6 +589,7 @@ def attach_file(file_path, to=None):
     _get_api_impl().attach_file_impl(file_path, to=to)
 
 
+@traced
 def refresh():
     """
     Refreshes the current page. If an alert dialog is open, then Helium first
@@ -396,6 +598,7 @@ def refresh():
     _get_api_impl().refresh_impl()
 
 
+@traced
 def wait_until(condition_fn, timeout_secs=10, interval_secs=0.5):
     """
     :param condition_fn: A function taking no arguments that represents the \
@@ -424,6 +627,7 @@ def wait_until(condition_fn, timeout_secs=10, interval_secs=0.5):
     _get_api_impl().wait_until_impl(condition_fn, timeout_secs, interval_secs)
 
 
+@traced
 def switch_to(window):
     """
     :param window: The title (string) of a browser window or a \
@@ -446,6 +650,7 @@ def switch_to(window):
     _get_api_impl().switch_to_impl(window)
 
 
+@traced
 def kill_browser():
     """
     Closes the current browser with all associated windows and potentially open
@@ -463,6 +668,7 @@ def kill_browser():
     _get_api_impl().kill_browser_impl()
 
 
+@traced
 def highlight(element):
     """
     :param element: The element to highlight.
@@ -474,3 +680,104 @@ def highlight(element):
             highlight(Button("Sign in"))
     """
     _get_api_impl().highlight_impl(element)
+
+
+@traced
+def batch():
+    """
+    Returns a context manager that records the calls to :py:func:`write`,
+    :py:func:`click`, :py:func:`select`, :py:func:`press` and the
+    ``scroll_...`` functions made inside it, and performs them at the end of
+    the ``with`` block with as few requests to the browser as possible. For
+    example::
+
+        with batch():
+            write("John", into="First name")
+            write("Smith", into="Last name")
+            click("Male")
+            click("I agree")
+            press(ENTER)
+
+    Here, the two clicks are sent to the browser together, as are key presses
+    and scrolls that directly follow each other. This makes automation runs
+    faster, especially with remote browsers.
+
+    Clicks are only sent together when their targets are already visible on
+    the screen. Such clicks are not retried if another element is in the way.
+    A click whose target is missing or out of view is performed on its own,
+    after the clicks before it, like a normal call to :py:func:`click`. So a
+    click can still depend on an earlier one, eg. ``click("Menu")`` followed
+    by ``click("Item")`` where the menu item only appears after the first
+    click.
+
+    The actions are performed in order. Because they are only performed at the
+    end of the block, the code inside it should not depend on their results.
+    If one of the actions fails, the remaining ones are skipped and a
+    :py:class:`BatchError` is raised. It says which step failed and has the
+    attributes ``completed_steps``, ``failed_steps`` and ``skipped_steps``. If
+    the actions open a new window, Helium switches to it at the end of the
+    batch.
+    """
+    return _get_api_impl().batch_impl()
+
+
+@traced
+def paginate(next, items):
+    """
+    :param next: The control that leads to the next page, eg. ``Link("Next")``.
+    :param items: The elements to return from each page, eg. ``S(".result")``.
+
+    Returns the items on the current page, then those on the next page, and
+    so on, until there is no more ``next`` control. For example::
+
+        for result in paginate(next=Link("Next"), items=S(".result")):
+            print(result.web_element.text)
+
+    When ``next`` is a link, Helium loads the next page in a separate tab
+    while you process the items of the current page. This tab does not appear
+    in :py:func:`find_all(Window()) <find_all>`. Once you are done with a page,
+    the tab replaces the one of the current page. The tab you called
+    ``paginate(...)`` in is kept. When pagination ends, Helium opens the last
+    page in it and switches back to it. When ``next`` is not a link, for
+    instance a button that loads the next results with JavaScript, Helium
+    clicks it and waits for the current items to be replaced.
+
+    Pagination ends when there is no ``next`` control, when it is disabled
+    (for instance a button with the ``disabled`` attribute or a link without
+    ``href``), or when clicking it does not replace the items within
+    ``Config.implicit_wait_secs``.
+    """
+    return _get_api_impl().paginate_impl(next, items)
+
+
+def command_budget(max_commands=None, warn=False):
+    """
+    :param max_commands: The maximum number of WebDriver commands the code in
+                         the ``with`` block may send to the browser.
+    :param warn: Whether to only issue a ``CommandBudgetWarning`` instead of
+                 raising an error when the budget is exceeded.
+
+    Returns a context manager that counts the commands Helium sends to the
+    browser in the current thread. Each command is a round trip to the
+    browser, which is expensive especially with remote browsers. This lets you
+    notice when a script, or Helium itself, becomes slower::
+
+        with command_budget(max_commands=5):
+            click("OK")
+
+    If the code in the ``with`` block sent more than ``max_commands``
+    commands, :py:class:`CommandBudgetExceeded` is raised at its end. It is an
+    ``AssertionError``, so test runners report it as a failure. To see the
+    commands that were sent, use the object returned by the ``with``
+    statement::
+
+        with command_budget() as stats:
+            click("OK")
+        print(stats)
+
+    Its attributes are ``num_commands`` and ``total_secs``, the number of
+    commands per command name in ``by_command``, the time they took in
+    ``secs_by_command`` and the number of commands per command name for each
+    of Helium's functions you called in ``by_call``.
+    """
+    return _get_api_impl().command_budget_impl(max_commands, warn)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+from functools import wraps
+
+from helium3 import api
+from helium3 import elements
+from helium3._impl import APIImpl
+from helium3.api import _SESSIONS
+
+
+def _in_session(function):
+    @wraps(function, updated=())
+    def method(self, *args, **kwargs):
+        with self:
+            return function(*args, **kwargs)
+
+    return method
+
+
+class Browser:
+    """
+    :param driver: An optional Selenium WebDriver to use, as with
+                   :py:func:`set_driver`.
+
+    A browser session with its own driver. Helium's functions such as
+    :py:func:`start_chrome` or :py:func:`click` all work with a single browser
+    per process. A ``Browser`` lets you control several browsers at the same
+    time, for instance from a thread pool. It has all of Helium's functions as
+    methods. Its GUI element constructors such as ``browser.Button(...)``
+    create elements that belong to this browser::
+
+        browser = Browser()
+        browser.start_chrome("github.com/login", headless=True)
+        browser.write("user", into=browser.TextField("Username"))
+        browser.click(browser.Button("Sign in"))
+        browser.kill_browser()
+
+    Inside a ``with`` block, the browser becomes the current thread's default:
+    Helium's plain functions and GUI elements then use it instead of the
+    process-wide browser. This lets you run existing scripts in several
+    threads at once::
+
+        def sign_in(user):
+            browser = Browser()
+            with browser:
+                start_chrome("github.com/login", headless=True)
+                write(user, into="Username")
+                click(Button("Sign in"))
+                kill_browser()
+
+        with ThreadPoolExecutor(16) as executor:
+            executor.map(sign_in, users)
+
+    Leaving the ``with`` block does not close the browser. A ``Browser`` should
+    only be used by one thread at a time. :py:class:`Config` applies to all
+    browsers.
+    """
+
+    __slots__ = ("_api_impl",)
+
+    def __init__(self, driver=None):
+        self._api_impl = APIImpl()
+        if driver is not None:
+            self._api_impl.set_driver_impl(driver)
+
+    def __enter__(self):
+        _SESSIONS.api_impls.append(self._api_impl)
+        return self
+
+    def __exit__(self, *_):
+        _SESSIONS.api_impls.pop()
+
+    start_chrome = _in_session(api.start_chrome)
+    start_firefox = _in_session(api.start_firefox)
+    set_blocked_resources = _in_session(api.set_blocked_resources)
+    get_blocked_requests = _in_session(api.get_blocked_requests)
+    go_to = _in_session(api.go_to)
+    set_driver = _in_session(api.set_driver)
+    get_driver = _in_session(api.get_driver)
+    get_start_timings = _in_session(api.get_start_timings)
+    write = _in_session(api.write)
+    press = _in_session(api.press)
+    click = _in_session(api.click)
+    doubleclick = _in_session(api.doubleclick)
+    drag = _in_session(api.drag)
+    press_mouse_on = _in_session(api.press_mouse_on)
+    release_mouse_over = _in_session(api.release_mouse_over)
+    find_all = _in_session(api.find_all)
+    scroll_down = _in_session(api.scroll_down)
+    scroll_up = _in_session(api.scroll_up)
+    scroll_right = _in_session(api.scroll_right)
+    scroll_left = _in_session(api.scroll_left)
+    hover = _in_session(api.hover)
+    right_click = _in_session(api.right_click)
+    select = _in_session(api.select)
+    drag_file = _in_session(api.drag_file)
+    attach_file = _in_session(api.attach_file)
+    refresh = _in_session(api.refresh)
+    wait_until = _in_session(api.wait_until)
+    switch_to = _in_session(api.switch_to)
+    kill_browser = _in_session(api.kill_browser)
+    highlight = _in_session(api.highlight)
+    batch = _in_session(api.batch)
+    paginate = _in_session(api.paginate)
+    command_budget = _in_session(api.command_budget)
+
+    S = _in_session(elements.S)
+    Text = _in_session(elements.Text)
+    Link = _in_session(elements.Link)
+    ListItem = _in_session(elements.ListItem)
+    Button = _in_session(elements.Button)
+    Image = _in_session(elements.Image)
+    TextField = _in_session(elements.TextField)
+    ComboBox = _in_session(elements.ComboBox)
+    CheckBox = _in_session(elements.CheckBox)
+    RadioButton = _in_session(elements.RadioButton)
+    Table = _in_session(elements.Table)
+    Window = _in_session(elements.Window)
+    Alert = _in_session(elements.Alert)
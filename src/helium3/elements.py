@@ -1,21 +1,25 @@
 # -*- coding: utf-8 -*-
-from collections import OrderedDict
 from collections import namedtuple
 from copy import copy
 
 import helium3._impl
+from helium3._impl.tracing import traced
 from helium3.api import _get_api_impl
 from helium3.utils.html import get_easily_readable_snippet
 from helium3.utils.inspect_ import repr_args
+from helium3.utils.lang import copy_slots
 
 
 class GUIElement:
+    __slots__ = ("_driver", "_args", "_kwargs", "_impl_cached")
+
     def __init__(self):
         self._driver = _get_api_impl().require_driver()
         self._args = []
-        self._kwargs = OrderedDict()
+        self._kwargs = {}
         self._impl_cached = None
 
+    @traced
     def exists(self):
         """
         Evaluates to true if this GUI element exists.
@@ -27,12 +31,16 @@ class GUIElement:
         result._impl = impl
         return result
 
+    def __copy__(self):
+        return copy_slots(self)
+
     @property
     def _impl(self):
         if self._impl_cached is None:
-            impl_class = getattr(
-                helium3._impl, self.__class__.__name__ + "Impl"
-            )  # ugly, requires rework. 'helium3._impl'
+            try:
+                impl_class = _IMPL_CLASSES[self.__class__]
+            except KeyError:
+                impl_class = getattr(helium3._impl, self.__class__.__name__ + "Impl")
             self._impl_cached = impl_class(self._driver, *self._args, **self._kwargs)
         return self._impl_cached
 
@@ -58,6 +66,8 @@ class GUIElement:
 
 
 class HTMLElement(GUIElement):
+    __slots__ = ()
+
     def __init__(self, below=None, to_right_of=None, above=None, to_left_of=None):
         super(HTMLElement, self).__init__()
         self._kwargs["below"] = below
@@ -66,6 +76,7 @@ class HTMLElement(GUIElement):
         self._kwargs["to_left_of"] = to_left_of
 
     @property
+    @traced
     def width(self):
         """
         The width of this HTML element, in pixels.
@@ -73,6 +84,7 @@ class HTMLElement(GUIElement):
         return self._impl.width
 
     @property
+    @traced
     def height(self):
         """
         The height of this HTML element, in pixels.
@@ -80,6 +92,7 @@ class HTMLElement(GUIElement):
         return self._impl.height
 
     @property
+    @traced
     def x(self):
         """
         The x-coordinate on the page of the top-left point of this HTML element.
@@ -87,6 +100,7 @@ class HTMLElement(GUIElement):
         return self._impl.x
 
     @property
+    @traced
     def y(self):
         """
         The y-coordinate on the page of the top-left point of this HTML element.
@@ -94,6 +108,7 @@ class HTMLElement(GUIElement):
         return self._impl.y
 
     @property
+    @traced
     def top_left(self):
         """
         The top left corner of this element, as a :py:class:`helium.Point`.
@@ -106,6 +121,7 @@ class HTMLElement(GUIElement):
         return self._impl.top_left
 
     @property
+    @traced
     def web_element(self):
         """
         The Selenium WebElement corresponding to this element.
@@ -154,6 +170,8 @@ class S(HTMLElement):
     of other web elements.
     """
 
+    __slots__ = ()
+
     def __init__(
         self, selector, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -182,6 +200,8 @@ class Text(HTMLElement):
     other web elements.
     """
 
+    __slots__ = ()
+
     def __init__(
         self, text=None, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -191,6 +211,7 @@ class Text(HTMLElement):
         self._args.append(text)
 
     @property
+    @traced
     def value(self):
         """
         Returns the current value of this Text object.
@@ -217,6 +238,8 @@ class Link(HTMLElement):
             click(Link("Block User", to_right_of="John Doe"))
     """
 
+    __slots__ = ()
+
     def __init__(
         self, text=None, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -226,6 +249,7 @@ class Link(HTMLElement):
         self._args.append(text)
 
     @property
+    @traced
     def href(self):
         """
         Returns the URL of the page the link goes to.
@@ -253,6 +277,8 @@ class ListItem(HTMLElement):
             click(ListItem("List item 1", below="My first list:"))
     """
 
+    __slots__ = ()
+
     def __init__(
         self, text=None, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -281,6 +307,8 @@ class Button(HTMLElement):
             click(Button("Log In", below=TextField("Password")))
     """
 
+    __slots__ = ()
+
     def __init__(
         self, text=None, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -289,6 +317,7 @@ class Button(HTMLElement):
         )
         self._args.append(text)
 
+    @traced
     def is_enabled(self):
         """
         Returns true if this UI element can currently be interacted with.
@@ -316,6 +345,8 @@ class Image(HTMLElement):
             click(Image("Helium Logo", to_left_of=ListItem("Download")))
     """
 
+    __slots__ = ()
+
     def __init__(
         self, alt=None, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -342,6 +373,8 @@ class TextField(HTMLElement):
             TextField("Address line 1", below="Billing Address:").value
     """
 
+    __slots__ = ()
+
     def __init__(
         self, label=None, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -351,12 +384,14 @@ class TextField(HTMLElement):
         self._args.append(label)
 
     @property
+    @traced
     def value(self):
         """
         Returns the current value of this text field. '' if there is no value.
         """
         return self._impl.value
 
+    @traced
     def is_enabled(self):
         """
         Returns true if this UI element can currently be interacted with.
@@ -367,6 +402,7 @@ class TextField(HTMLElement):
         """
         return self._impl.is_enabled()
 
+    @traced
     def is_editable(self):
         """
         Returns true if the value of this UI element can be modified.
@@ -399,6 +435,8 @@ class ComboBox(HTMLElement):
     This sets the Status of John Doe to Active on the page.
     """
 
+    __slots__ = ()
+
     def __init__(
         self, label=None, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -407,6 +445,7 @@ class ComboBox(HTMLElement):
         )
         self._args.append(label)
 
+    @traced
     def is_editable(self):
         """
         Returns whether this combo box allows entering an arbitrary text in
@@ -415,6 +454,7 @@ class ComboBox(HTMLElement):
         return self._impl.is_editable()
 
     @property
+    @traced
     def value(self):
         """
         Returns the currently selected combo box value.
@@ -422,6 +462,7 @@ class ComboBox(HTMLElement):
         return self._impl.value
 
     @property
+    @traced
     def options(self):
         """
         Returns a list of all possible options available to choose from in the
@@ -451,6 +492,8 @@ class CheckBox(HTMLElement):
             click(CheckBox("Stay signed in", below=Button("Sign in")))
     """
 
+    __slots__ = ()
+
     def __init__(
         self, label=None, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -459,12 +502,14 @@ class CheckBox(HTMLElement):
         )
         self._args.append(label)
 
+    @traced
     def is_enabled(self):
         """
         Returns True if this GUI element can currently be interacted with.
         """
         return self._impl.is_enabled()
 
+    @traced
     def is_checked(self):
         """
         Returns True if this GUI element is checked (selected).
@@ -493,6 +538,8 @@ class RadioButton(HTMLElement):
             click(RadioButton("I accept", below="License Agreement"))
     """
 
+    __slots__ = ()
+
     def __init__(
         self, label=None, below=None, to_right_of=None, above=None, to_left_of=None
     ):
@@ -501,6 +548,7 @@ class RadioButton(HTMLElement):
         )
         self._args.append(label)
 
+    @traced
     def is_selected(self):
         """
         Returns true if this radio button is selected.
@@ -508,16 +556,98 @@ class RadioButton(HTMLElement):
         return self._impl.is_selected()
 
 
+class Table(HTMLElement):
+    """
+    Lets you identify a table (HTML ``<table>`` element) on a web page and read
+    its contents. A table can be identified by its caption, by the text of one
+    of its column headers or by a label such as a heading above it::
+
+            Table("User email addresses").to_records()
+
+    This returns one dictionary per row, which maps the table's column headers
+    to the row's cell values. To read a single column, use
+    :py:func:`Table.column`::
+
+            Table("Email").column("Email")
+
+    The contents of the table are read with a single script call, instead of
+    one call per cell. Cells that span several rows or columns (``rowspan`` /
+    ``colspan``) are repeated in each position they occupy, so all rows are
+    aligned with the column headers. Very large tables are read in chunks of
+    rows, see :py:func:`Table.iter_rows`.
+
+    When there are multiple occurrences of a table on a page, you can
+    disambiguate between them using the keyword parameters ``below``,
+    ``to_right_of``, ``above`` and ``to_left_of``. For instance::
+
+            Table(below="Table no. 2").rows()
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self, label=None, below=None, to_right_of=None, above=None, to_left_of=None
+    ):
+        super(Table, self).__init__(
+            below=below, to_right_of=to_right_of, above=above, to_left_of=to_left_of
+        )
+        self._args.append(label)
+
+    @property
+    @traced
+    def headers(self):
+        """
+        Returns the column headers of this table as a list of strings. If the
+        table has several header rows, then the last one is used.
+        """
+        return self._impl.headers
+
+    @traced
+    def rows(self):
+        """
+        Returns the body rows of this table (ie. without the header rows), as
+        a list of lists of cell texts.
+        """
+        return self._impl.rows()
+
+    def iter_rows(self, chunk_size=1000):
+        """
+        Like :py:func:`Table.rows`, but fetches the rows from the browser in
+        chunks of ``chunk_size`` rows and yields them one by one. This is
+        useful for processing very large tables without reading them into
+        memory all at once.
+        """
+        return self._impl.iter_rows(chunk_size)
+
+    @traced
+    def column(self, header):
+        """
+        Returns the cell texts of the column with the given header.
+        """
+        return self._impl.column(header)
+
+    @traced
+    def to_records(self):
+        """
+        Returns the body rows of this table as a list of dictionaries that map
+        the table's column headers to the cell values of each row.
+        """
+        return self._impl.to_records()
+
+
 class Window(GUIElement):
     """
     Lets you identify individual windows of the currently open browser session.
     """
 
+    __slots__ = ()
+
     def __init__(self, title=None):
         super(Window, self).__init__()
         self._args.append(title)
 
     @property
+    @traced
     def title(self):
         """
         Returns the title of this Window.
@@ -525,6 +655,7 @@ class Window(GUIElement):
         return self._impl.title
 
     @property
+    @traced
     def handle(self):
         """
         Returns the Selenium driver window handle assigned to this window. Note
@@ -546,17 +677,21 @@ class Alert(GUIElement):
     Lets you identify and interact with JavaScript alert boxes.
     """
 
+    __slots__ = ()
+
     def __init__(self, search_text=None):
         super(Alert, self).__init__()
         self._args.append(search_text)
 
     @property
+    @traced
     def text(self):
         """
         The text displayed in the alert box.
         """
         return self._impl.text
 
+    @traced
     def accept(self):
         """
         Accepts this alert. This typically corresponds to clicking the "OK"
@@ -568,6 +703,7 @@ class Alert(GUIElement):
         """
         self._impl.accept()
 
+    @traced
     def dismiss(self):
         """
         Dismisses this alert. This typically corresponds to clicking the
@@ -600,6 +736,8 @@ class Point(namedtuple("Point", ["x", "y"])):
             Point(x=10, y=15)
     """
 
+    __slots__ = ()
+
     def __new__(cls, x=0, y=0):
         return cls.__bases__[0].__new__(cls, x, y)
 
@@ -645,3 +783,24 @@ class Point(namedtuple("Point", ["x", "y"])):
     def __rsub__(self, delta):
         x, y = delta
         return Point(x - self.x, y - self.y)
+
+
+# Maps the GUI element classes above to their implementations:
+_IMPL_CLASSES = {
+    cls: getattr(helium3._impl, cls.__name__ + "Impl")
+    for cls in (
+        S,
+        Text,
+        Link,
+        ListItem,
+        Button,
+        Image,
+        TextField,
+        ComboBox,
+        CheckBox,
+        RadioButton,
+        Table,
+        Window,
+        Alert,
+    )
+}
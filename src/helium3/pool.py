@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+from contextlib import contextmanager
+from queue import Empty
+from queue import Queue
+
+from selenium.common.exceptions import TimeoutException
+
+from helium3._impl.reset import reset_browser
+from helium3.api import start_chrome
+from helium3.browser import Browser
+
+
+class BrowserPool:
+    """
+    :param size: The number of browsers to keep running.
+    :param start: A function that starts a browser, eg.
+                  ``lambda: start_firefox(headless=True)``. It is called inside
+                  a ``with`` block of a new :py:class:`Browser`. The default
+                  starts a headless Chrome.
+    :param max_uses: After how many leases a browser is replaced by a new one.
+    :param max_memory_mb: Replace a browser when its processes use more than
+                          this many megabytes of memory. Requires ``psutil``.
+                          With ``start_chrome(shared_service=True)``, only
+                          the processes of the browser itself are counted.
+
+    Keeps ``size`` browsers running, so that jobs don't have to wait for one
+    to start. Starting a browser takes seconds; :py:meth:`lease` usually
+    returns immediately::
+
+        pool = BrowserPool(size=4)
+
+        def job(url):
+            with pool.lease() as browser:
+                go_to(url)
+                click("Accept cookies")
+
+        with ThreadPoolExecutor(4) as executor:
+            executor.map(job, urls)
+        pool.close()
+
+    Inside the ``with pool.lease()`` block, the leased :py:class:`Browser` is
+    the current thread's default. At the end of the block, the pool resets the
+    browser in the background: It closes all windows but one, deletes cookies
+    and web storage and navigates to ``about:blank``. If this fails, or the
+    browser has reached ``max_uses`` or ``max_memory_mb``, the pool quits it in
+    the background and starts a new one.
+
+    WebDriver can only delete the data of the current page's origin. The pool
+    therefore deletes the data of the origins open in a window and those
+    opened with :py:func:`go_to`. In Chrome, it deletes all cookies, and all
+    data of these origins, including IndexedDB databases and service workers.
+    In Firefox, it only deletes the cookies and web storage of these origins.
+    The storage of other origins, for instance of iframes or of pages you left
+    after reaching them by clicking a link, may survive a lease. In Firefox,
+    this also applies to their cookies. If jobs must not share any data, use
+    ``max_uses=1``.
+    """
+
+    def __init__(self, size=4, start=None, max_uses=100, max_memory_mb=None):
+        if size < 1:
+            raise ValueError("Invalid size %r. Must be at least 1." % size)
+        if max_memory_mb is not None:
+            # Fail now rather than when the first browser is released:
+            import psutil  # noqa: F401
+        self._start = _start_headless_chrome if start is None else start
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self._idle = Queue()
+        self._num_uses = {}
+        self._closed = False
+        # Importing concurrent.futures takes long. Only do it when needed:
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(size)
+        for _ in range(size):
+            self._executor.submit(self._add_browser)
+
+    @contextmanager
+    def lease(self, timeout_secs=None):
+        """
+        Returns a context manager that waits for a browser to become available
+        and yields it. Raises ``TimeoutException`` if none becomes available
+        within ``timeout_secs``.
+        """
+        browser = self._acquire(timeout_secs)
+        try:
+            with browser:
+                yield browser
+        finally:
+            if self._closed:
+                _quit(browser)
+            else:
+                self._executor.submit(self._recycle, browser)
+
+    def close(self):
+        """
+        Quits all browsers of the pool. Browsers that are leased are quit when
+        they are released.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._closed = True
+        # Wait for browsers that are still starting or being reset:
+        self._executor.shutdown(wait=True)
+        browsers = []
+        while not self._idle.empty():
+            browser = self._idle.get_nowait()
+            if isinstance(browser, Browser):
+                browsers.append(browser)
+        with ThreadPoolExecutor(len(browsers) or 1) as executor:
+            executor.map(_quit, browsers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _acquire(self, timeout_secs):
+        if self._closed:
+            raise RuntimeError("This BrowserPool has been closed.")
+        try:
+            browser = self._idle.get(timeout=timeout_secs)
+        except Empty:
+            raise TimeoutException(
+                "No browser became available within %s seconds." % timeout_secs
+            ) from None
+        if isinstance(browser, Exception):
+            # Starting a browser failed. Try again for the next lease:
+            if not self._closed:
+                self._executor.submit(self._add_browser)
+            raise browser
+        return browser
+
+    def _add_browser(self):
+        browser = Browser()
+        try:
+            with browser:
+                self._start()
+        except Exception as e:
+            self._idle.put(e)
+        else:
+            self._num_uses[browser] = 0
+            self._idle.put(browser)
+
+    def _recycle(self, browser):
+        self._num_uses[browser] += 1
+        try:
+            is_reusable = not self._is_worn_out(browser)
+            if is_reusable:
+                reset_browser(browser._api_impl.require_driver())
+        except Exception:
+            # Eg. the browser was closed, crashed or an alert is open. Replace
+            # it. Raising would lose the error in the executor, and the pool
+            # would never fill the browser's slot again.
+            is_reusable = False
+        if is_reusable:
+            self._idle.put(browser)
+            return
+        del self._num_uses[browser]
+        # Start the replacement first, so it is available as soon as possible:
+        if not self._closed:
+            self._add_browser()
+        _quit(browser)
+
+    def _is_worn_out(self, browser):
+        if self._num_uses[browser] >= self.max_uses:
+            return True
+        if self.max_memory_mb is not None:
+            return _get_memory_mb(browser) > self.max_memory_mb
+        return False
+
+
+def _start_headless_chrome():
+    start_chrome(headless=True)
+
+
+def _quit(browser):
+    try:
+        browser.kill_browser()
+    except Exception:
+        # Eg. the browser already crashed.
+        pass
+
+
+def _get_memory_mb(browser):
+    import psutil
+
+    driver = browser.get_driver()
+    service = getattr(driver, "service", None)
+    if service is None or service.process is None:
+        # A remote browser. We can't measure its memory.
+        return 0
+    try:
+        driver_process = psutil.Process(service.process.pid)
+        if getattr(service, "is_shared", False):
+            # Only count this browser, not the driver and its other browsers:
+            processes = _get_browser_processes(driver_process, driver.capabilities)
+        else:
+            processes = [driver_process] + driver_process.children(recursive=True)
+        return sum(process.memory_info().rss for process in processes) / 2**20
+    except psutil.Error:
+        return 0
+
+
+def _get_browser_processes(driver_process, capabilities):
+    """
+    Returns the processes of the Chrome with the given capabilities that the
+    given chromedriver process started. They are told apart from its other
+    browsers by their user data directory.
+    """
+    user_data_dir = capabilities.get("chrome", {}).get("userDataDir")
+    if not user_data_dir:
+        return []
+    user_data_dir_arg = "--user-data-dir=" + user_data_dir
+    for process in driver_process.children():
+        if user_data_dir_arg in process.cmdline():
+            return [process] + process.children(recursive=True)
+    return []
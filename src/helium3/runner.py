@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Runs a Helium function over many inputs, with one browser per process. For
+example::
+
+    from helium3 import *
+    from helium3.runner import run
+
+    def get_title(url):
+        go_to(url)
+        return get_driver().title
+
+    if __name__ == "__main__":
+        stats = run(get_title, urls, sink=print, num_workers=8)
+        print(stats)
+
+The same is available from the command line. It reads one input per line and
+writes one JSON result per line::
+
+    python -m helium3.runner my_module:get_title --workers 8 < urls.txt
+"""
+
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from collections import deque
+from collections import namedtuple
+from importlib import import_module
+from multiprocessing import Pipe
+from multiprocessing import Process
+from multiprocessing.connection import wait
+from time import perf_counter
+from traceback import format_exc
+
+from helium3.api import get_driver
+from helium3.api import kill_browser
+from helium3.api import start_chrome
+
+JobResult = namedtuple("JobResult", ["input", "result", "error", "duration_secs"])
+JobResult.__doc__ = """
+The outcome of calling the job function for one input. ``error`` is the
+formatted traceback of the exception the function raised, or ``None``.
+"""
+
+
+class RunStats(
+    namedtuple(
+        "RunStats",
+        [
+            "num_succeeded",
+            "num_failed",
+            "duration_secs",
+            "latency_p50",
+            "latency_p90",
+            "latency_p99",
+        ],
+    )
+):
+    """
+    What :py:func:`run` did: How many jobs succeeded and failed, how long the
+    run took and percentiles of the time the individual jobs took, in
+    seconds.
+    """
+
+    __slots__ = ()
+
+    @property
+    def jobs_per_sec(self):
+        num_jobs = self.num_succeeded + self.num_failed
+        return num_jobs / self.duration_secs if self.duration_secs else 0
+
+    def __str__(self):
+        return (
+            "%d succeeded, %d failed in %.1fs (%.1f jobs/s). Latency: "
+            "p50 %.2fs, p90 %.2fs, p99 %.2fs"
+            % (
+                self.num_succeeded,
+                self.num_failed,
+                self.duration_secs,
+                self.jobs_per_sec,
+                self.latency_p50,
+                self.latency_p90,
+                self.latency_p99,
+            )
+        )
+
+
+def run(
+    job, inputs, sink=None, num_workers=None, start=None, retries=1, pin_cpus=False
+):
+    """
+    :param job: A function that takes one input and returns a result. It uses
+                Helium's functions as usual; each process has its own browser.
+                It must be picklable, ie. defined at the top level of a module.
+    :param inputs: An iterable of picklable inputs.
+    :param sink: A function that is called with a :py:data:`JobResult` for
+                 each input, in the order the jobs finish.
+    :param num_workers: The number of processes. Defaults to the number of
+                        CPUs.
+    :param start: A function that starts the browser of a process. Defaults to
+                  ``start_chrome(headless=True)``.
+    :param retries: How often to retry an input whose job raised an exception.
+                    Before retrying, the browser is restarted if it no longer
+                    responds.
+    :param pin_cpus: Whether to pin each process and its browser to one CPU
+                     (Linux only).
+
+    Calls ``job`` for each input in a pool of processes, each with its own
+    browser, and returns :py:class:`RunStats`. A process only receives its
+    next input when it has finished the previous one, so ``inputs`` is read
+    no faster than the jobs complete. If a process crashes, its current job
+    fails and a new process takes its place. If a process can't start its
+    browser, a new process tries again. After three failed attempts in a row,
+    the process is given up. If that leaves no processes while there are
+    still inputs, a ``RuntimeError`` is raised.
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    cpus = _get_cpus() if pin_cpus else []
+    start_time = perf_counter()
+    inputs = iter(inputs)
+    # Inputs that could not be sent to a worker because it had crashed:
+    unsent_inputs = deque()
+    inputs_exhausted = False
+    workers = [
+        _Worker(job, start, retries, cpus[i % len(cpus)] if cpus else None)
+        for i in range(num_workers)
+    ]
+    latencies = []
+    num_failed = 0
+    try:
+        while workers:
+            ready = wait(
+                [worker.connection for worker in workers]
+                + [worker.process.sentinel for worker in workers]
+            )
+            for worker in list(workers):
+                if (
+                    worker.connection not in ready
+                    and worker.process.sentinel not in ready
+                ):
+                    continue
+                try:
+                    kind, payload = worker.connection.recv()
+                except EOFError:
+                    kind, payload = "crashed", worker.get_crash_result()
+                if kind == "error":
+                    # The browser did not start. Try again in a new process,
+                    # unless this keeps happening:
+                    num_start_failures = worker.num_start_failures + 1
+                    if num_start_failures < _MAX_START_ATTEMPTS:
+                        _replace(workers, worker, worker.restart(num_start_failures))
+                        continue
+                    worker.terminate()
+                    workers.remove(worker)
+                    if not workers and (unsent_inputs or not inputs_exhausted):
+                        raise RuntimeError("Could not start the browser:\n" + payload)
+                    continue
+                if payload is not None:
+                    latencies.append(payload.duration_secs)
+                    num_failed += payload.error is not None
+                    if sink is not None:
+                        sink(payload)
+                if kind == "crashed":
+                    # The new process asks for input once its browser is ready.
+                    _replace(workers, worker, worker.restart())
+                    continue
+                if unsent_inputs:
+                    input_ = unsent_inputs.popleft()
+                else:
+                    try:
+                        input_ = next(inputs)
+                    except StopIteration:
+                        inputs_exhausted = True
+                        worker.stop()
+                        workers.remove(worker)
+                        continue
+                try:
+                    worker.send(input_)
+                except OSError:
+                    # Eg. BrokenPipeError because the process just crashed.
+                    # Another process handles the input:
+                    unsent_inputs.append(input_)
+                    _replace(workers, worker, worker.restart())
+    finally:
+        for worker in workers:
+            worker.terminate()
+    latencies.sort()
+    return RunStats(
+        len(latencies) - num_failed,
+        num_failed,
+        perf_counter() - start_time,
+        _get_percentile(latencies, 50),
+        _get_percentile(latencies, 90),
+        _get_percentile(latencies, 99),
+    )
+
+
+# How often a process tries to start its browser before it gives up:
+_MAX_START_ATTEMPTS = 3
+
+
+def _replace(workers, worker, new_worker):
+    workers[workers.index(worker)] = new_worker
+
+
+class _Worker:
+    """
+    A process with its own browser. It receives one input at a time through a
+    pipe and sends back a JobResult for each.
+    """
+
+    def __init__(self, job, start, retries, cpu, num_start_failures=0):
+        self._args = (job, start, retries, cpu)
+        # How often the browser failed to start in the processes before:
+        self.num_start_failures = num_start_failures
+        self.connection, child_connection = Pipe()
+        self.process = Process(
+            target=_work, args=(child_connection,) + self._args, daemon=True
+        )
+        self.process.start()
+        # Only the child should hold its end, so we notice when it exits:
+        child_connection.close()
+        self._current_input = None
+        self._sent_time = None
+
+    def send(self, input_):
+        self.connection.send(("job", input_))
+        self._current_input = input_
+        self._sent_time = perf_counter()
+
+    def get_crash_result(self):
+        if self._sent_time is None:
+            return None
+        duration_secs = perf_counter() - self._sent_time
+        self.process.join()
+        error = "Worker process exited with code %r." % self.process.exitcode
+        return JobResult(self._current_input, None, error, duration_secs)
+
+    def restart(self, num_start_failures=0):
+        self.terminate()
+        return _Worker(*self._args, num_start_failures=num_start_failures)
+
+    def stop(self):
+        try:
+            self.connection.send(("stop", None))
+        except OSError:
+            # The process has already exited.
+            pass
+        self.process.join()
+        self.connection.close()
+
+    def terminate(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+def _work(connection, job, start, retries, cpu):
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    start = start or _start_headless_chrome
+    try:
+        start()
+    except Exception:
+        connection.send(("error", format_exc()))
+        return
+    try:
+        connection.send(("ready", None))
+        while True:
+            command, input_ = connection.recv()
+            if command == "stop":
+                break
+            connection.send(("done", _run_job(job, input_, start, retries)))
+    finally:
+        _kill_browser()
+
+
+def _run_job(job, input_, start, retries):
+    start_time = perf_counter()
+    for _ in range(retries + 1):
+        try:
+            result = job(input_)
+        except Exception:
+            error = format_exc()
+            if not _is_browser_alive():
+                _kill_browser()
+                start()
+        else:
+            return JobResult(input_, result, None, perf_counter() - start_time)
+    return JobResult(input_, None, error, perf_counter() - start_time)
+
+
+def _start_headless_chrome():
+    start_chrome(headless=True)
+
+
+def _is_browser_alive():
+    try:
+        get_driver().current_window_handle
+    except Exception:
+        return False
+    return True
+
+
+def _kill_browser():
+    try:
+        kill_browser()
+    except Exception:
+        pass
+
+
+def _get_cpus():
+    if not hasattr(os, "sched_getaffinity"):
+        raise ValueError("pin_cpus=True is only supported on Linux.")
+    return sorted(os.sched_getaffinity(0))
+
+
+def _get_percentile(sorted_values, percentile):
+    if not sorted_values:
+        return 0
+    index = round(percentile / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("job", help="The job function, as module:function.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--pin-cpus", action="store_true")
+    args = parser.parse_args()
+    module_name, function_name = args.job.split(":")
+    sys.path.insert(0, os.getcwd())
+    job = getattr(import_module(module_name), function_name)
+    inputs = (line.rstrip("\n") for line in sys.stdin)
+
+    def sink(job_result):
+        print(json.dumps(job_result._asdict(), default=repr), flush=True)
+
+    stats = run(
+        job,
+        inputs,
+        sink,
+        num_workers=args.workers,
+        retries=args.retries,
+        pin_cpus=args.pin_cpus,
+    )
+    print(stats, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
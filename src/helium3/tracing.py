@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+from collections import deque
+from random import random
+from threading import current_thread
+from threading import get_ident
+
+from helium3._impl import tracing
+
+
+class Tracer:
+    """
+    :param path: A file to write the trace to when the tracer stops.
+    :param sample_rate: The fraction of Helium's API calls to record, between
+                        0 and 1. Calls that are not sampled cost almost
+                        nothing.
+    :param max_events: How many events to keep. When there are more, the
+                       oldest ones are discarded.
+
+    Records how long Helium's API calls take and what they spend the time on:
+    The search in each frame, fetching the positions of elements, sorting
+    them, retries, the action itself, detecting new windows and each command
+    sent to the browser. For example::
+
+        with Tracer("trace.json"):
+            start_chrome("github.com/login")
+            write("user", into="Username")
+            click("Sign in")
+
+    The trace is in Chrome's trace event format. To view it, open it in
+    https://ui.perfetto.dev or ``chrome://tracing``.
+
+    To trace a long-running process, record a small fraction of the calls and
+    save the trace from time to time::
+
+        tracer = Tracer(sample_rate=0.01)
+        tracer.start()
+        ...
+        tracer.save("trace.json")
+    """
+
+    def __init__(self, path=None, sample_rate=1.0, max_events=100000):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(
+                "Invalid sample_rate %r. Must be between 0 and 1." % sample_rate
+            )
+        self.path = path
+        self.sample_rate = sample_rate
+        self._events = deque(maxlen=max_events)
+        self._thread_names = {}
+
+    def start(self):
+        """
+        Starts recording. Spans that are already in progress are not recorded.
+        """
+        tracing.add_listener(self)
+
+    def stop(self):
+        """
+        Stops recording and writes the trace to ``path``, if given.
+        """
+        tracing.remove_listener(self)
+        if self.path is not None:
+            self.save(self.path)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def get_events(self):
+        """
+        Returns the recorded events, as dictionaries in Chrome's trace event
+        format.
+        """
+        pid = os.getpid()
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in list(self._thread_names.items())
+        ]
+        return metadata + list(self._events)
+
+    def save(self, path):
+        """
+        Writes the recorded events to the given file, as JSON.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.get_events()}, f)
+
+    def accepts(self, span):
+        return self.sample_rate == 1 or random() < self.sample_rate
+
+    def span_started(self, span):
+        pass
+
+    def span_finished(self, span):
+        tid = get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = current_thread().name
+        # deque.append(...) is thread-safe:
+        self._events.append(
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": span.args,
+            }
+        )
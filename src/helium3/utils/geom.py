@@ -4,6 +4,8 @@ from math import sqrt
 
 
 class Rectangle:
+    __slots__ = ("left", "top", "right", "bottom")
+
     def __init__(self, left=0, top=0, width=0, height=0):
         self.left = left
         self.top = top
@@ -174,6 +176,8 @@ class Rectangle:
 
 
 class Point(namedtuple("Point", ["x", "y"])):
+    __slots__ = ()
+
     def __new__(cls, x=0, y=0):
         return cls.__bases__[0].__new__(cls, x, y)
 
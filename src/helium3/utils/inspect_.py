@@ -9,7 +9,7 @@ def repr_args(f, args=None, kwargs=None, repr_fn=repr):
         args = []
     if kwargs is None:
         kwargs = {}
-    arg_names, _, _, defaults = inspect.getfullargspec(f)[:4]
+    arg_names, defaults = _get_arg_names_and_defaults(getattr(f, "__func__", f))
     if is_bound(f):
         # Skip 'self' parameter:
         arg_names = arg_names[1:]
@@ -38,3 +38,17 @@ def repr_args(f, args=None, kwargs=None, repr_fn=repr):
         if kwarg not in arg_names:
             result.append(kwarg + "=" + repr_fn(kwargs[kwarg]))
     return ", ".join(result)
+
+
+# Caches inspect.getfullargspec(...), which is slow, by function:
+_ARG_NAMES_AND_DEFAULTS = {}
+
+
+def _get_arg_names_and_defaults(f):
+    try:
+        return _ARG_NAMES_AND_DEFAULTS[f]
+    except KeyError:
+        # See through decorators such as @traced, which take (*args, **kwargs):
+        arg_names, _, _, defaults = inspect.getfullargspec(inspect.unwrap(f))[:4]
+        result = _ARG_NAMES_AND_DEFAULTS[f] = (arg_names, defaults)
+        return result
@@ -18,3 +18,43 @@ def predicate(condition):
 
 def predicate_or(*conditions):
     return predicate(" or ".join([c for c in conditions if c]))
+
+
+def make_relative(xpath):
+    """
+    Rewrites the absolute location paths in the given XPath, so that
+    evaluating it at each child of a root node (eg. a shadow root) finds the
+    nodes below that root which the XPath would find in a document. Eg.
+    "//a | /html" becomes "descendant-or-self::a | self::html". Paths inside
+    predicates and string literals are left as they are.
+    """
+    result = []
+    depth = 0
+    quote = None
+    is_path_start = True
+    i = 0
+    while i < len(xpath):
+        char = xpath[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "/" and is_path_start:
+            if xpath[i + 1 : i + 2] == "/":
+                result.append("descendant-or-self::")
+                i += 2
+            else:
+                result.append("self::")
+                i += 1
+            is_path_start = False
+            continue
+        result.append(char)
+        if not char.isspace():
+            is_path_start = not quote and depth == 0 and char in "|("
+        i += 1
+    return "".join(result)
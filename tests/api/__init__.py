@@ -70,9 +70,8 @@ def tearDownModule():
     _TEST_BROWSER = None
 
 
-def start_browser(url=None):
+def start_browser(url=None, **kwargs):
     browser_name = test_browser_name()
-    kwargs = {}
     if browser_name in ("chrome", "firefox"):
         kwargs["headless"] = True
     return _TEST_BROWSERS[browser_name](url, **kwargs)
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from asyncio import gather
+from unittest import IsolatedAsyncioTestCase
+
+from helium3 import S
+from helium3.aio import AsyncBrowser
+from tests.api import start_browser
+from tests.api.util import get_data_file_url
+
+
+class AsyncBrowserTest(IsolatedAsyncioTestCase):
+    async def test_browsers_run_concurrently(self):
+        results = await gather(*(self._click_in_new_browser() for _ in range(3)))
+        self.assertEqual(["Success!"] * 3, results)
+
+    async def _click_in_new_browser(self):
+        async with AsyncBrowser() as browser:
+            await browser.call(start_browser)
+            await browser.go_to(get_data_file_url("test_click.html"))
+            await browser.click(browser.Button("Click me!"))
+            await browser.wait_until(browser.Text("Success!").exists)
+            return await browser.call(lambda: S("#result").web_element.text)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from helium3 import BatchError
+from helium3 import ComboBox
+from helium3 import Config
+from helium3 import TextField
+from helium3 import batch
+from helium3 import click
+from helium3 import scroll_down
+from helium3 import scroll_right
+from helium3 import select
+from helium3 import write
+from helium3.utils.lang import TemporaryAttrValue
+from tests.api import BrowserAT
+
+
+class BatchTest(BrowserAT):
+    def get_page(self):
+        return "test_batch.html"
+
+    def test_actions_are_performed_at_end_of_batch(self):
+        with batch():
+            click("First")
+            self.assertEqual("", self._get_result())
+        self.assertEqual("first", self._get_result())
+
+    def test_clicks_are_performed_in_order(self):
+        with batch():
+            click("Second")
+            click("First")
+            click("Second")
+        self.assertEqual("second, first, second", self._get_result())
+
+    def test_click_revealing_next_target(self):
+        with batch():
+            click("Menu")
+            click("Item")
+        self.assertEqual("menu, item", self._get_result())
+
+    def test_click_out_of_view(self):
+        with batch():
+            click("First")
+            click("Bottom")
+        self.assertEqual("first, bottom", self._get_result())
+
+    def test_write_select_and_click(self):
+        with batch():
+            write("John", into="Name")
+            select("Color", "Green")
+            click("First")
+        self.assertEqual("John", TextField("Name").value)
+        self.assertEqual("Green", ComboBox("Color").value)
+        self.assertIn("selected green", self._get_result())
+        self.assertTrue(self._get_result().endswith("first"))
+
+    def test_scrolls_are_combined(self):
+        with batch():
+            scroll_down(100)
+            scroll_down(50)
+            scroll_right(70)
+        self.assertEqual(150, self._get_scroll_position("pageYOffset"))
+        self.assertEqual(70, self._get_scroll_position("pageXOffset"))
+
+    def test_failed_step(self):
+        with TemporaryAttrValue(Config, "implicit_wait_secs", 1):
+            with self.assertRaises(BatchError) as context_manager:
+                with batch():
+                    click("First")
+                    click("Non-existent")
+                    click("Second")
+        error = context_manager.exception
+        self.assertEqual(
+            "Step 2 of 3, click('Non-existent'), failed: LookupError", str(error)
+        )
+        self.assertIsInstance(error.__cause__, LookupError)
+        self.assertEqual(["click('First')"], list(map(repr, error.completed_steps)))
+        self.assertEqual(["click('Second')"], list(map(repr, error.skipped_steps)))
+        self.assertEqual("first", self._get_result())
+
+    def test_nothing_is_performed_when_block_raises(self):
+        with self.assertRaises(ValueError):
+            with batch():
+                click("First")
+                raise ValueError()
+        self.assertEqual("", self._get_result())
+
+    def test_batches_cannot_be_nested(self):
+        with batch():
+            with self.assertRaises(RuntimeError):
+                with batch():
+                    pass
+
+    def _get_result(self):
+        return self.driver.find_element_by_id("result").get_attribute("innerHTML")
+
+    def _get_scroll_position(self, attribute):
+        return self.driver.execute_script("return window.%s;" % attribute)
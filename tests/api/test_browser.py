@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+
+from helium3 import Browser
+from helium3 import Button
+from helium3 import click
+from helium3 import go_to
+from helium3 import kill_browser
+from tests.api import BrowserAT
+from tests.api import start_browser
+
+
+class BrowserTest(BrowserAT):
+    def get_page(self):
+        return "test_click.html"
+
+    def setUp(self):
+        super().setUp()
+        self.browser = Browser()
+        with self.browser:
+            start_browser()
+        self.browser.go_to(self.get_url())
+
+    def tearDown(self):
+        self.browser.kill_browser()
+        super().tearDown()
+
+    def test_click(self):
+        self.browser.click(self.browser.Button("Click me!"))
+        self.assertEqual("Success!", self._read_result(self.browser))
+        self.assertEqual("", self._read_result(None))
+
+    def test_with_block(self):
+        with self.browser:
+            click(Button("Click me!"))
+        self.assertEqual("Success!", self._read_result(self.browser))
+        self.assertEqual("", self._read_result(None))
+
+    def test_browsers_in_threads(self):
+        def click_in_new_browser(_):
+            browser = Browser()
+            with browser:
+                start_browser()
+                try:
+                    go_to(self.get_url())
+                    click("Click me!")
+                    return self._read_result(browser)
+                finally:
+                    kill_browser()
+
+        with ThreadPoolExecutor(3) as executor:
+            results = list(executor.map(click_in_new_browser, range(3)))
+        self.assertEqual(["Success!"] * 3, results)
+
+    def _read_result(self, browser):
+        driver = self.driver if browser is None else browser.get_driver()
+        return driver.find_element_by_id("result").get_attribute("innerHTML")
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from helium3 import BrowserPool
+from helium3 import get_driver
+from helium3 import go_to
+from tests.api import start_browser
+from tests.api.util import get_data_file_url
+
+
+class BrowserPoolTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = BrowserPool(size=1, start=start_browser)
+
+    def test_resets_browser(self):
+        with self.pool.lease() as browser:
+            go_to(get_data_file_url("test_click.html"))
+            driver = get_driver()
+            driver.execute_script(
+                "localStorage.setItem('key', 'value'); window.open('');"
+            )
+            self.assertEqual(2, len(driver.window_handles))
+        with self.pool.lease() as browser_after:
+            self.assertIs(browser, browser_after)
+            self.assertEqual(1, len(driver.window_handles))
+            self.assertEqual("about:blank", driver.current_url)
+            go_to(get_data_file_url("test_click.html"))
+            self.assertIsNone(
+                driver.execute_script("return localStorage.getItem('key');")
+            )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
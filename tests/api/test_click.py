@@ -13,6 +13,12 @@ class ClickTest(BrowserAT):
         click("Click me!")
         self.assertEqual("Success!", self.read_result_from_browser())
 
+    def test_click_covered_element_clicks_element_on_top(self):
+        # Like a user, Helium clicks whatever element is at the position of the
+        # element that should be clicked:
+        click("Covered button")
+        self.assertEqual("Overlay clicked", self.read_result_from_browser())
+
     def test_click_non_existent_element(self):
         with TemporaryAttrValue(Config, "implicit_wait_secs", 1):
             with self.assertRaises(LookupError):
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from helium3 import Button
+from helium3 import CommandBudgetExceeded
+from helium3 import click
+from helium3 import command_budget
+from tests.api import BrowserAT
+
+
+class CommandBudgetTest(BrowserAT):
+    def get_page(self):
+        return "test_click.html"
+
+    def test_counts_commands_of_click(self):
+        with command_budget() as stats:
+            click("Click me!")
+            Button("Click me!").exists()
+        self.assertEqual(["click", "GUIElement.exists"], list(stats.by_call))
+        self.assertGreater(stats.num_commands, 0)
+        self.assertEqual(stats.num_commands, sum(stats.by_command.values()))
+
+    def test_budget_exceeded(self):
+        with self.assertRaises(CommandBudgetExceeded):
+            with command_budget(max_commands=1):
+                click("Click me!")
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from helium3 import *
+from helium3.utils.lang import TemporaryAttrValue
 from tests.api import BrowserAT
 
 
@@ -35,3 +36,13 @@ class Html5DragIT(BrowserAT):
     def test_html5_drag(self):
         drag("Drag me.", to=self.driver.find_element_by_id("target"))
         self.assertEqual("Success!", self.read_result_from_browser())
+
+    def test_html5_drag_to_point_in_viewport_mode(self):
+        with TemporaryAttrValue(Config, "point_mode", "viewport"):
+            x, y = self.driver.execute_script(
+                "var rect = arguments[0].getBoundingClientRect();"
+                "return [rect.left + rect.width / 2, rect.top + rect.height / 2];",
+                self.driver.find_element_by_id("target"),
+            )
+            drag("Drag me.", to=Point(x, y))
+        self.assertEqual("Success!", self.read_result_from_browser())
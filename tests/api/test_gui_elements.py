@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from selenium.common.exceptions import NoSuchElementException
+
 from helium3 import (Button, CheckBox, ComboBox, Config, Image, Link, ListItem,
                      RadioButton, Text, TextField, click, find_all, select,
                      write)
@@ -160,6 +162,15 @@ class GUIElementsTest(BrowserAT):
         select(ComboBox("Drop Down List"), "Option Three")
         self.assertEqual("Option Three", ComboBox("Drop Down List").value)
 
+    def test_select_fires_change_event(self):
+        select("Drop Down List", "Option Two")
+        combo_box = ComboBox("Drop Down List").web_element
+        self.assertEqual("Option Two", combo_box.get_attribute("data-changed-to"))
+
+    def test_select_nonexistent_value(self):
+        with self.assertRaises(NoSuchElementException):
+            select("Drop Down List", "Option Four")
+
     def test_combo_box_identified_by_value(self):
         combo_box = ComboBox("Select a value...")
         self.assertTrue(combo_box.exists())
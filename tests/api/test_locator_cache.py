@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+from tempfile import TemporaryDirectory
+
+from helium3 import Button, Config, TextField, write
+from helium3._impl.locator_cache import get_locator_cache
+from helium3.utils.lang import TemporaryAttrValue
+from tests.api import BrowserAT
+
+
+class LocatorCacheTest(BrowserAT):
+    def get_page(self):
+        return "test_locator_cache.html"
+
+    def setUp(self):
+        super(LocatorCacheTest, self).setUp()
+        self.temp_dir = TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "locators.sqlite")
+        self.cache_path = TemporaryAttrValue(Config, "locator_cache", self.path)
+        self.cache_path.__enter__()
+
+    def test_remembers_selectors(self):
+        write("John", into="Name")
+        Button("Submit").exists()
+        self.assertEqual(
+            {"#name", "#form > div:nth-of-type(1) > button:nth-of-type(1)"},
+            set(self._get_cached_selectors()),
+        )
+
+    def test_finds_cached_element(self):
+        Button("Submit").exists()
+        self.assertEqual("Submit", Button("Submit").web_element.text)
+
+    def test_falls_back_to_full_search_when_page_changed(self):
+        Button("Submit").exists()
+        self.driver.execute_script(
+            "var form = document.getElementById('form');"
+            "form.querySelector('button').textContent = 'Cancel';"
+            "var button = document.createElement('button');"
+            "button.id = 'submit';"
+            "button.textContent = 'Submit';"
+            "form.insertBefore(button, form.firstChild);"
+        )
+        self.assertEqual("submit", Button("Submit").web_element.get_attribute("id"))
+        self.assertIn("#submit", self._get_cached_selectors())
+
+    def _get_cached_selectors(self):
+        connection = sqlite3.connect(self.path)
+        try:
+            return [
+                row[0] for row in connection.execute("SELECT selector FROM locators")
+            ]
+        finally:
+            connection.close()
+
+    def tearDown(self):
+        self.cache_path.__exit__(None, None, None)
+        connection = get_locator_cache(self.path)._connection
+        if connection is not None:
+            connection.close()
+        self.temp_dir.cleanup()
+        super(LocatorCacheTest, self).tearDown()
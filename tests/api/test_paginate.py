@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+from helium3 import Button
+from helium3 import Config
+from helium3 import Link
+from helium3 import S
+from helium3 import Window
+from helium3 import find_all
+from helium3 import get_driver
+from helium3 import go_to
+from helium3 import paginate
+from helium3.utils.lang import TemporaryAttrValue
+from tests.api import BrowserAT
+from tests.api.util import get_data_file_url
+
+
+class PaginateTest(BrowserAT):
+    def get_page(self):
+        return "test_paginate_1.html"
+
+    def test_paginate(self):
+        results = paginate(next=Link("Next"), items=S(".result"))
+        self.assertEqual(
+            ["Result %d" % i for i in range(1, 7)],
+            [result.web_element.text for result in results],
+        )
+        self.assertEqual("test_paginate_3", Window().title)
+        self.assertEqual(1, len(get_driver().window_handles))
+
+    def test_original_tab_is_kept(self):
+        handle = get_driver().current_window_handle
+        list(paginate(next=Link("Next"), items=S(".result")))
+        self.assertEqual([handle], get_driver().window_handles)
+        self.assertEqual(handle, get_driver().current_window_handle)
+
+    def test_original_tab_is_kept_when_stopping_early(self):
+        handle = get_driver().current_window_handle
+        results = paginate(next=Link("Next"), items=S(".result"))
+        for result in results:
+            if result.web_element.text == "Result 3":
+                break
+        results.close()
+        self.assertEqual([handle], get_driver().window_handles)
+        self.assertEqual("test_paginate_2", Window().title)
+
+    def test_prefetch_window_is_hidden(self):
+        results = paginate(next=Link("Next"), items=S(".result"))
+        next(results)
+        self.assertEqual(2, len(get_driver().window_handles))
+        self.assertEqual(1, len(find_all(Window())))
+        self.assertEqual("test_paginate_1", Window().title)
+        results.close()
+        self.assertEqual(1, len(get_driver().window_handles))
+
+    def test_paginate_with_string(self):
+        results = paginate(next="Next", items=S(".result"))
+        self.assertEqual(6, len(list(results)))
+
+    def test_last_page(self):
+        go_to(get_data_file_url("test_paginate_3.html"))
+        results = paginate(next=Link("Next"), items=S(".result"))
+        self.assertEqual(
+            ["Result 5", "Result 6"], [r.web_element.text for r in results]
+        )
+
+
+class PaginateAjaxTest(BrowserAT):
+    def get_page(self):
+        return "test_paginate_ajax.html"
+
+    def test_paginate(self):
+        results = paginate(next=Button("More"), items=S(".result"))
+        self.assertEqual(
+            ["Result %d" % i for i in range(1, 7)],
+            [result.web_element.text for result in results],
+        )
+        self.assertEqual(1, len(get_driver().window_handles))
+
+
+class PaginateDisabledTest(BrowserAT):
+    def get_page(self):
+        return "test_paginate_disabled.html"
+
+    def test_link_without_href(self):
+        results = paginate(next=Link("Next"), items=S(".result"))
+        self.assertEqual(2, len(list(results)))
+
+    def test_disabled_button(self):
+        results = paginate(next=Button("More"), items=S(".result"))
+        self.assertEqual(2, len(list(results)))
+
+    def test_button_without_effect(self):
+        with TemporaryAttrValue(Config, "implicit_wait_secs", 1):
+            results = paginate(next=Button("Reload"), items=S(".result"))
+            self.assertEqual(2, len(list(results)))
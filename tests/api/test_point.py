@@ -2,6 +2,7 @@
 from re import search
 
 from helium3 import Button
+from helium3 import Config
 from helium3 import Point
 from helium3 import click
 from helium3 import doubleclick
@@ -144,3 +145,18 @@ class PointTest(BrowserAT):
 
     def _extract_offset(self, result_in_browser):
         return search(r"(\([^,]+, [^\)]+\))", result_in_browser).group(1)
+
+
+class PointViewportModeTest(PointTest):
+    """
+    Runs the tests above with the mouse moving straight to the points' coordinates.
+    """
+
+    def setUp(self):
+        self.point_mode_before = Config.point_mode
+        Config.point_mode = "viewport"
+        super().setUp()
+
+    def tearDown(self):
+        Config.point_mode = self.point_mode_before
+        super().tearDown()
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from helium3 import Config
+from helium3 import doubleclick
+from helium3 import right_click
+from helium3.utils.lang import TemporaryAttrValue
+from tests.api import BrowserAT
+
+
+class ScrollIntoViewTest(BrowserAT):
+    def get_page(self):
+        return "test_scroll_into_view.html"
+
+    def test_doubleclick_element_below_viewport(self):
+        doubleclick("Far below")
+        self.assertEqual("Doubleclicked!", self.read_result_from_browser())
+
+    def test_rightclick_element_below_viewport(self):
+        right_click("Far below")
+        self.assertEqual("Rightclicked!", self.read_result_from_browser())
+
+    def test_scroll_to_start(self):
+        with TemporaryAttrValue(Config, "scroll_into_view", "start"):
+            doubleclick("Far below")
+        self.assertEqual("Doubleclicked!", self.read_result_from_browser())
+        self.assertGreater(self._get_scroll_y(), 4900)
+
+    def _get_scroll_y(self):
+        return self.driver.execute_script("return window.pageYOffset;")
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from helium3 import Button
+from helium3 import CheckBox
+from helium3 import Config
+from helium3 import Link
+from helium3 import S
+from helium3 import Text
+from helium3 import TextField
+from helium3 import click
+from helium3 import write
+from helium3.utils.lang import TemporaryAttrValue
+from tests.api import BrowserAT
+
+
+class ShadowDomTest(BrowserAT):
+    def get_page(self):
+        return "test_shadow_dom.html"
+
+    def setUp(self):
+        super().setUp()
+        self.search_shadow_dom = TemporaryAttrValue(Config, "search_shadow_dom", True)
+        self.search_shadow_dom.__enter__()
+
+    def tearDown(self):
+        self.search_shadow_dom.__exit__()
+        super().tearDown()
+
+    def test_text_in_light_dom(self):
+        self.assertTrue(Text("Light DOM").exists())
+
+    def test_text_in_shadow_root(self):
+        self.assertTrue(Text("Outer shadow").exists())
+
+    def test_click_button_in_shadow_root(self):
+        click(Button("Outer button"))
+        self.assertEqual("Outer button clicked", self.read_result_from_browser())
+
+    def test_click_link_in_nested_shadow_root(self):
+        click(Link("Inner link"))
+        self.assertEqual("Inner link clicked", self.read_result_from_browser())
+
+    def test_write_into_text_field_in_nested_shadow_root(self):
+        write("john@example.com", into="Email")
+        self.assertEqual("john@example.com", TextField("Email").value)
+
+    def test_check_box_in_nested_shadow_root(self):
+        click(CheckBox("Subscribe"))
+        self.assertTrue(CheckBox("Subscribe").is_checked())
+
+    def test_relative_locator_in_shadow_root(self):
+        self.assertTrue(Link("Inner link", below="Outer button").exists())
+
+    def test_s_in_shadow_root(self):
+        self.assertTrue(S("#inner-host").exists())
+        self.assertTrue(S("@subscribe").exists())
+        self.assertTrue(S("//input[@id='email']").exists())
+
+    def test_closed_shadow_root_is_not_searched(self):
+        self.assertFalse(Text("Closed shadow").exists())
+
+    def test_shadow_root_is_not_searched_by_default(self):
+        with TemporaryAttrValue(Config, "search_shadow_dom", False):
+            self.assertFalse(Text("Outer shadow").exists())
@@ -2,7 +2,10 @@
 from os import path
 from unittest import TestCase
 
-from helium3 import go_to
+from selenium.common.exceptions import TimeoutException
+
+from helium3 import Config, Text, get_start_timings, go_to
+from helium3.utils.lang import TemporaryAttrValue
 from tests.api import start_browser
 from tests.api.util import get_data_file_url
 
@@ -26,6 +29,41 @@ class StartGoToTest(TestCase):
         self.driver = start_browser(self.url)
         self.assertUrlEquals(self.url, self.driver.current_url)
 
+    def test_start_timings(self):
+        self.driver = start_browser()
+        timings = get_start_timings()
+        self.assertEqual(["resolve", "session", "spawn"], sorted(timings))
+        self.assertTrue(all(duration >= 0 for duration in timings.values()))
+
+    def test_go_to_waits_for_element(self):
+        self.driver = start_browser(page_load_strategy="none")
+        go_to(self.url, wait=Text("Welcome"))
+        self.assertUrlEquals(self.url, self.driver.current_url)
+        self.assertTrue(Text("Welcome").exists())
+
+    def test_go_to_waits_for_load_event(self):
+        self.driver = start_browser(page_load_strategy="eager")
+        go_to(self.url, wait="load")
+        ready_state = self.driver.execute_script("return document.readyState;")
+        self.assertEqual("complete", ready_state)
+
+    def test_go_to_does_not_mistake_old_page_for_new_one(self):
+        self.driver = start_browser(self.url, page_load_strategy="none")
+        other_url = get_data_file_url("test_click.html")
+        go_to(other_url, wait="domcontentloaded")
+        self.assertEqual("test_click", self.driver.title)
+
+    def test_go_to_element_timeout(self):
+        self.driver = start_browser(page_load_strategy="none")
+        with TemporaryAttrValue(Config, "implicit_wait_secs", 1):
+            with self.assertRaises(TimeoutException):
+                go_to(self.url, wait=Text("Non-existent"))
+
+    def test_go_to_invalid_wait(self):
+        self.driver = start_browser()
+        with self.assertRaises(ValueError):
+            go_to(self.url, wait="complete")
+
     def tearDown(self):
         if self.driver is not None:
             self.driver.quit()
@@ -43,3 +43,70 @@ class TablesTest(BrowserAT):
         self.assertEqual(
             "Abdul", Text(below="Name", to_left_of="email2@domain.com").value
         )
+
+    def test_table_identified_by_label(self):
+        self.assertEqual(
+            ["Name", "Email", "Country"], Table("User email addresses").headers
+        )
+
+    def test_table_identified_by_header(self):
+        self.assertEqual(
+            ["email1@domain.com", "email2@domain.com", "email3@domain.com"],
+            Table("Email").column("Email"),
+        )
+
+    def test_table_rows(self):
+        self.assertEqual(
+            [
+                ["T2R1C1", "T2R1C2", "T2R1C3"],
+                ["T2R2C1", "T2R2C2", "T2R2C3"],
+                ["T2R3C1", "T2R3C2", "T2R3C3"],
+            ],
+            Table("T2H1").rows(),
+        )
+
+    def test_table_to_records(self):
+        self.assertEqual(
+            [
+                {"Name": "John", "Email": "email1@domain.com", "Country": "USA"},
+                {"Name": "Abdul", "Email": "email2@domain.com", "Country": "Yemen"},
+                {"Name": "Chang", "Email": "email3@domain.com", "Country": "China"},
+            ],
+            Table("Name").to_records(),
+        )
+
+    def test_table_iter_rows_in_chunks(self):
+        self.assertEqual(
+            ["T1R1C1", "T1R2C1", "T1R3C1"],
+            [row[0] for row in Table("T1H1").iter_rows(chunk_size=2)],
+        )
+
+    def test_table_column_not_found(self):
+        with self.assertRaises(LookupError):
+            Table("Name").column("Phone")
+
+
+class TableSpansTest(BrowserAT):
+    def get_page(self):
+        return "test_table_spans.html"
+
+    def test_table_identified_by_caption(self):
+        self.assertEqual(
+            ["Day", "Morning", "Afternoon"], Table("Opening hours").headers
+        )
+
+    def test_colspan_and_rowspan(self):
+        self.assertEqual(
+            [
+                ["Monday", "Closed", "Closed"],
+                ["Weekend", "9-12", "13-17"],
+                ["Weekend", "10-12", "-"],
+            ],
+            Table("Opening hours").rows(),
+        )
+
+    def test_rowspan_across_chunks(self):
+        self.assertEqual(
+            ["Monday", "Weekend", "Weekend"],
+            [row[0] for row in Table("Opening hours").iter_rows(chunk_size=1)],
+        )
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from helium3 import Tracer
+from helium3 import click
+from tests.api import BrowserAT
+
+
+class TracerTest(BrowserAT):
+    def get_page(self):
+        return "test_click.html"
+
+    def test_click(self):
+        with Tracer() as tracer:
+            click("Click me!")
+        events = [e for e in tracer.get_events() if e["ph"] == "X"]
+        names = [e["name"] for e in events]
+        self.assertEqual("click", names[-1])
+        for phase in ("attempt", "find_all_in_curr_frame", "hydrate", "action"):
+            self.assertIn(phase, names)
+        self.assertIn("webdriver", {e["cat"] for e in events})
@@ -18,3 +18,34 @@ class WriteTest(BrowserAT):
     def test_write_into_text_field_to_right_of(self):
         write("Hi there!", into=(TextField(to_right_of="Normal text field")))
         self.assertEqual("Hi there!", TextField("Normal text field").value)
+
+    def test_write_into_text_area_auto(self):
+        write("Hello\nWorld!", into="Text area", mode="auto")
+        self.assertEqual("Hello\nWorld!", TextField("Text area").value)
+        text_area = TextField("Text area").web_element
+        self.assertEqual("true", text_area.get_attribute("data-input"))
+
+    def test_write_into_text_area_types_by_default(self):
+        write("Hello", into="Text area")
+        self.assertEqual("Hello", TextField("Text area").value)
+        text_area = TextField("Text area").web_element
+        self.assertEqual("true", text_area.get_attribute("data-keydown"))
+
+    def test_write_replaces_text(self):
+        write("Hello", into="Text area", mode="insert")
+        write("World!", into="Text area", mode="insert")
+        self.assertEqual("World!", TextField("Text area").value)
+
+    def test_write_mode_value(self):
+        write("Hi there!", into="Normal text field", mode="value")
+        self.assertEqual("Hi there!", TextField("Normal text field").value)
+
+    def test_write_auto_types_into_field_with_key_handler(self):
+        write("Hi there!", into="Text field with key handler", mode="auto")
+        text_field = TextField("Text field with key handler")
+        self.assertEqual("Hi there!", text_field.value)
+        self.assertEqual("true", text_field.web_element.get_attribute("data-keydown"))
+
+    def test_write_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            write("Hi there!", into="Normal text field", mode="paste")
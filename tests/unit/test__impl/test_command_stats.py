@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+from threading import Thread
+from unittest import TestCase
+
+from helium3 import CommandBudgetExceeded
+from helium3 import CommandBudgetWarning
+from helium3 import command_budget
+from helium3._impl.tracing import span
+from helium3._impl.tracing import trace_commands
+from tests.unit.test__impl.test_tracing import StubDriver
+
+
+class CommandBudgetTest(TestCase):
+    def setUp(self):
+        self.driver = StubDriver()
+        trace_commands(self.driver)
+
+    def test_counts_commands(self):
+        with command_budget() as stats:
+            with span("click", "api"):
+                with span("attempt"):
+                    self.driver.execute("findElements")
+                    self.driver.execute("clickElement")
+            self.driver.execute("findElements")
+        self.assertEqual(3, stats.num_commands)
+        self.assertEqual({"findElements": 2, "clickElement": 1}, stats.by_command)
+        self.assertEqual(
+            {
+                "click": {"findElements": 1, "clickElement": 1},
+                None: {"findElements": 1},
+            },
+            stats.by_call,
+        )
+        self.assertEqual(set(stats.by_command), set(stats.secs_by_command))
+        self.assertGreaterEqual(stats.total_secs, 0)
+        self.assertIn("3 WebDriver commands", str(stats))
+
+    def test_attributes_commands_to_outermost_call(self):
+        with command_budget() as stats:
+            with span("wait_until", "api"):
+                with span("Text.exists", "api"):
+                    self.driver.execute("findElements")
+        self.assertEqual(["wait_until"], list(stats.by_call))
+
+    def test_within_budget(self):
+        with command_budget(max_commands=1):
+            self.driver.execute("findElements")
+
+    def test_exceeded(self):
+        with self.assertRaises(CommandBudgetExceeded) as cm:
+            with command_budget(max_commands=1):
+                self.driver.execute("findElements")
+                self.driver.execute("clickElement")
+        self.assertEqual(2, cm.exception.stats.num_commands)
+        self.assertIn("more than the budget of 1", str(cm.exception))
+
+    def test_warn(self):
+        with self.assertWarns(CommandBudgetWarning):
+            with command_budget(max_commands=0, warn=True):
+                self.driver.execute("findElements")
+
+    def test_does_not_mask_other_errors(self):
+        with self.assertRaises(KeyError):
+            with command_budget(max_commands=0):
+                self.driver.execute("findElements")
+                raise KeyError()
+
+    def test_ignores_other_threads(self):
+        with command_budget() as stats:
+            thread = Thread(target=self.driver.execute, args=("findElements",))
+            thread.start()
+            thread.join()
+        self.assertEqual(0, stats.num_commands)
+
+    def test_stops_counting_after_block(self):
+        with command_budget() as stats:
+            pass
+        self.driver.execute("findElements")
+        self.assertEqual(0, stats.num_commands)
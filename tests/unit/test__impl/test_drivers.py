@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest import skipIf
+
+from selenium.common.exceptions import WebDriverException
+
+from helium3._impl.drivers import DriverCache
+from helium3._impl.drivers import SharedService
+from helium3._impl.drivers import start_driver
+from helium3.utils.os_ import make_executable
+from helium3.utils.system import is_windows
+
+
+class StartDriverTest(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.environ_before = dict(os.environ)
+        os.environ["XDG_CACHE_HOME"] = os.environ["LOCALAPPDATA"] = self.temp_dir.name
+        os.environ["PATH"] = self.temp_dir.name
+        self.path_driver = self._create_executable("stubdriver")
+        self.cache = DriverCache()
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ_before)
+        self.temp_dir.cleanup()
+
+    def test_uses_driver_on_path(self):
+        driver, timings = start_driver(StubDriver, "stubdriver", StubOptions())
+        self.assertEqual(self.path_driver, driver.executable_path)
+        self.assertEqual(["resolve", "session", "spawn"], sorted(timings))
+        self.assertEqual(
+            {
+                "path": self.path_driver,
+                "driver_version": "2.0 (abc)",
+                "browser_version": "1.0",
+            },
+            self.cache.get("stubdriver /opt/browser"),
+        )
+
+    def test_tries_cached_driver_first(self):
+        cached_driver = self._create_executable("cached")
+        self.cache.put("stubdriver /opt/browser", {"path": cached_driver})
+        driver, _ = start_driver(StubDriver, "stubdriver", StubOptions())
+        self.assertEqual(cached_driver, driver.executable_path)
+
+    def test_cache_depends_on_browser_binary(self):
+        self.cache.put("stubdriver /opt/browser", {"path": "cached"})
+        driver, _ = start_driver(StubDriver, "stubdriver", StubOptions("/opt/2"))
+        self.assertEqual(self.path_driver, driver.executable_path)
+
+    def test_cached_driver_fails(self):
+        cached_driver = self._create_executable("broken")
+        self.cache.put("stubdriver /opt/browser", {"path": cached_driver})
+        driver, _ = start_driver(StubDriver, "stubdriver", StubOptions())
+        self.assertEqual(self.path_driver, driver.executable_path)
+        self.assertEqual(
+            self.path_driver, self.cache.get("stubdriver /opt/browser")["path"]
+        )
+
+    @skipIf(is_windows(), "Needs a shell script as the browser.")
+    def test_cached_driver_for_other_browser_version(self):
+        browser = self._create_executable("browser", "echo Stub Browser 2.0.1")
+        cached_driver = self._create_executable("cached")
+        entry = {"path": cached_driver, "browser_version": "1.0"}
+        self.cache.put("stubdriver " + browser, entry)
+        driver, _ = start_driver(StubDriver, "stubdriver", StubOptions(browser))
+        self.assertEqual(self.path_driver, driver.executable_path)
+
+    def test_cached_driver_for_same_major_browser_version(self):
+        browser = self._create_executable("browser", "echo Stub Browser 1.2")
+        cached_driver = self._create_executable("cached")
+        entry = {"path": cached_driver, "browser_version": "1.0"}
+        self.cache.put("stubdriver " + browser, entry)
+        driver, _ = start_driver(StubDriver, "stubdriver", StubOptions(browser))
+        self.assertEqual(cached_driver, driver.executable_path)
+
+    def test_corrupt_cache(self):
+        os.makedirs(os.path.dirname(self.cache.path))
+        with open(self.cache.path, "w") as f:
+            f.write("{")
+        driver, _ = start_driver(StubDriver, "stubdriver", StubOptions())
+        self.assertEqual(self.path_driver, driver.executable_path)
+
+    def _create_executable(self, name, script=""):
+        result = os.path.join(self.temp_dir.name, name)
+        with open(result, "w") as f:
+            if script:
+                f.write("#!/bin/sh\n" + script + "\n")
+        make_executable(result)
+        return result
+
+
+class SharedServiceTest(TestCase):
+    def setUp(self):
+        self.service = StubService()
+        self.shared_service = SharedService(self.service)
+
+    def test_stops_when_last_session_ends(self):
+        uses = [self.shared_service.add_session() for _ in range(2)]
+        uses[0].stop()
+        self.assertFalse(self.service.stopped)
+        uses[1].stop()
+        self.assertTrue(self.service.stopped)
+
+    def test_stopping_twice_ends_one_session(self):
+        uses = [self.shared_service.add_session() for _ in range(2)]
+        uses[0].stop()
+        uses[0].stop()
+        self.assertFalse(self.service.stopped)
+        self.assertEqual(1, self.shared_service.num_sessions)
+
+    def test_is_running(self):
+        self.assertTrue(self.shared_service.is_running())
+        self.service.process.returncode = 1
+        self.assertFalse(self.shared_service.is_running())
+
+    def test_exposes_service_attributes(self):
+        use = self.shared_service.add_session()
+        self.assertEqual("http://localhost:1234", use.service_url)
+
+
+class StubService:
+    def __init__(self):
+        self.service_url = "http://localhost:1234"
+        self.process = StubPopen()
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+class StubPopen:
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+
+class StubOptions:
+    def __init__(self, binary_location="/opt/browser"):
+        self.binary_location = binary_location
+
+
+class StubDriver:
+    def __init__(self, options, executable_path):
+        if os.path.basename(executable_path) == "broken":
+            raise WebDriverException("Broken driver.")
+        self.executable_path = executable_path
+        self.capabilities = {
+            "browserVersion": "1.0",
+            "chrome": {"chromedriverVersion": "2.0 (abc)"},
+        }
+        self.start_session()
+
+    def start_session(self):
+        pass
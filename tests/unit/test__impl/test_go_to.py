@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from selenium.common.exceptions import JavascriptException
+
+from helium3._impl import APIImpl
+
+
+class ReadyStateTest(TestCase):
+    def setUp(self):
+        self.api_impl = APIImpl()
+
+    def test_has_ready_state(self):
+        self.api_impl.driver = StubDriver("complete")
+        self.assertTrue(self.api_impl._has_ready_state(["complete"]))
+        self.assertFalse(self.api_impl._has_ready_state(["interactive"]))
+
+    def test_is_new_document(self):
+        self.api_impl.driver = StubDriver(True)
+        self.assertTrue(self.api_impl._is_new_document())
+
+    def test_document_being_replaced(self):
+        error = JavascriptException("javascript error: document unloaded")
+        self.api_impl.driver = StubDriver(error)
+        self.assertFalse(self.api_impl._has_ready_state(["complete"]))
+        self.assertFalse(self.api_impl._is_new_document())
+
+
+class StubDriver:
+    def __init__(self, script_result):
+        self.script_result = script_result
+
+    def execute_script(self, script, *args):
+        if isinstance(self.script_result, Exception):
+            raise self.script_result
+        return self.script_result
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from helium3._impl.locator_cache import LocatorCache
+from helium3._impl.locator_cache import get_url_pattern
+
+
+class GetUrlPatternTest(TestCase):
+    def test_ignores_query_and_fragment(self):
+        self.assertEqual(
+            "https://shop.com/cart", get_url_pattern("https://shop.com/cart?a=1#top")
+        )
+
+    def test_replaces_segments_with_digits(self):
+        self.assertEqual(
+            "https://shop.com/items/*/reviews",
+            get_url_pattern("https://shop.com/items/a1234/reviews"),
+        )
+
+
+class LocatorCacheTest(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "locators.sqlite")
+        self.cache = LocatorCache(self.path)
+
+    def tearDown(self):
+        self.cache._connection.close()
+        self.temp_dir.cleanup()
+
+    def test_get_non_existent(self):
+        self.assertIsNone(self.cache.get("https://shop.com", "Button OK"))
+
+    def test_put_get(self):
+        self.cache.put("https://shop.com/items/1", "Button OK", "#ok", [0, 1])
+        self.assertEqual(
+            ("#ok", [0, 1]), self.cache.get("https://shop.com/items/2", "Button OK")
+        )
+
+    def test_put_replaces(self):
+        self.cache.put("https://shop.com", "Button OK", "#ok", [])
+        self.cache.put("https://shop.com", "Button OK", "#submit", [])
+        self.assertEqual(
+            ("#submit", []), self.cache.get("https://shop.com", "Button OK")
+        )
+
+    def test_remove(self):
+        self.cache.put("https://shop.com", "Button OK", "#ok", [])
+        self.cache.remove("https://shop.com", "Button OK")
+        self.assertIsNone(self.cache.get("https://shop.com", "Button OK"))
+
+    def test_shared_between_instances(self):
+        self.cache.put("https://shop.com", "Button OK", "#ok", [])
+        other = LocatorCache(self.path)
+        try:
+            self.assertEqual(("#ok", []), other.get("https://shop.com", "Button OK"))
+        finally:
+            other._connection.close()
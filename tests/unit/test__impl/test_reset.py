@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from selenium.common.exceptions import WebDriverException
+
+from helium3._impl.reset import get_origin
+from helium3._impl.reset import reset_browser
+from helium3._impl.selenium_wrappers import WebDriverWrapper
+
+
+class ResetBrowserTest(TestCase):
+    def test_closes_other_windows(self):
+        driver = StubWebDriver(["1", "2", "3"], current="2")
+        reset_browser(WebDriverWrapper(driver))
+        self.assertEqual(["1"], driver.window_handles)
+        self.assertEqual("1", driver.current_window_handle)
+
+    def test_forgets_hidden_windows(self):
+        driver = WebDriverWrapper(StubWebDriver(["1", "2"], current="1"))
+        driver.hidden_window_handles.add("2")
+        reset_browser(driver)
+        self.assertEqual(set(), driver.hidden_window_handles)
+
+    def test_clears_state(self):
+        driver = StubWebDriver(["1"], current="1")
+        reset_browser(WebDriverWrapper(driver))
+        self.assertTrue(driver.deleted_cookies)
+        self.assertEqual(1, len(driver.scripts))
+        self.assertEqual("about:blank", driver.url)
+
+    def test_chrome_clears_all_cookies(self):
+        driver = StubChrome(["1"], current="1")
+        reset_browser(WebDriverWrapper(driver))
+        self.assertFalse(driver.deleted_cookies)
+        self.assertEqual(
+            ["Network.clearBrowserCookies", "Storage.clearDataForOrigin"],
+            [cmd for cmd, _ in driver.devtools_calls],
+        )
+        self.assertEqual("http://localhost", driver.devtools_calls[1][1]["origin"])
+
+    def test_clears_storage_of_each_window(self):
+        driver = StubWebDriver(["1", "2", "3"], current="2")
+        reset_browser(WebDriverWrapper(driver))
+        self.assertEqual(3, len(driver.scripts))
+
+    def test_chrome_clears_visited_origins(self):
+        driver = StubChrome(["1"], current="1")
+        wrapper = WebDriverWrapper(driver)
+        wrapper.visited_origins.add("https://example.com")
+        reset_browser(wrapper)
+        self.assertEqual(
+            ["http://localhost", "https://example.com"],
+            [
+                args["origin"]
+                for cmd, args in driver.devtools_calls
+                if cmd == "Storage.clearDataForOrigin"
+            ],
+        )
+        self.assertEqual(set(), wrapper.visited_origins)
+
+    def test_visits_other_origins_without_devtools(self):
+        driver = StubWebDriver(["1"], current="1")
+        wrapper = WebDriverWrapper(driver)
+        wrapper.visited_origins.update(["https://example.com", "http://localhost"])
+        reset_browser(wrapper)
+        self.assertEqual(["https://example.com/", "about:blank"], driver.visited_urls)
+        self.assertEqual(2, len(driver.scripts))
+
+    def test_chrome_without_devtools(self):
+        driver = StubChrome(["1"], current="1")
+        driver.supports_devtools = False
+        reset_browser(WebDriverWrapper(driver))
+        self.assertTrue(driver.deleted_cookies)
+
+
+class GetOriginTest(TestCase):
+    def test_path(self):
+        self.assertEqual("https://example.com", get_origin("https://example.com/a?b"))
+
+    def test_default_port(self):
+        self.assertEqual("https://example.com", get_origin("https://example.com:443"))
+
+    def test_other_port(self):
+        self.assertEqual("http://localhost:8080", get_origin("http://localhost:8080/"))
+
+    def test_credentials(self):
+        self.assertEqual("http://example.com", get_origin("http://a:b@Example.com"))
+
+
+class StubWebDriver:
+    def __init__(self, window_handles, current):
+        self.window_handles = window_handles
+        self.current_window_handle = current
+        self.deleted_cookies = False
+        self.scripts = []
+        self.url = "http://localhost/page.html"
+        self.visited_urls = []
+
+    @property
+    def switch_to(self):
+        return self
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        return "http://localhost"
+
+    def delete_all_cookies(self):
+        self.deleted_cookies = True
+
+    def get(self, url):
+        self.url = url
+        self.visited_urls.append(url)
+
+
+class StubChrome(StubWebDriver):
+    def __init__(self, window_handles, current):
+        super().__init__(window_handles, current)
+        self.supports_devtools = True
+        self.devtools_calls = []
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        if not self.supports_devtools:
+            raise WebDriverException("Unknown command.")
+        self.devtools_calls.append((cmd, cmd_args))
+        return {}
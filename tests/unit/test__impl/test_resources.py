@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+import json
+from unittest import TestCase
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver import ChromeOptions
+from selenium.webdriver import FirefoxOptions
+
+from helium3._impl.resources import MAX_BLOCKED_URLS
+from helium3._impl.resources import MAX_PENDING_REQUESTS
+from helium3._impl.resources import ResourceBlocker
+from helium3._impl.resources import add_to_chrome_options
+from helium3._impl.resources import add_to_firefox_options
+from helium3._impl.resources import get_url_patterns
+from helium3._impl.resources import parse_blocked_resources
+
+
+class ParseBlockedResourcesTest(TestCase):
+    def test_resource_types_and_url_patterns(self):
+        self.assertEqual(
+            (["image", "font"], ["*analytics*"]),
+            parse_blocked_resources(["image", "*analytics*", "font"]),
+        )
+
+    def test_single_resource(self):
+        self.assertEqual((["image"], []), parse_blocked_resources("image"))
+
+    def test_unknown_resource_type(self):
+        with self.assertRaises(ValueError):
+            parse_blocked_resources(["images"])
+
+
+class GetUrlPatternsTest(TestCase):
+    def test_stylesheet(self):
+        self.assertEqual(
+            ["*.css", "*.css?*", "*.css#*", "*ads*"],
+            get_url_patterns(["stylesheet"], ["*ads*"]),
+        )
+
+
+class AddToChromeOptionsTest(TestCase):
+    def test_default(self):
+        options = ChromeOptions()
+        add_to_chrome_options(options)
+        self.assertEqual(
+            {"performance": "ALL"}, options.capabilities["goog:loggingPrefs"]
+        )
+        self.assertEqual(
+            {"enableNetwork": True, "enablePage": False},
+            options.experimental_options["perfLoggingPrefs"],
+        )
+
+    def test_keeps_user_preferences(self):
+        options = ChromeOptions()
+        options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+        options.add_experimental_option(
+            "perfLoggingPrefs", {"enablePage": True, "traceCategories": "v8"}
+        )
+        add_to_chrome_options(options)
+        self.assertEqual(
+            {"browser": "ALL", "performance": "ALL"},
+            options.capabilities["goog:loggingPrefs"],
+        )
+        self.assertEqual(
+            {"enableNetwork": True, "enablePage": True, "traceCategories": "v8"},
+            options.experimental_options["perfLoggingPrefs"],
+        )
+
+
+class AddToFirefoxOptionsTest(TestCase):
+    def test_image(self):
+        options = FirefoxOptions()
+        add_to_firefox_options(options, ["image"])
+        self.assertEqual({"permissions.default.image": 2}, options.preferences)
+
+    def test_url_patterns_are_not_supported(self):
+        with self.assertRaises(ValueError):
+            add_to_firefox_options(FirefoxOptions(), ["*analytics*"])
+
+
+class ResourceBlockerTest(TestCase):
+    def test_block(self):
+        driver = StubChrome()
+        ResourceBlocker(driver).block(["*analytics*"])
+        self.assertEqual(
+            [
+                ("Network.enable", {}),
+                ("Network.setBlockedURLs", {"urls": ["*analytics*"]}),
+            ],
+            driver.cdp_commands,
+        )
+
+    def test_get_blocked_urls(self):
+        driver = StubChrome()
+        blocker = ResourceBlocker(driver)
+        driver.add_request("1", "http://a.com/logo.png", {"blockedReason": "inspector"})
+        driver.add_request("2", "http://a.com/index.html")
+        self.assertEqual(["http://a.com/logo.png"], blocker.get_blocked_urls())
+        driver.add_request("3", "http://a.com/a.woff", {"blockedReason": "inspector"})
+        self.assertEqual(
+            ["http://a.com/logo.png", "http://a.com/a.woff"],
+            blocker.get_blocked_urls(),
+        )
+
+    def test_is_blocking(self):
+        blocker = ResourceBlocker(StubChrome())
+        self.assertFalse(blocker.is_blocking)
+        blocker.block(["image"])
+        self.assertTrue(blocker.is_blocking)
+        blocker.block([])
+        self.assertFalse(blocker.is_blocking)
+
+    def test_remembers_last_blocked_urls(self):
+        driver = StubChrome()
+        blocker = ResourceBlocker(driver)
+        for i in range(MAX_BLOCKED_URLS + 1):
+            url = "http://a.com/%d.png" % i
+            driver.add_request(str(i), url, {"blockedReason": "inspector"})
+        blocked_urls = blocker.get_blocked_urls()
+        self.assertEqual(MAX_BLOCKED_URLS, len(blocked_urls))
+        self.assertEqual("http://a.com/1.png", blocked_urls[0])
+
+    def test_forgets_oldest_unfinished_request(self):
+        driver = StubChrome()
+        blocker = ResourceBlocker(driver)
+        for i in range(MAX_PENDING_REQUESTS + 1):
+            driver._log_event(
+                "Network.requestWillBeSent",
+                {"requestId": str(i), "request": {"url": "http://a.com/%d" % i}},
+            )
+        self.assertTrue(blocker.read_log())
+        self.assertEqual(MAX_PENDING_REQUESTS, len(blocker._request_urls))
+        self.assertNotIn("0", blocker._request_urls)
+
+    def test_log_not_available(self):
+        blocker = ResourceBlocker(StubChromeWithoutLog())
+        self.assertFalse(blocker.read_log())
+        with self.assertRaises(RuntimeError):
+            blocker.get_blocked_urls()
+
+
+class StubChrome:
+    def __init__(self):
+        self.cdp_commands = []
+        self.log = []
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.cdp_commands.append((cmd, cmd_args))
+
+    def add_request(self, request_id, url, failure=None):
+        self._log_event(
+            "Network.requestWillBeSent",
+            {"requestId": request_id, "request": {"url": url}},
+        )
+        if failure is None:
+            self._log_event("Network.loadingFinished", {"requestId": request_id})
+        else:
+            params = dict(failure, requestId=request_id)
+            self._log_event("Network.loadingFailed", params)
+
+    def _log_event(self, method, params):
+        message = {"message": {"method": method, "params": params}}
+        self.log.append({"message": json.dumps(message)})
+
+    def get_log(self, log_type):
+        result, self.log = self.log, []
+        return result
+
+
+class StubChromeWithoutLog(StubChrome):
+    def get_log(self, log_type):
+        raise WebDriverException("invalid argument: log type 'performance' not found")
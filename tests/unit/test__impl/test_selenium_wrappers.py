@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 from unittest import TestCase
 
+from selenium.common.exceptions import ElementNotInteractableException
+from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import NoSuchFrameException
 
 from helium3._impl.selenium_wrappers import (FrameIterator,
-                                             FramesChangedWhileIterating)
+                                             FramesChangedWhileIterating,
+                                             ScriptSelect, WebElementWrapper)
 
 
 class FrameIteratorTest(TestCase):
@@ -84,3 +87,34 @@ class TargetLocatorFailingAfterNFrameSwitches(StubTargetLocator):
             self.num_allowed_frame_switches -= 1
             return super(TargetLocatorFailingAfterNFrameSwitches, self).frame(index)
         raise NoSuchFrameException()
+
+
+class ScriptSelectTest(TestCase):
+    def test_select_by_visible_text(self):
+        web_element = StubWebElement("selected")
+        ScriptSelect(web_element).select_by_visible_text("Option Two")
+        self.assertEqual(("Option Two",), web_element.script_args)
+
+    def test_select_by_visible_text_not_found(self):
+        select = ScriptSelect(StubWebElement("not found"))
+        with self.assertRaises(NoSuchElementException):
+            select.select_by_visible_text("Option Four")
+
+    def test_select_by_visible_text_disabled(self):
+        select = ScriptSelect(StubWebElement("disabled"))
+        with self.assertRaises(ElementNotInteractableException):
+            select.select_by_visible_text("Option One")
+
+    def test_get_selected_option_texts_without_elements(self):
+        self.assertEqual([], ScriptSelect.get_selected_option_texts(None, []))
+
+
+class StubWebElement(WebElementWrapper):
+    def __init__(self, script_result):
+        super(StubWebElement, self).__init__(None)
+        self.script_result = script_result
+        self.script_args = None
+
+    def execute_script(self, script, *args):
+        self.script_args = args
+        return self.script_result
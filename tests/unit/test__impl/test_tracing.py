@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from helium3._impl.tracing import add_listener
+from helium3._impl.tracing import get_current_span
+from helium3._impl.tracing import remove_listener
+from helium3._impl.tracing import span
+from helium3._impl.tracing import trace_commands
+from helium3._impl.tracing import traced
+
+
+class SpanTest(TestCase):
+    def setUp(self):
+        self.listener = RecordingListener()
+        add_listener(self.listener)
+
+    def tearDown(self):
+        remove_listener(self.listener)
+
+    def test_nested_spans(self):
+        with span("outer"):
+            with span("inner", arg=1):
+                pass
+        self.assertEqual(
+            [
+                ("start", "outer"),
+                ("start", "inner"),
+                ("end", "inner"),
+                ("end", "outer"),
+            ],
+            self.listener.calls,
+        )
+        inner = self.listener.spans[0]
+        self.assertEqual({"arg": 1}, inner.args)
+        self.assertEqual("outer", inner.parent.name)
+        self.assertLessEqual(inner.parent.start_ns, inner.start_ns)
+        self.assertLessEqual(inner.end_ns, inner.parent.end_ns)
+
+    def test_not_accepted(self):
+        self.listener.accept = False
+        with span("outer"):
+            with span("inner"):
+                pass
+        self.assertEqual([], self.listener.calls)
+
+    def test_sampling_decision_applies_to_whole_tree(self):
+        self.listener.accept = False
+        with span("outer"):
+            self.listener.accept = True
+            with span("inner"):
+                pass
+        self.assertEqual([], self.listener.calls)
+
+    def test_not_accepted_allocates_no_spans(self):
+        self.listener.accept = False
+        with span("outer") as outer:
+            self.assertIsNone(outer)
+            self.assertIsNone(get_current_span())
+            with span("inner") as inner:
+                self.assertIsNone(inner)
+        self.assertIsNone(get_current_span())
+
+    def test_records_error(self):
+        with self.assertRaises(KeyError):
+            with span("failing"):
+                raise KeyError()
+        self.assertEqual({"error": "KeyError"}, self.listener.spans[0].args)
+
+    def test_current_span(self):
+        self.assertIsNone(get_current_span())
+        with span("outer") as outer:
+            self.assertIs(outer, get_current_span())
+        self.assertIsNone(get_current_span())
+
+    def test_no_listener(self):
+        remove_listener(self.listener)
+        with span("name") as result:
+            self.assertIsNone(result)
+            self.assertIsNone(get_current_span())
+
+    def test_traced(self):
+        self.assertEqual("url", go_to("url"))
+        self.assertEqual("Docs", go_to.__doc__)
+        self.assertEqual([("go_to", "api")], self.listener.get_names())
+
+    def test_trace_commands(self):
+        driver = StubDriver()
+        trace_commands(driver)
+        trace_commands(driver)
+        with span("click"):
+            self.assertEqual("result", driver.execute("clickElement", {"id": 1}))
+        self.assertEqual(
+            [("clickElement", "webdriver"), ("click", "helium")],
+            self.listener.get_names(),
+        )
+        self.assertEqual([("clickElement", {"id": 1})], driver.commands)
+
+    def test_trace_commands_without_execute(self):
+        trace_commands(object())
+
+
+@traced
+def go_to(url):
+    """Docs"""
+    return url
+
+
+class RecordingListener:
+    def __init__(self):
+        self.accept = True
+        self.calls = []
+        self.spans = []
+
+    def accepts(self, span):
+        return self.accept
+
+    def span_started(self, span):
+        self.calls.append(("start", span.name))
+
+    def span_finished(self, span):
+        self.calls.append(("end", span.name))
+        self.spans.append(span)
+
+    def get_names(self):
+        return [(span.name, span.category) for span in self.spans]
+
+
+class StubDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, driver_command, params=None):
+        self.commands.append((driver_command, params))
+        return "result"
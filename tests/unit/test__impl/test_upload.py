@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import os
+from base64 import b64decode
+from contextlib import contextmanager
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from zipfile import ZipFile
+
+from selenium.webdriver.remote.file_detector import LocalFileDetector
+from selenium.webdriver.remote.file_detector import UselessFileDetector
+
+from helium3._impl import upload
+from helium3._impl.upload import FileUploader
+
+
+class FileUploaderTest(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.file_path = self._create_file("upload_this.txt", b"Hello World!")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_local_driver_does_not_upload(self):
+        driver = StubWebDriver(is_remote=False)
+        self.assertEqual(self.file_path, FileUploader(driver).upload(self.file_path))
+        self.assertEqual([], driver.uploads)
+
+    def test_upload(self):
+        driver = StubWebDriver()
+        self.assertEqual("/remote/0", FileUploader(driver).upload(self.file_path))
+        with ZipFile(BytesIO(b64decode(driver.uploads[0]))) as archive:
+            self.assertEqual(b"Hello World!", archive.read("upload_this.txt"))
+
+    def test_uploads_each_file_once_per_session(self):
+        driver = StubWebDriver()
+        uploader = FileUploader(driver)
+        uploader.upload(self.file_path)
+        self.assertEqual("/remote/0", uploader.upload(self.file_path))
+        self.assertEqual(1, len(driver.uploads))
+
+    def test_uploads_file_with_same_contents_once(self):
+        driver = StubWebDriver()
+        uploader = FileUploader(driver)
+        copy_path = self._create_file("copy.txt", b"Hello World!")
+        uploader.upload(self.file_path)
+        uploader.upload(copy_path)
+        self.assertEqual(1, len(driver.uploads))
+
+    def test_uploads_changed_file_again(self):
+        driver = StubWebDriver()
+        uploader = FileUploader(driver)
+        uploader.upload(self.file_path)
+        self._create_file("upload_this.txt", b"Hello again!")
+        self.assertEqual("/remote/1", uploader.upload(self.file_path))
+
+    def test_uploads_again_in_new_session(self):
+        driver = StubWebDriver()
+        uploader = FileUploader(driver)
+        uploader.upload(self.file_path)
+        driver.session_id = "session 2"
+        uploader.upload(self.file_path)
+        self.assertEqual(2, len(driver.uploads))
+
+    def test_large_file(self):
+        contents = os.urandom(3 * 1024 * 1024 + 1000)
+        file_path = self._create_file("large.bin", contents)
+        driver = StubWebDriver()
+        FileUploader(driver).upload(file_path)
+        with ZipFile(BytesIO(b64decode(driver.uploads[0]))) as archive:
+            self.assertEqual(contents, archive.read("large.bin"))
+
+    def test_send_file(self):
+        driver = StubWebDriver()
+        web_element = StubWebElement()
+        FileUploader(driver).send_file(web_element, self.file_path)
+        self.assertEqual(["/remote/0"], web_element.keys_sent)
+
+    def test_send_file_not_on_local_machine(self):
+        driver = StubWebDriver()
+        web_element = StubWebElement()
+        path = "/grid/node/only/file.pdf"
+        FileUploader(driver).send_file(web_element, path)
+        self.assertEqual([path], web_element.keys_sent)
+        self.assertEqual([], driver.uploads)
+
+    def test_send_file_without_local_file_detector(self):
+        driver = StubWebDriver()
+        driver.file_detector = UselessFileDetector()
+        web_element = StubWebElement()
+        FileUploader(driver).send_file(web_element, self.file_path)
+        self.assertEqual([self.file_path], web_element.keys_sent)
+        self.assertEqual([], driver.uploads)
+
+    def test_digest_cache_is_bounded(self):
+        for i in range(upload._MAX_DIGESTS + 1):
+            upload.get_digest(self._create_file("file%d.txt" % i, b"%d" % i))
+        self.assertEqual(upload._MAX_DIGESTS, len(upload._DIGESTS))
+
+    def _create_file(self, name, contents):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as file_:
+            file_.write(contents)
+        # Ensure the modification time changes when a file is overwritten:
+        self.num_files_created = getattr(self, "num_files_created", 0) + 1
+        mtime_ns = 1600000000 * 10**9 + self.num_files_created
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+
+class StubWebDriver:
+    def __init__(self, is_remote=True):
+        self._is_remote = is_remote
+        self.session_id = "session 1"
+        self.file_detector = LocalFileDetector()
+        self.uploads = []
+
+    def execute(self, command, params):
+        self.uploads.append(params["file"])
+        return {"value": "/remote/%d" % (len(self.uploads) - 1)}
+
+    @contextmanager
+    def file_detector_context(self, file_detector_class):
+        yield
+
+
+class StubWebElement:
+    def __init__(self):
+        self.keys_sent = []
+
+    def send_keys(self, keys):
+        self.keys_sent.append(keys)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from helium3.utils.lang import copy_slots
+
+
+class CopySlotsTest(TestCase):
+    def test_copy_slots(self):
+        original = Derived(1, 2)
+        copy = copy_slots(original)
+        self.assertIsNot(original, copy)
+        self.assertEqual((1, 2), (copy.a, copy.b))
+
+    def test_copy_unassigned_slot(self):
+        original = Base.__new__(Base)
+        self.assertFalse(hasattr(copy_slots(original), "a"))
+
+    def test_copy_subclass_without_slots(self):
+        original = WithoutSlots(1, 2)
+        original.c = 3
+        copy = copy_slots(original)
+        self.assertEqual((1, 2, 3), (copy.a, copy.b, copy.c))
+
+
+class Base:
+    __slots__ = ("a",)
+
+    def __init__(self, a):
+        self.a = a
+
+
+class Derived(Base):
+    __slots__ = ("b",)
+
+    def __init__(self, a, b):
+        super().__init__(a)
+        self.b = b
+
+
+class WithoutSlots(Derived):
+    pass
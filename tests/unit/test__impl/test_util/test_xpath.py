@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from unittest import TestCase
 
+from helium3.utils.xpath import make_relative
 from helium3.utils.xpath import predicate_or
 
 
@@ -19,3 +20,31 @@ class PredicateOrTest(TestCase):
 
     def test_empty_arg_among_normal_args(self):
         self.assertEqual("[a=b or c=d]", predicate_or("a=b", "", "c=d"))
+
+
+class MakeRelativeTest(TestCase):
+    def test_absolute_path(self):
+        self.assertEqual("descendant-or-self::a", make_relative("//a"))
+
+    def test_relative_path(self):
+        self.assertEqual(".//a", make_relative(".//a"))
+
+    def test_union(self):
+        self.assertEqual(
+            "descendant-or-self::a | descendant-or-self::b",
+            make_relative("//a | //b"),
+        )
+
+    def test_child_path(self):
+        self.assertEqual("self::html/body", make_relative("/html/body"))
+
+    def test_parenthesized_path(self):
+        self.assertEqual("(descendant-or-self::a)[1]", make_relative("(//a)[1]"))
+
+    def test_path_in_predicate(self):
+        xpath = "*[text()][not(.//*[@id='a'])]/.."
+        self.assertEqual("descendant-or-self::" + xpath, make_relative("//" + xpath))
+
+    def test_string_literal(self):
+        xpath = "a[@href='http://example.com' or @title=\"| //b\"]"
+        self.assertEqual("descendant-or-self::" + xpath, make_relative("//" + xpath))
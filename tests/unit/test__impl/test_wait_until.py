@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from helium3._impl import APIImpl
+from helium3._impl.tracing import traced
+
+
+class WaitUntilTest(TestCase):
+    def setUp(self):
+        self.api_impl = APIImpl()
+        self.api_impl.driver = StubDriver()
+
+    def test_traced_bound_method(self):
+        condition = Condition()
+        self.api_impl.wait_until_impl(condition.is_met, interval_secs=0.01)
+        self.assertEqual(2, condition.num_calls)
+
+    def test_function_without_arguments(self):
+        results = iter([False, True])
+        self.api_impl.wait_until_impl(lambda: next(results), interval_secs=0.01)
+        self.assertIsNone(next(results, None))
+
+    def test_function_taking_driver(self):
+        drivers = []
+        self.api_impl.wait_until_impl(lambda driver: drivers.append(driver) or True)
+        self.assertEqual([self.api_impl.driver], drivers)
+
+    def test_callable_object(self):
+        condition = Condition()
+        self.api_impl.wait_until_impl(condition, interval_secs=0.01)
+        self.assertEqual(2, condition.num_calls)
+
+
+class Condition:
+    def __init__(self):
+        self.num_calls = 0
+
+    @traced
+    def is_met(self):
+        self.num_calls += 1
+        return self.num_calls == 2
+
+    def __call__(self):
+        return self.is_met()
+
+
+class StubDriver:
+    def unwrap(self):
+        return self
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from selenium.common.exceptions import WebDriverException
+
+from helium3._impl.windows import WindowTitles
+
+
+class WindowTitlesTest(TestCase):
+    def test_switches_into_other_windows_only(self):
+        driver = StubWebDriver({"1": "One", "2": "Two", "3": "Three"}, current="2")
+        titles = WindowTitles(driver).get(["1", "2", "3"])
+        self.assertEqual({"1": "One", "2": "Two", "3": "Three"}, titles)
+        self.assertEqual(["1", "3", "2"], driver.switches)
+
+    def test_current_window_needs_no_switch(self):
+        driver = StubWebDriver({"1": "One", "2": "Two"}, current="2")
+        self.assertEqual({"2": "Two"}, WindowTitles(driver).get(["2"]))
+        self.assertEqual([], driver.switches)
+
+    def test_chrome_needs_no_switch(self):
+        driver = StubChrome({"CDwindow-1": "One", "2": "Two"}, current="2")
+        titles = WindowTitles(driver).get(["CDwindow-1", "2"])
+        self.assertEqual({"CDwindow-1": "One", "2": "Two"}, titles)
+        self.assertEqual([], driver.switches)
+
+    def test_chrome_page_without_title(self):
+        driver = StubChrome({"1": "", "2": "Two"}, current="2")
+        self.assertEqual({"1": "", "2": "Two"}, WindowTitles(driver).get(["1", "2"]))
+        self.assertEqual(["1", "2"], driver.switches)
+
+    def test_chrome_without_devtools(self):
+        driver = StubChrome({"1": "One", "2": "Two"}, current="2")
+        driver.supports_devtools = False
+        window_titles = WindowTitles(driver)
+        window_titles.get(["1", "2"])
+        self.assertEqual({"1": "One", "2": "Two"}, window_titles.get(["1", "2"]))
+        self.assertEqual(1, driver.num_devtools_calls)
+
+
+class StubWebDriver:
+    def __init__(self, titles, current):
+        self.titles = titles
+        self.current_window_handle = current
+        self.switches = []
+
+    @property
+    def title(self):
+        return self.titles[self.current_window_handle]
+
+    @property
+    def switch_to(self):
+        return self
+
+    def window(self, handle):
+        self.switches.append(handle)
+        self.current_window_handle = handle
+
+
+class StubChrome(StubWebDriver):
+    def __init__(self, titles, current):
+        super().__init__(titles, current)
+        self.supports_devtools = True
+        self.num_devtools_calls = 0
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.num_devtools_calls += 1
+        if not self.supports_devtools:
+            raise WebDriverException("Unknown command.")
+        target_infos = [{"type": "service_worker", "targetId": "x", "title": "X"}]
+        for handle, title in self.titles.items():
+            url = "http://localhost/page%s.html" % handle
+            target_infos.append(
+                {
+                    "type": "page",
+                    "targetId": handle.replace("CDwindow-", ""),
+                    # Like Chrome, report the URL for pages without a title:
+                    "title": title or url[len("http://") :],
+                    "url": url,
+                }
+            )
+        return {"targetInfos": target_infos}
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from threading import current_thread
+from unittest import IsolatedAsyncioTestCase
+
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+
+from helium3 import get_driver
+from helium3.aio import AsyncBrowser
+
+
+class AsyncBrowserTest(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.driver = StubWebDriver()
+        self.browser = AsyncBrowser(self.driver)
+
+    async def test_get_driver(self):
+        self.assertIs(self.driver, await self.browser.get_driver())
+
+    async def test_call_uses_browser(self):
+        self.assertIs(self.driver, await self.browser.call(get_driver))
+
+    async def test_calls_run_in_one_thread(self):
+        threads = {await self.browser.call(current_thread) for _ in range(3)}
+        self.assertEqual(1, len(threads))
+        self.assertNotIn(current_thread(), threads)
+
+    async def test_get(self):
+        button = self.browser.Button("OK")
+        self.assertIs(self.driver, (await self.browser.get(button, "_driver")).unwrap())
+
+    async def test_wait_until(self):
+        results = iter([False, False, True])
+        await self.browser.wait_until(lambda: next(results), interval_secs=0)
+        self.assertIsNone(next(results, None))
+
+    async def test_wait_until_coroutine_function(self):
+        async def condition():
+            return True
+
+        self.assertTrue(await self.browser.wait_until(condition))
+
+    async def test_wait_until_timeout(self):
+        with self.assertRaises(TimeoutException):
+            await self.browser.wait_until(lambda: False, 0.1, 0.01)
+
+    async def test_batch(self):
+        api_impl = self.browser._browser._api_impl
+        async with self.browser.batch():
+            self.assertIsNotNone(api_impl._batch)
+        self.assertIsNone(api_impl._batch)
+
+    async def test_command_budget(self):
+        async with self.browser.command_budget(max_commands=0) as stats:
+            pass
+        self.assertEqual(0, stats.num_commands)
+
+    async def test_paginate_with_invalid_items(self):
+        with self.assertRaises(ValueError):
+            async for _ in self.browser.paginate("Next", "Result"):
+                pass
+
+
+class AsyncBrowserCloseTest(IsolatedAsyncioTestCase):
+    async def test_close(self):
+        driver = StubQuittableWebDriver()
+        await AsyncBrowser(driver).close()
+        self.assertTrue(driver.quit_called)
+        self.assertFalse(driver.service.killed)
+
+    async def test_close_stops_driver_when_quit_fails(self):
+        driver = StubQuittableWebDriver(quit_error=WebDriverException("Quit failed."))
+        browser = AsyncBrowser(driver)
+        with self.assertRaises(WebDriverException):
+            await browser.close()
+        self.assertTrue(driver.service.killed)
+        with self.assertRaises(RuntimeError):
+            # The browser's thread has stopped:
+            await browser.get_driver()
+
+    async def test_close_twice(self):
+        driver = StubQuittableWebDriver()
+        async with AsyncBrowser(driver) as browser:
+            await browser.close()
+        self.assertTrue(driver.quit_called)
+
+
+class StubWebDriver:
+    pass
+
+
+class StubQuittableWebDriver(StubWebDriver):
+    def __init__(self, quit_error=None):
+        self.quit_error = quit_error
+        self.quit_called = False
+        self.service = StubService()
+
+    def quit(self):
+        self.quit_called = True
+        if self.quit_error is not None:
+            raise self.quit_error
+
+
+class StubService:
+    def __init__(self):
+        self.killed = False
+
+    def send_remote_shutdown_command(self):
+        raise AssertionError("Should not be called when killing the service.")
+
+    def stop(self):
+        self.killed = True
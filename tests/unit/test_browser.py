@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+from threading import Thread
+from unittest import TestCase
+
+from helium3 import Browser
+from helium3 import CommandBudgetExceeded
+from helium3 import get_driver
+from helium3._impl.tracing import trace_commands
+from tests.unit.test__impl.test_tracing import StubDriver
+
+
+class BrowserTest(TestCase):
+    def setUp(self):
+        self.driver = StubWebDriver()
+        self.browser = Browser(self.driver)
+
+    def test_get_driver(self):
+        self.assertIs(self.driver, self.browser.get_driver())
+
+    def test_is_default_inside_with_block(self):
+        driver_before = get_driver()
+        with self.browser:
+            self.assertIs(self.driver, get_driver())
+        self.assertIs(driver_before, get_driver())
+
+    def test_nested_with_blocks(self):
+        other_driver = StubWebDriver()
+        with self.browser:
+            with Browser(other_driver):
+                self.assertIs(other_driver, get_driver())
+            self.assertIs(self.driver, get_driver())
+
+    def test_is_default_only_in_its_thread(self):
+        drivers_in_thread = []
+        with self.browser:
+            thread = Thread(target=lambda: drivers_in_thread.append(get_driver()))
+            thread.start()
+            thread.join()
+        self.assertIsNot(self.driver, drivers_in_thread[0])
+
+    def test_element_belongs_to_browser(self):
+        button = self.browser.Button("OK")
+        self.assertIs(self.driver, button._driver.unwrap())
+
+    def test_command_budget(self):
+        driver = StubDriver()
+        trace_commands(driver)
+        with self.assertRaises(CommandBudgetExceeded):
+            with self.browser.command_budget(max_commands=1):
+                driver.execute("findElements")
+                driver.execute("clickElement")
+
+    def test_methods_keep_docstrings(self):
+        self.assertIn("Clicks on the given element", Browser.click.__doc__)
+
+
+class StubWebDriver:
+    pass
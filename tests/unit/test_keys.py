@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+from ast import literal_eval
+from os import environ
+from os import pathsep
+from os.path import dirname
+from unittest import TestCase
+
+from selenium.webdriver.common.keys import Keys
+
+import helium3
+
+
+class KeysTest(TestCase):
+    def test_same_as_selenium(self):
+        names = [
+            name for name in dir(Keys) if name.isupper() and hasattr(helium3, name)
+        ]
+        self.assertEqual(63, len(names))
+        for name in names:
+            self.assertEqual(getattr(Keys, name), getattr(helium3, name), name)
+
+    def test_selenium_keys(self):
+        self.assertIs(Keys, helium3.Keys)
+
+    def test_star_import(self):
+        namespace = {}
+        exec("from helium3 import *", namespace)
+        self.assertIs(helium3.click, namespace["click"])
+        self.assertEqual(helium3.ENTER, namespace["ENTER"])
+        # Importing Keys would load selenium.webdriver:
+        self.assertNotIn("Keys", namespace)
+
+    def test_import_does_not_import_selenium_webdriver(self):
+        self.assertEqual([], self._get_selenium_webdriver_modules("import helium3"))
+
+    def test_star_import_does_not_import_selenium_webdriver(self):
+        self.assertEqual(
+            [], self._get_selenium_webdriver_modules("from helium3 import *")
+        )
+
+    def _get_selenium_webdriver_modules(self, import_statement):
+        src_dir = dirname(dirname(helium3.__file__))
+        env = dict(environ)
+        env["PYTHONPATH"] = pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+        output = subprocess.check_output(
+            [
+                sys.executable,
+                "-c",
+                import_statement + "\n"
+                "import sys; print(sorted(m for m in sys.modules "
+                "if m.startswith('selenium.webdriver')))",
+            ],
+            env=env,
+            text=True,
+        )
+        return literal_eval(output.strip())
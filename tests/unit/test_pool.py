@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from selenium.common.exceptions import TimeoutException
+
+from helium3 import BrowserPool
+from helium3 import get_driver
+from helium3 import set_driver
+from helium3.pool import _get_browser_processes
+from tests.unit.test__impl.test_reset import StubWebDriver
+
+
+class BrowserPoolTest(TestCase):
+    def setUp(self):
+        self.drivers = []
+        self.pool = BrowserPool(size=2, start=self._start, max_uses=2)
+
+    def _start(self):
+        driver = StubQuittableWebDriver()
+        self.drivers.append(driver)
+        set_driver(driver)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_lease(self):
+        with self.pool.lease() as browser:
+            self.assertIs(browser.get_driver(), get_driver())
+            self.assertIn(get_driver(), self.drivers)
+
+    def test_reuses_browsers(self):
+        for _ in range(2):
+            with self.pool.lease(timeout_secs=1) as browser:
+                browser.get_driver().get("http://localhost/page.html")
+        self._wait_for_pool()
+        self.assertEqual(2, len(self.drivers))
+
+    def test_resets_browser_on_release(self):
+        with self.pool.lease(timeout_secs=1) as browser:
+            browser.get_driver().get("http://localhost/page.html")
+            driver = browser.get_driver()
+        self._wait_for_pool()
+        self.assertEqual("about:blank", driver.url)
+        self.assertTrue(driver.deleted_cookies)
+
+    def test_replaces_worn_out_browser(self):
+        self.pool.close()
+        self.drivers = []
+        self.pool = BrowserPool(size=1, start=self._start, max_uses=2)
+        for _ in range(3):
+            with self.pool.lease(timeout_secs=1):
+                pass
+        self.pool.close()
+        self.assertEqual(2, len(self.drivers))
+        self.assertEqual([True, True], [d.quit_called for d in self.drivers])
+
+    def test_replaces_crashed_browser(self):
+        self.pool.close()
+        self.drivers = []
+        self.pool = BrowserPool(size=1, start=self._start_crashing_once)
+        for _ in range(2):
+            with self.pool.lease(timeout_secs=1) as browser:
+                driver = browser.get_driver()
+        self.assertEqual(2, len(self.drivers))
+        self.assertIs(self.drivers[1], driver)
+        self.assertTrue(self.drivers[0].quit_called)
+
+    def _start_crashing_once(self):
+        if self.drivers:
+            self._start()
+        else:
+            driver = StubCrashedWebDriver()
+            self.drivers.append(driver)
+            set_driver(driver)
+
+    def test_timeout(self):
+        with self.pool.lease(timeout_secs=1), self.pool.lease(timeout_secs=1):
+            with self.assertRaises(TimeoutException):
+                with self.pool.lease(timeout_secs=0.1):
+                    pass
+
+    def test_close_quits_browsers(self):
+        self.pool.close()
+        self.assertEqual(2, len(self.drivers))
+        self.assertTrue(all(driver.quit_called for driver in self.drivers))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            BrowserPool(size=0, start=self._start)
+
+    def _wait_for_pool(self):
+        # Browsers are only leased once the pool has reset them:
+        with self.pool.lease(timeout_secs=1), self.pool.lease(timeout_secs=1):
+            pass
+
+
+class GetBrowserProcessesTest(TestCase):
+    def test_finds_browser_by_user_data_dir(self):
+        renderer = StubProcess([])
+        browser = StubProcess(["chrome", "--user-data-dir=/tmp/b"], [renderer])
+        other_browser = StubProcess(["chrome", "--user-data-dir=/tmp/a"])
+        driver = StubProcess(["chromedriver"], [other_browser, browser])
+        capabilities = {"chrome": {"userDataDir": "/tmp/b"}}
+        self.assertEqual(
+            [browser, renderer], _get_browser_processes(driver, capabilities)
+        )
+
+    def test_unknown_user_data_dir(self):
+        driver = StubProcess(["chromedriver"], [StubProcess(["chrome"])])
+        self.assertEqual([], _get_browser_processes(driver, {}))
+
+
+class StubProcess:
+    def __init__(self, cmdline, children=()):
+        self._cmdline = cmdline
+        self._children = list(children)
+
+    def cmdline(self):
+        return self._cmdline
+
+    def children(self, recursive=False):
+        result = list(self._children)
+        if recursive:
+            for child in self._children:
+                result.extend(child.children(recursive=True))
+        return result
+
+
+class StubQuittableWebDriver(StubWebDriver):
+    def __init__(self):
+        super().__init__(["1"], current="1")
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+class StubCrashedWebDriver(StubQuittableWebDriver):
+    """
+    Like a driver whose browser crashed: Commands fail because the connection
+    to the driver is refused.
+    """
+
+    def execute_script(self, script, *args):
+        raise ConnectionRefusedError()
+
+    def get(self, url):
+        raise ConnectionRefusedError()
+
+    def quit(self):
+        super().quit()
+        raise ConnectionRefusedError()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from helium3 import get_driver
+from helium3 import set_driver
+from helium3.runner import RunStats
+from helium3.runner import run
+
+
+class RunTest(TestCase):
+    def test_run(self):
+        results = []
+        stats = run(square, range(10), results.append, num_workers=2, start=start)
+        self.assertEqual(list(range(10)), sorted(result.input for result in results))
+        self.assertEqual(
+            [i * i for i in range(10)], sorted(result.result for result in results)
+        )
+        self.assertEqual((10, 0), stats[:2])
+
+    def test_failing_job(self):
+        results = []
+        stats = run(fail, ["a"], results.append, num_workers=1, start=start)
+        self.assertIn("ValueError: a", results[0].error)
+        self.assertEqual((0, 1), stats[:2])
+
+    def test_retries_with_new_browser(self):
+        results = []
+        run(fail_unless_new_browser, [1], results.append, num_workers=1, start=start)
+        self.assertEqual([None], [result.error for result in results])
+        self.assertEqual(["second"], [result.result for result in results])
+
+    def test_crashed_worker_is_replaced(self):
+        results = []
+        stats = run(
+            crash_on_zero, [0, 1, 2], results.append, num_workers=1, start=start
+        )
+        self.assertEqual((2, 1), stats[:2])
+        crash_result = [r for r in results if r.input == 0][0]
+        self.assertIn("exited", crash_result.error)
+        self.assertGreater(crash_result.duration_secs, 0)
+
+    def test_browser_does_not_start(self):
+        with self.assertRaises(RuntimeError):
+            run(square, [1], num_workers=1, start=fail_to_start)
+
+    def test_browser_start_is_retried(self):
+        with MarkerFile():
+            stats = run(square, [1, 2], num_workers=1, start=fail_to_start_once)
+        self.assertEqual((2, 0), stats[:2])
+
+    def test_worker_that_cannot_start_is_given_up(self):
+        with MarkerFile():
+            stats = run(square, range(4), num_workers=2, start=start_only_once)
+        self.assertEqual((4, 0), stats[:2])
+
+
+class MarkerFile:
+    """
+    Lets the start functions below, which run in separate processes, know
+    whether a browser was started before.
+    """
+
+    def __enter__(self):
+        self.temp_dir = TemporaryDirectory()
+        os.environ["MARKER_FILE"] = os.path.join(self.temp_dir.name, "marker")
+
+    def __exit__(self, *_):
+        del os.environ["MARKER_FILE"]
+        self.temp_dir.cleanup()
+
+
+class RunStatsTest(TestCase):
+    def test_jobs_per_sec(self):
+        self.assertEqual(5, RunStats(8, 2, 2.0, 0, 0, 0).jobs_per_sec)
+
+
+def start():
+    set_driver(StubWebDriver("first" if not hasattr(start, "called") else "second"))
+    start.called = True
+
+
+def square(x):
+    return x * x
+
+
+def fail(x):
+    raise ValueError(x)
+
+
+def fail_unless_new_browser(_):
+    driver = get_driver()
+    if driver.name == "first":
+        driver.alive = False
+        raise ValueError("The browser crashed.")
+    return driver.name
+
+
+def crash_on_zero(x):
+    if x == 0:
+        os._exit(1)
+    return x
+
+
+def fail_to_start():
+    raise ValueError("No browser.")
+
+
+def fail_to_start_once():
+    if _create_marker_file():
+        raise ValueError("No browser.")
+    start()
+
+
+def start_only_once():
+    if not _create_marker_file():
+        raise ValueError("No browser.")
+    start()
+
+
+def _create_marker_file():
+    """
+    Returns True if the marker file did not exist yet.
+    """
+    try:
+        os.close(os.open(os.environ["MARKER_FILE"], os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        return False
+    return True
+
+
+class StubWebDriver:
+    def __init__(self, name):
+        self.name = name
+        self.alive = True
+
+    @property
+    def current_window_handle(self):
+        if not self.alive:
+            raise ValueError("Not alive.")
+        return "1"
+
+    def quit(self):
+        pass
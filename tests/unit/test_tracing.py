@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+
+from helium3 import Tracer
+from helium3._impl.tracing import span
+
+
+class TracerTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "trace.json")
+
+    def tearDown(self):
+        rmtree(self.tmp_dir)
+
+    def test_writes_trace_events(self):
+        with Tracer(self.path):
+            with span("click", "api"):
+                with span("findElements", "webdriver"):
+                    pass
+        with open(self.path) as f:
+            events = json.load(f)["traceEvents"]
+        metadata = [e for e in events if e["ph"] == "M"]
+        self.assertEqual(["thread_name"], [e["name"] for e in metadata])
+        complete = [e for e in events if e["ph"] == "X"]
+        self.assertEqual(["findElements", "click"], [e["name"] for e in complete])
+        self.assertEqual(["webdriver", "api"], [e["cat"] for e in complete])
+        inner, outer = complete
+        self.assertLessEqual(outer["ts"], inner["ts"])
+        self.assertLessEqual(inner["ts"] + inner["dur"], outer["ts"] + outer["dur"])
+        self.assertEqual(os.getpid(), outer["pid"])
+
+    def test_not_recording_after_stop(self):
+        tracer = Tracer()
+        with tracer:
+            with span("recorded"):
+                pass
+        with span("not recorded"):
+            pass
+        self.assertEqual(["recorded"], self._get_names(tracer))
+
+    def test_sample_rate_zero(self):
+        with Tracer(sample_rate=0) as tracer:
+            with span("click"):
+                pass
+        self.assertEqual([], self._get_names(tracer))
+
+    def test_invalid_sample_rate(self):
+        with self.assertRaises(ValueError):
+            Tracer(sample_rate=2)
+
+    def test_max_events(self):
+        with Tracer(max_events=2) as tracer:
+            for name in ["1", "2", "3"]:
+                with span(name):
+                    pass
+        self.assertEqual(["2", "3"], self._get_names(tracer))
+
+    def _get_names(self, tracer):
+        return [e["name"] for e in tracer.get_events() if e["ph"] == "X"]